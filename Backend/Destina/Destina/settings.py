@@ -48,12 +48,17 @@ INSTALLED_APPS = [
     'corsheaders',
     'Destina',
     'Tablas',
+    'destinos',
+    'planes',
+    'usuarios',
+    'recomendaciones',
     'rest_framework',
     'rest_framework.authtoken',
 ]
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
+    'Tablas.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,14 +91,84 @@ WSGI_APPLICATION = 'Destina.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# SQLite para concurrencia:
+# - WAL: las lecturas no bloquean la escritura ni al revés
+# - synchronous=NORMAL: con WAL no se pierde consistencia, solo durabilidad de
+#   la última transacción ante un corte de luz
+# - mmap y caché de páginas para lecturas sin copias
+# - BEGIN IMMEDIATE: una transacción que lee y luego escribe toma el bloqueo al
+#   empezar, así espera el busy timeout en lugar de fallar con "database is locked"
+# - timeout: segundos que se espera el bloqueo de escritura de otro proceso
+# - serialize_writes: cola de escritura por proceso (Tablas/sqlite_backend)
+#   La cola se toma al empezar cualquier atomic(), también si el bloque solo
+#   lee, y con IMMEDIATE ese bloque toma además el bloqueo de escritura de
+#   SQLite hasta el COMMIT. Las lecturas van fuera de atomic() (no se usa
+#   ATOMIC_REQUESTS), así que solo esperan turno los bloques que escriben.
+
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -32000,  # KiB
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
+        'ENGINE': 'Tablas.sqlite_backend',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': ';'.join(f'PRAGMA {name}={value}' for name, value in SQLITE_PRAGMAS.items()),
+            'serialize_writes': True,
+        },
     }
 }
 
 
+# Réplicas de solo lectura para los GET públicos de catálogo (Tablas/db_router.py).
+# Para probar en local basta una copia del archivo, refrescada con
+# manage.py copiar_replica:
+#
+# DATABASES['replica'] = {
+#     **DATABASES['default'],
+#     'NAME': BASE_DIR / 'db.replica.sqlite3',
+#     'TEST': {'MIRROR': 'default'},
+# }
+# DATABASE_REPLICAS = ['replica']
+
+DATABASE_REPLICAS = []
+
+# Modelos que siempre se leen de 'default' (un token recién creado puede no estar aún en la réplica)
+DATABASE_PRIMARY_MODELS = ['Tablas.AuthToken']
+
+DATABASE_ROUTERS = ['Tablas.db_router.ReplicaRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# locmem es por proceso; con varios workers usar FileBasedCache para que las
+# invalidaciones lleguen a todos, p. ej.:
+#   'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+#   'LOCATION': BASE_DIR / 'cache',
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'destina',
+    }
+}
+
+# Segundos que se guarda una respuesta cacheada de los endpoints de catálogo
+API_CACHE_TIMEOUT = 300
+
+# Segundos que se guardan las noches ocupadas de una propiedad (Tablas/availability.py).
+# Cada worker invalida su caché al confirmar una reserva; el TTL acota lo que
+# tarda en verla un worker con otra caché en memoria
+AVAILABILITY_CACHE_TTL = 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -113,6 +188,11 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Hilos dedicados a calcular hashes de contraseñas en signup/login (vistas async)
+
+PASSWORD_HASHING_WORKERS = 4
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/5.2/topics/i18n/
 
@@ -134,3 +214,62 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Django REST Framework
+# Los endpoints se autentican con AuthToken (User propio de Tablas), con caché
+# en proceso token → usuario
+
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'Tablas.authentication.CachedTokenAuthentication',
+    ],
+    # JSON con orjson (misma salida que el JSONRenderer de DRF); MessagePack
+    # para los clientes que envíen Accept: application/msgpack
+    'DEFAULT_RENDERER_CLASSES': [
+        'Tablas.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+        'Tablas.renderers.MessagePackRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'Tablas.parsers.OrjsonParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+AUTH_TOKEN_CACHE_SIZE = 10000
+
+# Segundos que un token resuelto se reutiliza sin consultar la base de datos
+AUTH_TOKEN_CACHE_TTL = 60
+
+
+# Paginación por cursor (keyset) de los endpoints de listado
+# Los clientes pueden pedir otro tamaño con ?page_size= hasta API_MAX_PAGE_SIZE
+
+API_PAGE_SIZE = 50
+
+API_MAX_PAGE_SIZE = 500
+
+
+# Listados con ?stream=1 (Tablas.streaming): filas leídas y serializadas por bloque
+
+API_STREAM_CHUNK_SIZE = 500
+
+
+# Compresión de respuestas (Tablas.middleware): Brotli si el cliente lo acepta, si no gzip.
+# Calidad 4 equilibra tamaño y CPU para contenido dinámico (11 es para estáticos)
+
+API_BROTLI_QUALITY = 4
+
+
+# Búsquedas populares: segundos entre volcados del contador en memoria
+# (0 = escribir en cada búsqueda)
+
+SEARCH_STATS_FLUSH_INTERVAL = 5
+
+
+# Recomendador fuera de línea (manage.py entrenar_recomendador): directorio de
+# las versiones del modelo, que los workers cargan con memory-mapping
+
+RECOMENDADOR_DIR = BASE_DIR / 'modelos' / 'recomendador'
@@ -21,4 +21,8 @@ from django.urls import path, include
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('Tablas.urls')),
+    path('api/destinos/', include('destinos.urls')),
+    path('api/planes/', include('planes.urls')),
+    path('api/usuarios/', include('usuarios.urls')),
+    path('api/recomendaciones/', include('recomendaciones.urls')),
 ]
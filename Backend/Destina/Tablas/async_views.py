@@ -0,0 +1,91 @@
+from abc import ABC, abstractmethod
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotAcceptable
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.status import HTTP_406_NOT_ACCEPTABLE
+
+from .db_router import read_from_replicas
+from .renderers import MessagePackRenderer, OrjsonRenderer
+from .response_cache import acached
+
+# Lectura async de los endpoints públicos de catálogo.
+#
+# Bajo ASGI una APIView síncrona ocupa un hilo durante toda la petición; estas
+# vistas resuelven el GET en el bucle de eventos con el ORM async (aget,
+# async for), leyendo de las réplicas (Tablas.db_router), y serializan sin
+# salir de él (los querysets llevan eager_load, así que serializar no
+# consulta la base de datos). Las escrituras (POST, PUT...)
+# y los modos que necesitan la vista completa de DRF (p. ej. ?stream=1) se
+# delegan tal cual en la APIView síncrona de siempre (`sync_view`).
+
+WRITE_METHODS = ('post', 'put', 'patch', 'delete')
+
+
+class NegotiatedRenderMixin:
+    """
+    Respuestas de una View de Django con los renderers de DRF (orjson o
+    MessagePack según Accept o ?format=), igual que las APIView
+    """
+    renderer_classes = [OrjsonRenderer, MessagePackRenderer]
+    negotiator = DefaultContentNegotiation()
+
+    def api_request(self, request):
+        """Request de DRF sin autenticación ni parsers: query_params y ?format= para serializers y negociación"""
+        return Request(request, parsers=[], authenticators=[], negotiator=self.negotiator)
+
+    def render(self, request, data, status=200):
+        renderers = [renderer() for renderer in self.renderer_classes]
+        try:
+            renderer, media_type = self.negotiator.select_renderer(request, renderers)
+        except NotAcceptable as exc:
+            renderer, media_type = renderers[0], renderers[0].media_type
+            data, status = {'detail': str(exc.detail)}, HTTP_406_NOT_ACCEPTABLE
+        return HttpResponse(renderer.render(data, media_type), content_type=media_type, status=status)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncReadView(NegotiatedRenderMixin, ABC, View):
+    """
+    Base abstracta de las vistas de lectura async: negociación de formato y
+    delegación de escrituras. Las subclases definen `sync_view` e implementan read().
+    """
+    sync_view = None
+    # Etiquetas de Tablas.response_cache; admiten los argumentos de la URL
+    cache_tags = ()
+
+    @abstractmethod
+    async def read(self, request, *args, **kwargs):
+        """Devuelve (datos, estado) para el GET, con los mismos datos que el GET de `sync_view`"""
+
+    async def get(self, request, *args, **kwargs):
+        request = self.api_request(request)
+        with read_from_replicas():
+            if self.cache_tags:
+                tags = [tag.format(**kwargs) for tag in self.cache_tags]
+                data, status = await acached(request, tags, lambda: self.read(request, *args, **kwargs))
+            else:
+                data, status = await self.read(request, *args, **kwargs)
+        return self.render(request, data, status)
+
+    async def delegate(self, request, *args, **kwargs):
+        """Atiende la petición con la APIView síncrona"""
+        return await sync_to_async(self.sync_view.as_view())(request, *args, **kwargs)
+
+    async def _write(self, request, *args, **kwargs):
+        if not hasattr(self.sync_view, request.method.lower()):
+            return await self.http_method_not_allowed(request, *args, **kwargs)
+        return await self.delegate(request, *args, **kwargs)
+
+    post = put = patch = delete = _write
+
+    def _allowed_methods(self):
+        return [
+            method.upper() for method in self.http_method_names
+            if hasattr(self, method) and (method not in WRITE_METHODS or hasattr(self.sync_view, method))
+        ]
@@ -0,0 +1,104 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .models import AuthToken
+
+
+class TokenCache:
+    """
+    LRU en proceso token → (usuario, token) con caducidad. La caducidad acota
+    cuánto puede tardar otro worker en ver un logout o un cambio de perfil;
+    en este proceso las señales de User/AuthToken invalidan al momento.
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'AUTH_TOKEN_CACHE_SIZE', 10000)
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'AUTH_TOKEN_CACHE_TTL', 60)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, token = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+        # Copia: cada petición puede modificar su request.user sin tocar la caché
+        return copy.copy(token.user_id), token
+
+    def set(self, token):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._remove(token.key)
+            self._entries[token.key] = (time.monotonic() + self.ttl, token)
+            self._keys_by_user.setdefault(token.user_id_id, set()).add(token.key)
+            while len(self._entries) > self.max_size:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def invalidate_key(self, key):
+        with self._lock:
+            self._remove(key)
+
+    def invalidate_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[1].user_id_id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    `Authorization: Token <key>` contra AuthToken (User propio de Tablas),
+    resolviendo el token desde token_cache para evitar una consulta por petición.
+    """
+    model = AuthToken
+
+    def authenticate_credentials(self, key):
+        cached = token_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            token = AuthToken.objects.select_related('user_id').get(key=key)
+        except AuthToken.DoesNotExist:
+            raise AuthenticationFailed('Invalid token.')
+
+        token_cache.set(token)
+        return copy.copy(token.user_id), token
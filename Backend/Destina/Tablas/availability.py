@@ -0,0 +1,88 @@
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .models import Booking
+
+# Una reserva ocupa las noches del intervalo [start_date, end_date): el día de
+# salida queda libre para la siguiente llegada.
+
+BLOCKING_STATUSES = ('pending', 'confirmed')
+
+AVAILABILITY_KEY_PREFIX = 'availability:listing:'
+
+
+class BlockedIntervals:
+    """
+    Noches ocupadas de una propiedad como intervalos [inicio, fin) ordenados,
+    fusionados y sin solapamientos (ordinales de fecha). Las consultas sobre un
+    rango son búsquedas binarias, independientemente del número de reservas.
+    """
+    __slots__ = ('starts', 'ends')
+
+    def __init__(self, intervals=()):
+        self.starts = []
+        self.ends = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    @classmethod
+    def from_dates(cls, ranges):
+        return cls((start.toordinal(), end.toordinal()) for start, end in ranges)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, start, end):
+        """Intervalos ocupados dentro de [start, end), recortados a ese rango"""
+        start, end = start.toordinal(), end.toordinal()
+        # Primer intervalo que termina después de start
+        first = bisect_right(self.ends, start)
+        # Intervalos que empiezan antes de end
+        last = bisect_left(self.starts, end)
+        return [
+            (date.fromordinal(max(self.starts[i], start)), date.fromordinal(min(self.ends[i], end)))
+            for i in range(first, last)
+        ]
+
+    def is_free(self, start, end):
+        return not self.overlapping(start, end)
+
+    def blocked_nights(self, start, end):
+        nights = []
+        for block_start, block_end in self.overlapping(start, end):
+            nights.extend(block_start + timedelta(days=n) for n in range((block_end - block_start).days))
+        return nights
+
+
+def overlapping_bookings(listing_id, start_date, end_date):
+    """Reservas activas que se solapan con [start_date, end_date) (usa booking_listing_dates_idx)"""
+    return Booking.objects.filter(
+        listing_id=listing_id,
+        end_date__gt=start_date,
+        start_date__lt=end_date,
+        status__in=BLOCKING_STATUSES,
+    )
+
+
+def get_blocked_intervals(listing_id):
+    """Intervalos ocupados de una propiedad, cacheados hasta la próxima reserva confirmada o el TTL"""
+    key = f'{AVAILABILITY_KEY_PREFIX}{listing_id}'
+    intervals = cache.get(key)
+    if intervals is None:
+        ranges = Booking.objects.filter(
+            listing_id=listing_id, status__in=BLOCKING_STATUSES
+        ).values_list('start_date', 'end_date')
+        intervals = BlockedIntervals.from_dates(ranges)
+        cache.set(key, intervals, timeout=getattr(settings, 'AVAILABILITY_CACHE_TTL', 60))
+    return intervals
+
+
+def invalidate_availability(listing_id):
+    cache.delete(f'{AVAILABILITY_KEY_PREFIX}{listing_id}')
@@ -0,0 +1,81 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Lecturas en réplicas (DATABASE_REPLICAS) para los GET públicos de catálogo.
+#
+# Solo las vistas marcadas (ReplicaReadsMixin, Tablas.async_views) leen de una
+# réplica, y solo mientras se atiende su GET; el resto del código sigue
+# leyendo de 'default'. En cuanto la petición escribe, lo que queda de ella
+# lee de 'default' para ver sus propias escrituras. Los modelos de
+# DATABASE_PRIMARY_MODELS (tokens de sesión) se leen siempre de 'default':
+# un token recién creado puede no haber llegado todavía a la réplica.
+
+_routing = ContextVar('db_routing', default=None)
+
+
+class _RoutingState:
+    __slots__ = ('pinned',)
+
+    def __init__(self):
+        self.pinned = False
+
+
+@contextmanager
+def read_from_replicas():
+    """Dentro del bloque las lecturas van a una réplica hasta la primera escritura"""
+    # El estado es un objeto mutable: sync_to_async copia el contexto, pero
+    # una escritura hecha en el hilo del ORM fija la petición entera
+    token = _routing.set(_RoutingState())
+    try:
+        yield
+    finally:
+        _routing.reset(token)
+
+
+def replicas():
+    return getattr(settings, 'DATABASE_REPLICAS', [])
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is None or state.pinned or not replicas():
+            return None
+        if model._meta.label in getattr(settings, 'DATABASE_PRIMARY_MODELS', ()):
+            return None
+        # Las relaciones de un objeto leído de una réplica se leen de la misma réplica
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db in replicas():
+            return instance._state.db
+        return random.choice(replicas())
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            state.pinned = True
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Réplicas y 'default' tienen los mismos datos
+        databases = {'default', *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Las réplicas son copias de 'default': no se migran por separado
+        return db not in replicas()
+
+
+class ReplicaReadsMixin:
+    """Para APIView públicas de solo lectura: el GET lee de las réplicas"""
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        with read_from_replicas():
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,74 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+
+
+def _resolve_serializer(serializer, context=None):
+    """Acepta una clase o una instancia de serializer y devuelve una instancia"""
+    if isinstance(serializer, type):
+        return serializer(context=context or {})
+    return serializer
+
+
+def _plan(serializer, model, prefix=''):
+    """
+    Recorre los campos del serializer y devuelve las rutas para select_related
+    y los Prefetch necesarios para serializar sin consultas adicionales por fila.
+    """
+    select = []
+    prefetch = []
+
+    # Las relaciones que se devuelven aparte en `included` (?sideload=1) salen
+    # como ids en la fila pero hay que cargarlas igual que si fueran anidadas
+    serializer_fields = serializer.fields  # get_fields() registra sideloaded_fields
+    sideloaded = getattr(serializer, 'sideloaded_fields', {})
+    fields = [(field, field.source) for name, field in serializer_fields.items() if name not in sideloaded]
+    fields.extend(sideloaded.values())
+
+    for field, source in fields:
+        if field.write_only or source == '*' or '.' in source:
+            continue
+
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            continue
+        if not model_field.is_relation:
+            continue
+
+        path = prefix + source
+        related_model = model_field.related_model
+
+        if isinstance(field, serializers.ListSerializer):
+            # Relaciones inversas o many-to-many serializadas como lista
+            queryset = eager_load(related_model._default_manager.all(), field.child)
+            prefetch.append(Prefetch(path, queryset=queryset))
+        elif isinstance(field, serializers.BaseSerializer):
+            # FK u OneToOne anidado: se une en la misma consulta
+            select.append(path)
+            nested_select, nested_prefetch = _plan(field, related_model, path + '__')
+            select.extend(nested_select)
+            prefetch.extend(nested_prefetch)
+        elif isinstance(field, serializers.ManyRelatedField):
+            # Solo se serializan ids: basta la clave primaria (y la FK de vuelta en relaciones inversas)
+            only = [related_model._meta.pk.name]
+            if model_field.one_to_many:
+                only.append(model_field.field.name)
+            prefetch.append(Prefetch(path, queryset=related_model._default_manager.only(*only)))
+
+    return select, prefetch
+
+
+def eager_load(queryset, serializer, context=None):
+    """
+    Aplica select_related/prefetch_related a un queryset según los campos
+    anidados del serializer, para que el número de consultas no dependa del
+    número de filas devueltas. Con el contexto del request se respetan
+    ?fields= y ?expand= (Tablas.sparse_fields): solo se une lo pedido.
+    """
+    select, prefetch = _plan(_resolve_serializer(serializer, context), queryset.model)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
@@ -0,0 +1,34 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+# PBKDF2 (hashlib) libera el GIL mientras calcula, así que un pool de hilos
+# reparte el trabajo entre núcleos sin bloquear el event loop de las vistas
+# async. El pool está acotado por PASSWORD_HASHING_WORKERS.
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_hashing_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', 4),
+                thread_name_prefix='password-hashing',
+            )
+        return _executor
+
+
+async def amake_password(password):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hashing_executor(), make_password, password)
+
+
+async def acheck_password(password, encoded):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_hashing_executor(), check_password, password, encoded)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from Tablas.db_router import replicas
+
+
+class Command(BaseCommand):
+    help = 'Copia la base de datos default en las réplicas SQLite locales de DATABASE_REPLICAS'
+
+    def handle(self, *args, **options):
+        if not replicas():
+            raise CommandError('DATABASE_REPLICAS está vacío')
+        source = connections['default']
+        if source.vendor != 'sqlite':
+            raise CommandError('Solo se copian bases SQLite; las réplicas de otros motores las mantiene su propia replicación')
+        source.ensure_connection()
+        for alias in replicas():
+            target = connections[alias]
+            if target.vendor != 'sqlite':
+                raise CommandError(f'La réplica {alias} no es SQLite')
+            target.ensure_connection()
+            # API de backup de SQLite: copia consistente aunque haya escrituras en curso
+            source.connection.backup(target.connection)
+            self.stdout.write(self.style.SUCCESS(f'Réplica {alias} actualizada ({target.settings_dict["NAME"]})'))
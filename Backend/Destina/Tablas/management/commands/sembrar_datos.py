@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from benchmarks.dataset import PASSWORD, generate
+from Tablas.models import User
+
+
+class Command(BaseCommand):
+    help = 'Llena una base de datos vacía con datos sintéticos a escala (benchmarks/dataset.py)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--usuarios', type=int, default=1000, help='Usuarios; el resto de tablas escala con este número')
+        parser.add_argument('--semilla', type=int, default=0, help='Misma semilla, mismos datos')
+        parser.add_argument('--password', default=PASSWORD, help='Contraseña común de todos los usuarios')
+
+    def handle(self, *args, **options):
+        if options['usuarios'] <= 0:
+            raise CommandError('--usuarios debe ser mayor que 0')
+        if User.objects.exists():
+            raise CommandError('La base de datos ya tiene usuarios: sembrar_datos solo llena bases vacías')
+        counts = generate(options['usuarios'], options['semilla'], options['password'])
+        self.stdout.write(self.style.SUCCESS(', '.join(f'{count} {name}' for name, count in counts.items())))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:54
+
+import Tablas.search
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0002_booking_category_chatmessage_destination_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSearch',
+            fields=[
+                ('listing_id', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_entry', serialize=False, to='Tablas.listing')),
+                ('title', models.TextField()),
+                ('description', models.TextField()),
+                ('destination', models.TextField()),
+                ('category', models.TextField()),
+                ('document', Tablas.search.FullTextField(db_column='listing_search')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'listing_search',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(Tablas.search.create_search_index, Tablas.search.drop_search_index),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:55
+
+from django.db import migrations, models
+
+
+def merge_duplicate_searches(apps, schema_editor):
+    """Une las filas repetidas sumando sus contadores y descarta las búsquedas vacías"""
+    PopularSearch = apps.get_model('Tablas', 'PopularSearch')
+    totals = {}
+    for search in PopularSearch.objects.order_by('search_id'):
+        text = search.search_text.strip()
+        if not text:
+            search.delete()
+        elif text in totals:
+            kept = totals[text]
+            kept.times_used += search.times_used
+            search.delete()
+        else:
+            totals[text] = search
+    for search in totals.values():
+        search.search_text = search.search_text.strip()
+        search.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0003_listing_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_searches, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='popularsearch',
+            name='search_text',
+            field=models.CharField(max_length=255, unique=True),
+        ),
+    ]
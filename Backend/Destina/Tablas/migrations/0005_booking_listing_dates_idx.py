@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0004_popularsearch_unique_text'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['listing_id', 'end_date', 'start_date'], name='booking_listing_dates_idx'),
+        ),
+    ]
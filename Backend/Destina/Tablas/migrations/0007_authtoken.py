@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0006_chatmessage_session_time_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('user_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='auth_token', to='Tablas.user')),
+            ],
+            options={
+                'db_table': 'auth_token',
+            },
+        ),
+    ]
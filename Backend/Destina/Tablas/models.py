@@ -1,6 +1,9 @@
+import secrets
+
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .search import FullTextField, SEARCH_TABLE
 
 # User Model
 class User(models.Model):
@@ -16,12 +19,49 @@ class User(models.Model):
     name = models.CharField(max_length=200)
     created_at = models.DateTimeField(auto_now_add=True)
     role = models.CharField(max_length=20, choices=ROLE_CHOICES)
+    # Reputación a partir de ResenaUsuario, mantenida por usuarios.signals
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_avg = models.FloatField(default=0.0, editable=False)
+    # Contadores de SeguimientoUsuario, mantenidos por usuarios.signals
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Necesarios para los permisos de DRF (IsAuthenticated)
+    @property
+    def is_authenticated(self):
+        return True
+
+    @property
+    def is_anonymous(self):
+        return False
 
     def __str__(self):
         return f"{self.name} ({self.email})"
 
     class Meta:
         db_table = 'user'
+        indexes = [
+            models.Index(fields=['rating_avg'], name='user_rating_avg_idx'),
+        ]
+
+
+# AuthToken Model (token de API del User propio; authtoken de DRF usa auth.User)
+class AuthToken(models.Model):
+    key = models.CharField(max_length=40, primary_key=True)
+    user_id = models.OneToOneField(User, on_delete=models.CASCADE, related_name='auth_token')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = secrets.token_hex(20)
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Token de {self.user_id_id}"
+
+    class Meta:
+        db_table = 'auth_token'
 
 
 # Destination Model
@@ -72,6 +112,43 @@ class Listing(models.Model):
 
     class Meta:
         db_table = 'listing'
+        # Parciales sobre is_active: los listados públicos solo leen propiedades activas
+        indexes = [
+            models.Index(
+                fields=['rating_avg', 'listing_id'], condition=models.Q(is_active=True),
+                name='listing_active_rating_idx',
+            ),
+            models.Index(
+                fields=['created_at', 'listing_id'], condition=models.Q(is_active=True),
+                name='listing_active_recent_idx',
+            ),
+            models.Index(
+                fields=['destination_id', 'category_id', 'created_at', 'listing_id'], condition=models.Q(is_active=True),
+                name='listing_active_dest_idx',
+            ),
+            models.Index(
+                fields=['price_per_night', 'listing_id'], condition=models.Q(is_active=True),
+                name='listing_active_price_idx',
+            ),
+        ]
+
+
+# Índice de búsqueda de Listing (tabla virtual FTS5, mantenida por triggers)
+class ListingSearch(models.Model):
+    listing_id = models.OneToOneField(
+        Listing, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_entry'
+    )
+    title = models.TextField()
+    description = models.TextField()
+    destination = models.TextField()
+    category = models.TextField()
+    document = FullTextField(db_column=SEARCH_TABLE)
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = SEARCH_TABLE
 
 
 # Image Model
@@ -111,6 +188,12 @@ class Booking(models.Model):
 
     class Meta:
         db_table = 'booking'
+        indexes = [
+            # Comprobación de solapamiento de fechas por propiedad
+            models.Index(fields=['listing_id', 'end_date', 'start_date'], name='booking_listing_dates_idx'),
+            # Historial de reservas del usuario (orden de KeysetPagination)
+            models.Index(fields=['user_id', 'created_at', 'booking_id'], name='booking_user_recent_idx'),
+        ]
 
 
 # ChatMessage Model
@@ -127,12 +210,16 @@ class ChatMessage(models.Model):
 
     class Meta:
         db_table = 'chatmessage'
+        indexes = [
+            # Historial de una sesión en orden cronológico
+            models.Index(fields=['session_id', 'timestamp'], name='chat_session_time_idx'),
+        ]
 
 
 # PopularSearch Model
 class PopularSearch(models.Model):
     search_id = models.AutoField(primary_key=True)
-    search_text = models.CharField(max_length=255)
+    search_text = models.CharField(max_length=255, unique=True)
     times_used = models.IntegerField(default=1)
 
     def __str__(self):
@@ -0,0 +1,118 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def _cursor_value(value):
+    """Serializa fechas y decimales sin perder precisión (microsegundos incluidos)"""
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor opaco sobre claves estables (keyset).
+
+    El cursor guarda los valores de ordenación de la última fila entregada y
+    la página siguiente se obtiene con un WHERE sobre esas claves, de modo que
+    una página profunda cuesta lo mismo que la primera (sin OFFSET).
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Cursor inválido'
+
+    def __init__(self, ordering, page_size=None):
+        self.ordering = tuple(ordering)
+        self.page_size = page_size or getattr(settings, 'API_PAGE_SIZE', 50)
+        self.max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, values):
+        raw = json.dumps(values, default=_cursor_value, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            values = json.loads(base64.urlsafe_b64decode(encoded + padding))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return values
+
+    def keyset_filter(self, values):
+        """Construye (a > x) OR (a = x AND b > y) ... respetando la dirección de cada clave"""
+        condition = Q()
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f'{name}__{lookup}': value})
+            equal &= Q(**{name: value})
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if cursor is not None:
+            # Un cursor manipulado puede traer valores que el campo no acepta
+            # (fecha o decimal mal formados): se trata como cualquier cursor inválido
+            try:
+                queryset = queryset.filter(self.keyset_filter(cursor))
+            except (ValidationError, ValueError, TypeError):
+                raise NotFound(self.invalid_cursor_message)
+
+        # Se pide una fila extra para saber si existe una página siguiente
+        rows = list(queryset[:page_size + 1])
+        self.has_next = len(rows) > page_size
+        self.page = rows[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        last = self.page[-1]
+        # Las filas pueden ser instancias o diccionarios (querysets con values())
+        if isinstance(last, dict):
+            values = [last[field.lstrip('-')] for field in self.ordering]
+        else:
+            values = [getattr(last, field.lstrip('-')) for field in self.ordering]
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(values))
+
+    def get_paginated_response(self, data):
+        if isinstance(data, dict) and 'included' in data:
+            # Formato side-loaded (Tablas.sparse_fields): las filas ya vienen separadas
+            return Response({
+                'next': self.get_next_link(),
+                'results': data['results'],
+                'included': data['included'],
+            })
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
@@ -0,0 +1,111 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import PopularSearch
+from .response_cache import invalidate
+
+logger = logging.getLogger(__name__)
+
+FLUSH_BATCH_SIZE = 500
+
+
+class SearchHitBuffer:
+    """
+    Acumula en memoria (por proceso) las búsquedas realizadas y las vuelca
+    periódicamente a PopularSearch con incrementos atómicos por lotes, para
+    que el endpoint de búsqueda no escriba en la base de datos.
+    """
+
+    def __init__(self):
+        self._counts = Counter()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def interval(self):
+        return getattr(settings, 'SEARCH_STATS_FLUSH_INTERVAL', 5)
+
+    def record(self, search_text):
+        search_text = search_text.strip()[:255]
+        if not search_text:
+            return
+        with self._lock:
+            self._counts[search_text] += 1
+        if self.interval <= 0:
+            # Volcado en la propia petición: un fallo no debe convertirla en un 500
+            try:
+                self.flush()
+            except DatabaseError:
+                logger.exception('No se pudieron volcar las búsquedas populares')
+        else:
+            self._schedule()
+
+    def _schedule(self):
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.interval, self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except DatabaseError:
+            # flush() ya devolvió el lote al buffer para el siguiente volcado
+            logger.exception('No se pudieron volcar las búsquedas populares')
+        finally:
+            # El hilo del temporizador abre su propia conexión
+            connections.close_all()
+
+    def flush(self):
+        """Escribe los contadores pendientes; si falla, se conservan para el siguiente intento"""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        if not counts:
+            return
+
+        items = list(counts.items())
+        try:
+            with transaction.atomic():
+                for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                    self._write(items[start:start + FLUSH_BATCH_SIZE])
+        except DatabaseError:
+            with self._lock:
+                self._counts.update(counts)
+            if self.interval > 0:
+                self._schedule()
+            raise
+        invalidate('popular-searches')
+
+    def _write(self, items):
+        PopularSearch.objects.bulk_create(
+            [PopularSearch(search_text=text, times_used=0) for text, _ in items],
+            ignore_conflicts=True,
+        )
+        increment = Case(
+            *[When(search_text=text, then=Value(hits)) for text, hits in items],
+            output_field=IntegerField(),
+        )
+        PopularSearch.objects.filter(
+            search_text__in=[text for text, _ in items]
+        ).update(times_used=F('times_used') + increment)
+
+
+search_hits = SearchHitBuffer()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        search_hits.flush()
+    except DatabaseError:
+        logger.exception('No se pudieron volcar las búsquedas populares al salir')
@@ -0,0 +1,55 @@
+from django.db.models import Case, Count, F, FloatField, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
+
+# Agregados de valoración desnormalizados: cada modelo valorado guarda el número
+# de valoraciones, su suma y la media resultante en columnas propias, de modo que
+# filtrar u ordenar por valoración lee una columna indexada en vez de agregar.
+
+
+def _average(count, total):
+    return Case(
+        When(GreaterThan(count, 0), then=Cast(total, FloatField()) / Cast(count, FloatField())),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def apply_rating_delta(queryset, count_delta, sum_delta,
+                       count_field='rating_count', sum_field='rating_sum', avg_field='rating_avg'):
+    """
+    Suma (o resta) valoraciones con un único UPDATE atómico. Se llama dentro de
+    la misma transacción que inserta o borra la valoración.
+    """
+    new_count = F(count_field) + count_delta
+    new_sum = F(sum_field) + sum_delta
+    return queryset.update(**{
+        count_field: new_count,
+        sum_field: new_sum,
+        avg_field: _average(new_count, new_sum),
+    })
+
+
+def recompute_ratings(queryset, ratings, target_field, value_field='rating',
+                      count_field='rating_count', sum_field='rating_sum', avg_field='rating_avg'):
+    """
+    Recalcula en bloque los agregados de las filas de `queryset` a partir del
+    queryset de valoraciones `ratings` (agrupado por `target_field`). Solo
+    escribe las filas desajustadas; devuelve cuántas se corrigieron.
+    """
+    grouped = ratings.filter(**{target_field: OuterRef('pk')}).order_by().values(target_field)
+    real_count = Coalesce(
+        Subquery(grouped.annotate(n=Count('pk')).values('n')), 0, output_field=IntegerField()
+    )
+    real_sum = Coalesce(
+        Subquery(grouped.annotate(s=Sum(value_field)).values('s')), 0, output_field=IntegerField()
+    )
+
+    drifted = queryset.annotate(real_count=real_count, real_sum=real_sum).exclude(
+        **{count_field: F('real_count'), sum_field: F('real_sum')}
+    ).values('pk')
+    return queryset.model._default_manager.filter(pk__in=Subquery(drifted)).update(**{
+        count_field: real_count,
+        sum_field: real_sum,
+        avg_field: _average(real_count, real_sum),
+    })
@@ -0,0 +1,63 @@
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Renderers de la API (ver REST_FRAMEWORK en settings).
+#
+# OrjsonRenderer produce los mismos bytes que el JSONRenderer de DRF en modo
+# compacto: datetime, date, time, Decimal, timedelta, UUID, etc. se convierten
+# con el mismo JSONEncoder de DRF, y U+2028/U+2029 se escapan igual. Si la
+# respuesta pide sangría (navegador de la API, Accept: ...; indent=4) o
+# contiene algo que orjson no sabe escribir (enteros de más de 64 bits), se
+# delega en el renderer estándar.
+#
+# MessagePackRenderer sirve application/msgpack a los clientes que lo pidan
+# en Accept (o con ?format=msgpack), con las mismas conversiones de tipos.
+
+_encoder = JSONEncoder()
+
+ORJSON_OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+def encode_default(obj):
+    """Conversión de tipos no nativos, idéntica a la del JSONRenderer de DRF"""
+    return _encoder.default(obj)
+
+
+_fallback = JSONRenderer()
+
+
+def dumps(data):
+    """JSON compacto con los mismos bytes que el JSONRenderer de DRF"""
+    try:
+        ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+    except orjson.JSONEncodeError:
+        return _fallback.render(data)
+    # Mismo escape que DRF para que la salida sea un subconjunto estricto de JavaScript
+    if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+        ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+    return ret
+
+
+class OrjsonRenderer(JSONRenderer):
+    """JSONRenderer sobre orjson"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if not self.compact or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,106 @@
+import hashlib
+import time
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+# Caché de respuestas GET para endpoints de catálogo.
+#
+# Cada respuesta se guarda bajo una clave que combina la ruta, los parámetros
+# normalizados y la versión actual de sus etiquetas (p. ej. 'destinations' o
+# 'destination:3:clima'). Una escritura incrementa la versión de las etiquetas
+# afectadas y así solo esas entradas dejan de ser alcanzables; el resto de la
+# caché sigue válida. Funciona con los backends locmem y de archivos de Django.
+
+VERSION_KEY_PREFIX = 'response-cache:version:'
+RESPONSE_KEY_PREFIX = 'response-cache:data:'
+
+
+def _fresh_version():
+    # Si la clave de versión se pierde (expulsión), la nueva no coincide con
+    # ninguna anterior y no se sirven respuestas viejas
+    return time.time_ns()
+
+
+def _tag_versions(tags):
+    keys = [VERSION_KEY_PREFIX + tag for tag in tags]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _fresh_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def invalidate(*tags):
+    """Invalida todas las respuestas cacheadas con alguna de estas etiquetas"""
+    for tag in tags:
+        key = VERSION_KEY_PREFIX + tag
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_version(), timeout=None)
+
+
+def normalize_query(query_params):
+    """Ordena los parámetros y descarta los vacíos: ?b=2&a=1 y ?a=1&b=2&c= comparten clave"""
+    items = []
+    for name in sorted(query_params.keys()):
+        values = sorted(value for value in query_params.getlist(name) if value != '')
+        items.extend((name, value) for value in values)
+    return '&'.join(f'{name}={value}' for name, value in items)
+
+
+def response_cache_key(request, tags):
+    versions = _tag_versions(tags)
+    raw = '|'.join([request.path, normalize_query(request.query_params), *map(str, versions)])
+    return RESPONSE_KEY_PREFIX + hashlib.md5(raw.encode()).hexdigest()
+
+
+def cache_response(*tags, timeout=None):
+    """
+    Decorador para métodos get() de APIView. Las etiquetas pueden usar los
+    argumentos de la URL, p. ej. 'destination:{destino_id}:clima'.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            resolved = [tag.format(**kwargs) for tag in tags]
+            key = response_cache_key(request, resolved)
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = method(view, request, *args, **kwargs)
+            # Las respuestas en streaming (?stream=1) no se guardan
+            if isinstance(response, Response) and response.status_code == 200:
+                cache.set(key, response.data, timeout or getattr(settings, 'API_CACHE_TIMEOUT', 300))
+            return response
+        return wrapper
+    return decorator
+
+
+async def acached(request, tags, read, timeout=None):
+    """
+    Equivalente de cache_response para las vistas async (Tablas.async_views):
+    devuelve (datos, estado) de la caché o de `await read()`.
+    """
+    # Versiones de etiquetas y lectura en una sola llamada fuera del bucle de
+    # eventos (la caché es thread-safe: no hace falta el hilo de la base de datos)
+    def lookup():
+        key = response_cache_key(request, tags)
+        return key, cache.get(key)
+
+    key, data = await sync_to_async(lookup, thread_sensitive=False)()
+    if data is not None:
+        return data, 200
+
+    data, status = await read()
+    if status == 200:
+        await sync_to_async(cache.set, thread_sensitive=False)(
+            key, data, timeout or getattr(settings, 'API_CACHE_TIMEOUT', 300),
+        )
+    return data, status
@@ -0,0 +1,158 @@
+import re
+
+from django.db import connections
+from django.db import models
+from django.db.models import F, FloatField, Q, Value
+
+# Índice de texto completo (SQLite FTS5) sobre listing + destination + category.
+# Se mantiene sincronizado con triggers, así también lo cubren queryset.update(),
+# bulk_create() y las escrituras desde el admin.
+
+SEARCH_TABLE = 'listing_search'
+
+SEARCH_ORDERING = ('rank', 'listing_id')
+
+CREATE_INDEX_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} USING fts5(
+    title, description, destination, category,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+_INDEX_LISTING_SQL = f"""
+    INSERT INTO {SEARCH_TABLE}(rowid, title, description, destination, category)
+    SELECT NEW.listing_id, NEW.title, NEW.description,
+           d.name || ' ' || d.country, COALESCE(c.name, '')
+    FROM destination d
+    LEFT JOIN category c ON c.category_id = NEW.category_id_id
+    WHERE d.destination_id = NEW.destination_id_id;
+"""
+
+CREATE_TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listing_search_ai AFTER INSERT ON listing BEGIN
+        {_INDEX_LISTING_SQL}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listing_search_ad AFTER DELETE ON listing BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.listing_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS listing_search_au
+    AFTER UPDATE OF title, description, destination_id_id, category_id_id ON listing BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE rowid = OLD.listing_id;
+        {_INDEX_LISTING_SQL}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS destination_search_au
+    AFTER UPDATE OF name, country ON destination BEGIN
+        UPDATE {SEARCH_TABLE} SET destination = NEW.name || ' ' || NEW.country
+        WHERE rowid IN (SELECT listing_id FROM listing WHERE destination_id_id = NEW.destination_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS category_search_au
+    AFTER UPDATE OF name ON category BEGIN
+        UPDATE {SEARCH_TABLE} SET category = NEW.name
+        WHERE rowid IN (SELECT listing_id FROM listing WHERE category_id_id = NEW.category_id);
+    END
+    """,
+]
+
+REBUILD_INDEX_SQL = f"""
+INSERT INTO {SEARCH_TABLE}(rowid, title, description, destination, category)
+SELECT l.listing_id, l.title, l.description, d.name || ' ' || d.country, COALESCE(c.name, '')
+FROM listing l
+INNER JOIN destination d ON d.destination_id = l.destination_id_id
+LEFT JOIN category c ON c.category_id = l.category_id_id
+"""
+
+DROP_INDEX_SQL = [
+    'DROP TRIGGER IF EXISTS listing_search_ai',
+    'DROP TRIGGER IF EXISTS listing_search_ad',
+    'DROP TRIGGER IF EXISTS listing_search_au',
+    'DROP TRIGGER IF EXISTS destination_search_au',
+    'DROP TRIGGER IF EXISTS category_search_au',
+    f'DROP TABLE IF EXISTS {SEARCH_TABLE}',
+]
+
+
+class FullTextField(models.TextField):
+    """Columna oculta de una tabla FTS5 (la que lleva el nombre de la tabla)"""
+
+
+@FullTextField.register_lookup
+class Match(models.Lookup):
+    """`campo__match=consulta` se traduce al operador MATCH de FTS5"""
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', [*lhs_params, *rhs_params]
+
+
+def install_search_triggers(apps, schema_editor):
+    """
+    Crea los triggers de sincronización. Las migraciones que reconstruyen las
+    tablas listing/destination/category en SQLite deben volver a llamarla,
+    porque al reconstruir una tabla se pierden sus triggers.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """Crea la tabla FTS5, sus triggers y la llena con los listings existentes"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_INDEX_SQL)
+    install_search_triggers(apps, schema_editor)
+    schema_editor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    schema_editor.execute(REBUILD_INDEX_SQL)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_INDEX_SQL:
+        schema_editor.execute(statement)
+
+
+def build_match_query(text):
+    """
+    Convierte texto libre en una consulta FTS5 segura: cada palabra se busca
+    como prefijo (para búsquedas mientras se escribe) y todas deben aparecer.
+    """
+    terms = re.findall(r'\w+', text)
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def search_listings(queryset, text):
+    """
+    Filtra un queryset de Listing por texto y lo anota con `rank` (bm25, menor
+    es más relevante). Fuera de SQLite se recurre a icontains sobre los mismos
+    campos, con un rank constante.
+    """
+    match = build_match_query(text)
+    if not match:
+        # Sin palabras (solo signos) no hay resultados, pero el rank debe existir para ordenar
+        return queryset.none().annotate(rank=Value(0.0, output_field=FloatField()))
+
+    if connections[queryset.db].vendor != 'sqlite':
+        condition = Q()
+        for term in re.findall(r'\w+', text):
+            condition &= (
+                Q(title__icontains=term) | Q(description__icontains=term)
+                | Q(destination_id__name__icontains=term) | Q(destination_id__country__icontains=term)
+                | Q(category_id__name__icontains=term)
+            )
+        return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+    return queryset.filter(search_entry__document__match=match).annotate(rank=F('search_entry__rank'))
@@ -1,40 +1,46 @@
 from rest_framework import serializers
 from .models import User, Destination, Category, Listing, Booking, ChatMessage, Image, PopularSearch
+from .sparse_fields import SparseModelSerializer
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseModelSerializer):
     class Meta:
         model = User
-        fields = ['user_id', 'email', 'name', 'created_at', 'role']
-        read_only_fields = ['user_id', 'created_at']
+        fields = [
+            'user_id', 'email', 'name', 'created_at', 'role', 'rating_avg', 'rating_count',
+            'followers_count', 'following_count',
+        ]
+        read_only_fields = [
+            'user_id', 'created_at', 'rating_avg', 'rating_count', 'followers_count', 'following_count',
+        ]
 
 
-class DestinationSerializer(serializers.ModelSerializer):
+class DestinationSerializer(SparseModelSerializer):
     class Meta:
         model = Destination
         fields = ['destination_id', 'name', 'country', 'description', 'slug']
         read_only_fields = ['destination_id']
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseModelSerializer):
     class Meta:
         model = Category
         fields = ['category_id', 'name', 'icon_name', 'description']
         read_only_fields = ['category_id']
 
 
-class ImageSerializer(serializers.ModelSerializer):
+class ImageSerializer(SparseModelSerializer):
     class Meta:
         model = Image
         fields = ['image_id', 'listing_id', 'url', 'is_main']
         read_only_fields = ['image_id']
 
 
-class ListingSerializer(serializers.ModelSerializer):
+class ListingSerializer(SparseModelSerializer):
     host_id = UserSerializer(read_only=True)
     destination_id = DestinationSerializer(read_only=True)
     category_id = CategorySerializer(read_only=True)
-    images = ImageSerializer(source='images', many=True, read_only=True)
+    images = ImageSerializer(many=True, read_only=True)
     
     class Meta:
         model = Listing
@@ -46,7 +52,7 @@ class ListingSerializer(serializers.ModelSerializer):
         read_only_fields = ['listing_id', 'created_at', 'rating_avg']
 
 
-class BookingSerializer(serializers.ModelSerializer):
+class BookingSerializer(SparseModelSerializer):
     user_id = UserSerializer(read_only=True)
     listing_id = ListingSerializer(read_only=True)
     
@@ -59,7 +65,7 @@ class BookingSerializer(serializers.ModelSerializer):
         read_only_fields = ['booking_id', 'created_at']
 
 
-class ChatMessageSerializer(serializers.ModelSerializer):
+class ChatMessageSerializer(SparseModelSerializer):
     user_id = UserSerializer(read_only=True)
     
     class Meta:
@@ -71,7 +77,15 @@ class ChatMessageSerializer(serializers.ModelSerializer):
         read_only_fields = ['message_id', 'timestamp']
 
 
-class PopularSearchSerializer(serializers.ModelSerializer):
+class ChatMessageCompactSerializer(SparseModelSerializer):
+    """Mensaje sin el usuario anidado ni la sesión (ya conocida por el cliente)"""
+    class Meta:
+        model = ChatMessage
+        fields = ['message_id', 'user_id', 'sender', 'message_text', 'timestamp']
+        read_only_fields = fields
+
+
+class PopularSearchSerializer(SparseModelSerializer):
     class Meta:
         model = PopularSearch
         fields = ['search_id', 'search_text', 'times_used']
@@ -0,0 +1,37 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .availability import invalidate_availability
+from .authentication import token_cache
+from .models import AuthToken, Booking, Category, Destination, User
+from .response_cache import invalidate
+
+
+@receiver([post_save, post_delete], sender=Destination)
+def invalidate_destination_cache(sender, instance, **kwargs):
+    # Clima y galería incluyen el destino serializado
+    invalidate('destinations', f'destination:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_category_cache(sender, instance, **kwargs):
+    invalidate('categories')
+
+
+@receiver([post_save, post_delete], sender=Booking)
+def invalidate_booking_availability(sender, instance, using, **kwargs):
+    # Tras el COMMIT: si se invalidara antes, una lectura concurrente volvería a
+    # cachear el estado anterior a la reserva
+    listing_id = instance.listing_id_id
+    transaction.on_commit(lambda: invalidate_availability(listing_id), using=using)
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_user_tokens(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
+
+
+@receiver(post_delete, sender=AuthToken)
+def invalidate_token(sender, instance, **kwargs):
+    token_cache.invalidate_key(instance.key)
@@ -0,0 +1,179 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+# Campos a la carta para los serializers de la API:
+#
+#   ?fields=booking_id,start_date,listing_id.title
+#   ?expand=listing_id,listing_id.host_id
+#
+# Sin ninguno de los dos parámetros la respuesta es la de siempre (todas las
+# relaciones anidadas). Con cualquiera de ellos solo se devuelven los campos
+# pedidos y las relaciones no expandidas salen como ids; un campo con punto
+# (listing_id.title) implica expandir su relación. Como eager_load recorre los
+# campos del serializer ya recortado, el queryset solo une lo que se pidió.
+#
+#   ?sideload=1
+#
+# En los listados, las relaciones que irían anidadas salen como ids y cada
+# objeto referenciado se serializa una sola vez en `included`, agrupado por
+# tipo y con su id como clave: {"results": [...], "included": {"destination":
+# {"3": {...}}}}. Se combina con ?fields= y ?expand=.
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+SIDELOAD_PARAM = 'sideload'
+
+
+def parse_paths(value):
+    """'a,b.c,b.d' -> {'a': {}, 'b': {'c': {}, 'd': {}}}"""
+    tree = {}
+    for path in (value or '').split(','):
+        node = tree
+        for part in path.strip().split('.'):
+            if part:
+                node = node.setdefault(part, {})
+    return tree
+
+
+class SparseFieldsMixin:
+    """
+    Recorta los campos del serializer según ?fields= y ?expand= (leídos del
+    request del contexto en el serializer raíz) o según los argumentos
+    fields= y expand= (listas de rutas con punto).
+    """
+
+    def __init__(self, *args, fields=None, expand=None, sideload=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sideload = sideload
+        self.sideloaded_fields = {}
+        self._sparse = None
+        if fields is not None or expand is not None:
+            self._sparse = (
+                parse_paths(','.join(fields)) if fields is not None else None,
+                parse_paths(','.join(expand or ())),
+            )
+
+    def _is_root(self):
+        parent = self.parent
+        if isinstance(parent, serializers.ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def _params(self):
+        request = self.context.get('request')
+        return getattr(request, 'query_params', None) or getattr(request, 'GET', {})
+
+    def _sideload_enabled(self):
+        if self._sideload is not None or not self._is_root():
+            return bool(self._sideload)
+        # Solo en listados: un objeto suelto no repite nada y mantiene su forma anidada
+        if not isinstance(self.parent, serializers.ListSerializer):
+            return False
+        return self._params().get(SIDELOAD_PARAM, '').lower() in ('1', 'true')
+
+    def _sparse_options(self):
+        if self._sparse is not None or not self._is_root():
+            return self._sparse
+        params = self._params()
+        if FIELDS_PARAM not in params and EXPAND_PARAM not in params:
+            return None
+        fields = parse_paths(params[FIELDS_PARAM]) if FIELDS_PARAM in params else None
+        return fields or None, parse_paths(params.get(EXPAND_PARAM))
+
+    def _model_relation(self, name, field):
+        model = getattr(getattr(self, 'Meta', None), 'model', None)
+        source = field.source or name
+        if model is None or source == '*' or '.' in source:
+            return None
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            return None
+        return source if model_field.is_relation else None
+
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_serializer = super().many_init(*args, **kwargs)
+        if type(list_serializer) is serializers.ListSerializer:
+            list_serializer.__class__ = SparseListSerializer
+        return list_serializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        options = self._sparse_options()
+        sideload = self._sideload_enabled()
+        if options is None and not sideload:
+            return fields
+        field_tree, expand_tree = options or (None, None)
+
+        selected = {}
+        for name, field in fields.items():
+            if field_tree is not None and name not in field_tree:
+                continue
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            source = self._model_relation(name, field) if isinstance(nested, serializers.BaseSerializer) else None
+            if source is not None:
+                subfields = (field_tree or {}).get(name) or None
+                expanded = options is None or name in expand_tree or subfields
+                if expanded and isinstance(nested, SparseFieldsMixin):
+                    if options is not None:
+                        nested._sparse = (subfields, expand_tree.get(name, {}))
+                    nested._sideload = sideload
+                if expanded and sideload:
+                    # Se serializa aparte, una vez por objeto, en `included`
+                    self.sideloaded_fields[name] = (field, source)
+                if not expanded or sideload:
+                    # Solo el id (sin JOIN ni prefetch de filas completas si no se expande)
+                    field = serializers.PrimaryKeyRelatedField(
+                        read_only=True, many=nested is not field,
+                        **({'source': source} if source != name else {}),
+                    )
+            selected[name] = field
+        return selected
+
+
+def collect_included(serializer, instances):
+    """
+    Serializa una sola vez cada objeto referenciado por las relaciones
+    side-loaded de `serializer` (y, recursivamente, las de esos objetos).
+    """
+    included = {}
+    pending = [(serializer, list(instances))]
+    while pending:
+        current, objects = pending.pop()
+        current.fields  # get_fields() registra sideloaded_fields
+        for field, source in current.sideloaded_fields.values():
+            many = isinstance(field, serializers.ListSerializer)
+            nested = field.child if many else field
+            bucket = included.setdefault(nested.Meta.model._meta.model_name, {})
+            new_objects = []
+            for obj in objects:
+                value = getattr(obj, source)
+                for related in (value.all() if many else [value] if value is not None else []):
+                    key = str(related.pk)
+                    if key not in bucket:
+                        bucket[key] = nested.to_representation(related)
+                        new_objects.append(related)
+            if new_objects:
+                pending.append((nested, new_objects))
+    return included
+
+
+class SparseListSerializer(serializers.ListSerializer):
+    """Con ?sideload=1 devuelve {'results': filas, 'included': objetos referenciados}"""
+
+    @property
+    def data(self):
+        rows = super().data
+        self.child.fields  # también con la lista vacía, para que la forma no dependa del contenido
+        if not self.child.sideloaded_fields:
+            return rows
+        instances = self.instance.all() if hasattr(self.instance, 'all') else self.instance
+        return ReturnDict(
+            {'results': rows, 'included': collect_included(self.child, instances)}, serializer=self,
+        )
+
+
+class SparseModelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    pass
@@ -0,0 +1,70 @@
+import threading
+
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+# Backend SQLite con cola de escritura (ENGINE 'Tablas.sqlite_backend').
+#
+# Con OPTIONS['serialize_writes'] = True las transacciones (atomic) de un
+# mismo proceso sobre el mismo archivo se ejecutan de una en una: cada una
+# espera su turno en un lock de Python antes del BEGIN y lo suelta con el
+# COMMIT o el ROLLBACK. Así los escritores de un proceso no compiten por el
+# bloqueo de SQLite (cuyo busy handler reintenta con esperas de hasta 100 ms)
+# y el siguiente entra en cuanto termina el anterior. Entre procesos sigue
+# mandando el busy timeout de SQLite (OPTIONS['timeout']).
+#
+# Las escrituras sueltas en autocommit (save() o update() fuera de atomic)
+# no pasan por la cola.
+
+_writer_locks = {}
+_writer_locks_guard = threading.Lock()
+
+
+def writer_lock(name):
+    with _writer_locks_guard:
+        return _writer_locks.setdefault(str(name), threading.Lock())
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        self.serialize_writes = params.pop('serialize_writes', False)
+        self.writer_timeout = params.get('timeout', 5)
+        return params
+
+    def _start_transaction_under_autocommit(self):
+        if self.serialize_writes and not self.is_in_memory_db():
+            lock = writer_lock(self.settings_dict['NAME'])
+            if not lock.acquire(timeout=self.writer_timeout):
+                raise OperationalError('database is locked (cola de escritura)')
+            self._held_writer_lock = lock
+        try:
+            super()._start_transaction_under_autocommit()
+        except BaseException:
+            self._release_writer_lock()
+            raise
+
+    def _release_writer_lock(self):
+        lock = getattr(self, '_held_writer_lock', None)
+        if lock is not None:
+            self._held_writer_lock = None
+            lock.release()
+
+    def _commit(self):
+        # Si el COMMIT falla la transacción sigue abierta: el lock se suelta en el ROLLBACK
+        result = super()._commit()
+        self._release_writer_lock()
+        return result
+
+    def _rollback(self):
+        try:
+            return super()._rollback()
+        finally:
+            self._release_writer_lock()
+
+    def _close(self):
+        try:
+            return super()._close()
+        finally:
+            self._release_writer_lock()
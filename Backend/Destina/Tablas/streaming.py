@@ -0,0 +1,45 @@
+from itertools import islice
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .renderers import dumps
+
+# Listados completos en streaming:
+#
+#   ?stream=1
+#
+# En lugar de una página, la respuesta es un array JSON con todas las filas
+# que se genera mientras se envía: el queryset se recorre con
+# .iterator(chunk_size=...) (los prefetch se hacen por bloque) y cada bloque se
+# serializa y se escribe antes de leer el siguiente, así que la memoria del
+# worker no crece con el número de filas. Combina con ?fields= y ?expand=.
+
+STREAM_PARAM = 'stream'
+
+
+def wants_stream(request):
+    return request.query_params.get(STREAM_PARAM, '').lower() in ('1', 'true')
+
+
+def _json_array(queryset, serializer, chunk_size):
+    rows = queryset.iterator(chunk_size=chunk_size)
+    separator = b''
+    yield b'['
+    while True:
+        batch = list(islice(rows, chunk_size))
+        if not batch:
+            break
+        # dumps de la lista sin los corchetes: las filas del bloque ya separadas por comas
+        yield separator + dumps([serializer.to_representation(row) for row in batch])[1:-1]
+        separator = b','
+    yield b']'
+
+
+def stream_list(request, queryset, serializer_class, chunk_size=None):
+    """Respuesta con el queryset entero como array JSON, serializado bloque a bloque"""
+    chunk_size = chunk_size or getattr(settings, 'API_STREAM_CHUNK_SIZE', 500)
+    serializer = serializer_class(context={'request': request})
+    return StreamingHttpResponse(
+        _json_array(queryset, serializer, chunk_size), content_type='application/json',
+    )
@@ -1,3 +1,1185 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import re
+import tempfile
+import threading
+import uuid
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+import brotli
+import msgpack
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import DatabaseError, OperationalError, connection, connections, transaction
+from django.db.backends.sqlite3 import base as sqlite_base
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+
+from destinos.models import AtraccionDestino, ClimaDestino, GaleriaDestino
+from destinos.views import AtraccionDestinoListView, ClimaDestinoView
+from recomendaciones.models import Recomendacion
+from recomendaciones.views import RecomendacionListView
+
+from .async_views import AsyncReadView
+from .authentication import TokenCache, token_cache
+from .availability import AVAILABILITY_KEY_PREFIX
+from .db_router import _routing, read_from_replicas
+from .models import (
+    AuthToken, Booking, Category, ChatMessage, Destination, Image, Listing, ListingSearch, PopularSearch, User,
+)
+from .pagination import KeysetPagination
+from .parsers import OrjsonParser
+from .popular_searches import SearchHitBuffer, search_hits
+from .renderers import MessagePackRenderer, OrjsonRenderer
+from .sqlite_backend.base import DatabaseWrapper, writer_lock
+from .response_cache import normalize_query
+from .views import DestinationListView, ListingDetailView
+
+# "SCAN tabla" sin índice recorre la tabla entera. Con índice solo se acepta si
+# el índice ya da el orden (el LIMIT corta el recorrido): si además hace falta
+# "USE TEMP B-TREE FOR ORDER BY", se leen todas las filas del índice para ordenarlas.
+FULL_SCAN = re.compile(r'^SCAN \w+$')
+INDEX_SCAN = re.compile(r'^SCAN \w+ USING (COVERING )?INDEX ')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+class QueryPlanMixin:
+    """Comprueba con EXPLAIN QUERY PLAN que las consultas de una vista usan índices"""
+
+    def query_plans(self, path, client=None):
+        """[(sql, [detalle del plan...])] de cada SELECT que ejecuta la petición"""
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = (client or self.client).get(path)
+        self.assertEqual(response.status_code, 200, path)
+        plans = []
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                sql = query['sql']
+                if not sql.lstrip().upper().startswith('SELECT'):
+                    continue
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plans.append((sql, [row[3] for row in cursor.fetchall()]))
+        return plans
+
+    def assertNoFullScan(self, path, client=None):
+        for sql, plan in self.query_plans(path, client):
+            scans = [detail for detail in plan if FULL_SCAN.match(detail)]
+            if TEMP_SORT in plan:
+                scans += [detail for detail in plan if INDEX_SCAN.match(detail)]
+            self.assertFalse(scans, f'{path}: recorrido completo en\n{sql}\n' + '\n'.join(plan))
+
+
+class ConstantQueriesMixin:
+    """Comprueba que un listado hace las mismas consultas con una fila que con varias"""
+
+    def count_queries(self, path, client=None):
+        """(consultas, filas devueltas) de un GET con las cachés vacías"""
+        cache.clear()
+        token_cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = (client or self.client).get(path)
+        self.assertEqual(response.status_code, 200, path)
+        query_count = len(queries.captured_queries)
+        data = response.json()
+        return query_count, len(data['results'] if isinstance(data, dict) else data)
+
+    def assertConstantQueries(self, path, add_rows, client=None):
+        """`path` devuelve una fila; tras `add_rows()` devuelve varias con las mismas consultas"""
+        queries, rows = self.count_queries(path, client)
+        self.assertEqual(rows, 1, path)
+        self.assertGreater(queries, 0, path)
+        add_rows()
+        more_queries, more_rows = self.count_queries(path, client)
+        self.assertGreater(more_rows, 1, path)
+        self.assertEqual(queries, more_queries, f'{path}: {queries} consultas con 1 fila, {more_queries} con {more_rows}')
+
+
+class HotPathQueryPlanTests(QueryPlanMixin, TestCase):
+    """Listados de propiedades, filtros, reservas y chat sin recorridos completos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='guest@example.com', name='Guest', password_hash='x', role='guest')
+        host = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        cls.destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        cls.category = Category.objects.create(name='Categoría', icon_name='icon', description='')
+        cls.listings = Listing.objects.bulk_create([
+            Listing(
+                host_id=host, destination_id=cls.destination, category_id=cls.category,
+                title=f'Alojamiento {i}', description='', price_per_night=Decimal(50 + i), rating_avg=i % 5,
+                is_active=i % 4 != 0,
+            )
+            for i in range(30)
+        ])
+        Booking.objects.bulk_create([
+            Booking(
+                listing_id=cls.listings[1], user_id=cls.user, start_date=date(2027, 1, 1) + timedelta(days=3 * i),
+                end_date=date(2027, 1, 3) + timedelta(days=3 * i), total_price=Decimal('100.00'), status='confirmed',
+            )
+            for i in range(5)
+        ])
+        ChatMessage.objects.bulk_create([
+            ChatMessage(user_id=cls.user, session_id='sesion', sender='user', message_text=f'Hola {i}') for i in range(5)
+        ])
+        cls.token = AuthToken.objects.create(user_id=cls.user)
+
+    def authenticated(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        return client
+
+    def test_listing_list(self):
+        destination, category = self.destination.pk, self.category.pk
+        self.assertNoFullScan('/api/listings/')
+        self.assertNoFullScan(f'/api/listings/?destination_id={destination}')
+        self.assertNoFullScan(f'/api/listings/?category_id={category}')
+        self.assertNoFullScan(f'/api/listings/?destination_id={destination}&category_id={category}')
+
+    def test_listing_list_next_page(self):
+        cursor = self.client.get('/api/listings/?page_size=5').json()['next'].split('cursor=')[1]
+        self.assertNoFullScan(f'/api/listings/?page_size=5&cursor={cursor}')
+
+    def test_filter_results(self):
+        self.assertNoFullScan('/api/filter/?min_price=60')
+        self.assertNoFullScan('/api/filter/?min_price=60&max_price=70')
+        self.assertNoFullScan('/api/filter/?max_price=70')
+        self.assertNoFullScan('/api/filter/?rating=3')
+        self.assertNoFullScan('/api/filter/?ordering=rating')
+
+    def test_listing_availability(self):
+        self.assertNoFullScan(f'/api/listings/{self.listings[1].pk}/availability/?from=2027-01-01&to=2027-02-01')
+
+    def test_booking_history(self):
+        self.assertNoFullScan('/api/bookings/history/', self.authenticated())
+
+    def test_chat_history(self):
+        self.assertNoFullScan('/api/chat/sesion/', self.authenticated())
+
+
+class BookingAvailabilityTests(TestCase):
+    """Reservas solapadas (409) y caché de noches ocupadas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='guest@example.com', name='Guest', password_hash='x', role='guest')
+        host = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        cls.listing = Listing.objects.create(
+            host_id=host, destination_id=destination, title='Alojamiento', description='', price_per_night=Decimal('80.00'),
+        )
+        cls.token = AuthToken.objects.create(user_id=cls.user)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def book(self, start, end):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/bookings/create/', {
+                'listing_id': self.listing.pk, 'start_date': start, 'end_date': end, 'total_price': '160.00',
+            }, format='json')
+
+    def blocked_nights(self, query='from=2027-01-01&to=2027-01-10'):
+        response = self.client.get(f'/api/listings/{self.listing.pk}/availability/?{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['blocked_nights']
+
+    def test_overlapping_booking_conflicts(self):
+        self.assertEqual(self.book('2027-01-02', '2027-01-05').status_code, 201)
+        self.assertEqual(self.book('2027-01-04', '2027-01-06').status_code, 409)
+        self.assertEqual(self.book('2027-01-01', '2027-01-10').status_code, 409)
+        # El día de salida queda libre para la siguiente llegada
+        self.assertEqual(self.book('2027-01-05', '2027-01-07').status_code, 201)
+
+    def test_cancelled_booking_frees_nights(self):
+        Booking.objects.create(
+            listing_id=self.listing, user_id=self.user, start_date=date(2027, 1, 2), end_date=date(2027, 1, 5),
+            total_price=Decimal('160.00'), status='cancelled',
+        )
+        self.assertEqual(self.book('2027-01-02', '2027-01-05').status_code, 201)
+
+    def test_availability_sees_new_booking(self):
+        self.assertEqual(self.blocked_nights(), [])
+        self.book('2027-01-02', '2027-01-04')
+        self.assertEqual(self.blocked_nights(), ['2027-01-02', '2027-01-03'])
+
+    def test_invalidation_waits_for_commit(self):
+        self.blocked_nights()
+        key = f'{AVAILABILITY_KEY_PREFIX}{self.listing.pk}'
+        with self.captureOnCommitCallbacks() as callbacks:
+            Booking.objects.create(
+                listing_id=self.listing, user_id=self.user, start_date=date(2027, 1, 2), end_date=date(2027, 1, 4),
+                total_price=Decimal('160.00'),
+            )
+            # Antes del COMMIT la entrada sigue en caché: una lectura concurrente no la
+            # puede volver a llenar con el estado anterior después de invalidarla
+            self.assertIsNotNone(cache.get(key))
+        for callback in callbacks:
+            callback()
+        self.assertIsNone(cache.get(key))
+
+    def test_invalid_dates(self):
+        for query in ('from=mañana', 'to=2027-13-01', 'from=2027-02-30', 'from=2027-01-10&to=2027-01-01'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/listings/{self.listing.pk}/availability/?{query}')
+                self.assertEqual(response.status_code, 400)
+
+
+class AuthBodyTests(TestCase):
+    """Signup y login: respuestas con los renderers de DRF y 400 (no 500) si el cuerpo JSON no es un objeto"""
+
+    def signup(self, **extra):
+        return self.client.post(
+            '/api/auth/signup/', {'email': 'nuno@example.com', 'name': 'Nuño Peña', 'password': 'secreta-1'},
+            content_type='application/json', **extra,
+        )
+
+    def test_signup_and_login(self):
+        response = self.signup()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        # Sin escapes \uXXXX, como el resto de la API
+        self.assertIn('"name":"Nuño Peña"'.encode(), response.content)
+        body = response.json()
+        user = User.objects.get(email='nuno@example.com')
+        self.assertEqual(body['user']['user_id'], user.pk)
+        self.assertEqual(body['token'], AuthToken.objects.get(user_id=user).key)
+
+        login = self.client.post(
+            '/api/auth/login/', {'email': 'nuno@example.com', 'password': 'secreta-1'}, content_type='application/json',
+        )
+        self.assertEqual(login.status_code, 200)
+        self.assertEqual(login.json(), body)
+
+        wrong = self.client.post(
+            '/api/auth/login/', {'email': 'nuno@example.com', 'password': 'otra'}, content_type='application/json',
+        )
+        self.assertEqual((wrong.status_code, wrong.json()), (400, {'error': 'Invalid credentials'}))
+
+    def test_msgpack(self):
+        response = self.signup(HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content)['user']['name'], 'Nuño Peña')
+
+        login = self.client.post(
+            '/api/auth/login/?format=msgpack', {'email': 'nadie@example.com', 'password': 'x'},
+            content_type='application/json',
+        )
+        self.assertEqual(login.status_code, 404)
+        self.assertEqual(msgpack.unpackb(login.content), {'error': 'User not found'})
+
+    def test_non_object_json_body(self):
+        for path in ('/api/auth/signup/', '/api/auth/login/'):
+            for body in ('[]', '"x"', '42', 'null', '{'):
+                with self.subTest(path=path, body=body):
+                    response = self.client.post(path, body, content_type='application/json')
+                    self.assertEqual(response.status_code, 400)
+
+
+@override_settings(SEARCH_STATS_FLUSH_INTERVAL=60)
+class SearchHitBufferTests(TestCase):
+    """Un volcado fallido (del temporizador o en la petición) se registra y conserva el lote"""
+
+    def test_failed_timer_flush_keeps_batch(self):
+        buffer = SearchHitBuffer()
+        buffer._counts.update({'playa': 2, 'montaña': 1})
+
+        with mock.patch.object(buffer, '_write', side_effect=DatabaseError('database is locked')), \
+                mock.patch.object(buffer, '_schedule') as schedule, \
+                self.assertLogs('Tablas.popular_searches', level='ERROR') as logs:
+            buffer._flush_from_timer()
+        self.assertIn('database is locked', logs.output[0])
+        schedule.assert_called_once()
+        self.assertEqual(buffer._counts, {'playa': 2, 'montaña': 1})
+
+        buffer.flush()
+        self.assertEqual(dict(PopularSearch.objects.values_list('search_text', 'times_used')), {'playa': 2, 'montaña': 1})
+
+    @override_settings(SEARCH_STATS_FLUSH_INTERVAL=0)
+    def test_failed_inline_flush_keeps_search_working(self):
+        self.addCleanup(search_hits._counts.clear)
+        with mock.patch.object(search_hits, '_write', side_effect=DatabaseError('database is locked')), \
+                self.assertLogs('Tablas.popular_searches', level='ERROR') as logs:
+            response = self.client.get('/api/search/', {'q': 'playa'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('database is locked', logs.output[0])
+        self.assertEqual(search_hits._counts, {'playa': 1})
+
+        # El siguiente volcado escribe también el lote pendiente
+        self.assertEqual(self.client.get('/api/search/', {'q': 'playa'}).status_code, 200)
+        self.assertEqual(dict(PopularSearch.objects.values_list('search_text', 'times_used')), {'playa': 2})
+        self.assertFalse(search_hits._counts)
+
+
+class KeysetCursorTests(TestCase):
+    """Un cursor manipulado responde 404 como cualquier cursor inválido"""
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        Listing.objects.bulk_create([
+            Listing(host_id=host, destination_id=destination, title=f'Alojamiento {i}', description='', price_per_night=Decimal('80.00'))
+            for i in range(3)
+        ])
+
+    def listings(self, cursor):
+        return self.client.get('/api/listings/', {'page_size': 2, 'cursor': cursor})
+
+    def test_next_page(self):
+        first = self.listings('')
+        self.assertEqual(first.status_code, 200)
+        cursor = parse_qs(urlsplit(first.json()['next']).query)['cursor'][0]
+        second = self.listings(cursor)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(len(second.json()['results']), 1)
+        self.assertIsNone(second.json()['next'])
+
+    def test_tampered_cursor(self):
+        encode = KeysetPagination(ordering=('-created_at', '-listing_id')).encode_cursor
+        for values in (['no-es-fecha', 1], ['2027-13-45T00:00:00', 1], ['2027-01-01T00:00:00', 'x'], [{}, 1], [None, 1]):
+            with self.subTest(values=values):
+                self.assertEqual(self.listings(encode(values)).status_code, 404)
+        for cursor in ('%%%', 'bm8', encode([1])):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.listings(cursor).status_code, 404)
+
+
+class SparseFieldsTests(TestCase):
+    """?fields= y ?expand= recortan la respuesta y las consultas del historial de reservas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='guest@example.com', name='Guest', password_hash='x', role='guest')
+        host = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        category = Category.objects.create(name='Categoría', icon_name='icon', description='')
+        listings = Listing.objects.bulk_create([
+            Listing(
+                host_id=host, destination_id=destination, category_id=category, title=f'Alojamiento {i}',
+                description='', price_per_night=Decimal('80.00'),
+            )
+            for i in range(3)
+        ])
+        cls.images = Image.objects.bulk_create([
+            Image(listing_id=listing, url=f'https://example.com/{listing.pk}-{i}.jpg') for listing in listings for i in range(2)
+        ])
+        Booking.objects.bulk_create([
+            Booking(
+                listing_id=listing, user_id=cls.user, start_date=date(2027, 1, 1), end_date=date(2027, 1, 3),
+                total_price=Decimal('160.00'),
+            )
+            for listing in listings
+        ])
+        cls.token = AuthToken.objects.create(user_id=cls.user)
+
+    def setUp(self):
+        token_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        # Token ya en caché: las consultas contadas son solo las del listado
+        self.history()
+
+    def history(self, query=''):
+        response = self.client.get(f'/api/bookings/history/?{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()['results']
+
+    def test_dotted_field(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = self.history('fields=booking_id,listing_id.title')
+        # Una sola consulta con un JOIN a listing: ni usuario, ni destino, ni prefetch de imágenes
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(queries.captured_queries[0]['sql'].count('JOIN'), 1)
+        self.assertEqual(len(results), 3)
+        for row in results:
+            self.assertEqual(set(row), {'booking_id', 'listing_id'})
+            self.assertEqual(set(row['listing_id']), {'title'})
+
+    def test_unexpanded_relations_are_ids(self):
+        with self.assertNumQueries(1):
+            results = self.history('fields=booking_id,listing_id,user_id')
+        self.assertEqual({row['user_id'] for row in results}, {self.user.pk})
+        self.assertEqual(
+            {row['listing_id'] for row in results}, set(Booking.objects.values_list('listing_id', flat=True)),
+        )
+
+    def test_expand(self):
+        # listing_id expandido; sus relaciones (host, destino, imágenes) quedan como ids
+        with self.assertNumQueries(2):
+            results = self.history('fields=booking_id,listing_id&expand=listing_id')
+        listing = results[0]['listing_id']
+        self.assertIsInstance(listing['host_id'], int)
+        self.assertIsInstance(listing['destination_id'], int)
+        self.assertEqual(
+            sorted(listing['images']),
+            sorted(image.pk for image in self.images if image.listing_id_id == listing['listing_id']),
+        )
+
+    def test_nested_expand(self):
+        with self.assertNumQueries(1):
+            results = self.history('fields=booking_id,listing_id.destination_id.name')
+        self.assertEqual(results[0]['listing_id'], {'destination_id': {'name': 'Destino'}})
+
+    def test_without_parameters(self):
+        with CaptureQueriesContext(connection) as queries:
+            results = self.history()
+        # Booking + listing, host, destino, categoría y usuario unidos; las imágenes en un prefetch
+        self.assertEqual(len(queries.captured_queries), 2)
+        self.assertEqual(queries.captured_queries[0]['sql'].count('JOIN'), 5)
+        row = results[0]
+        self.assertEqual(
+            set(row), {'booking_id', 'listing_id', 'user_id', 'start_date', 'end_date', 'total_price', 'status', 'created_at'},
+        )
+        self.assertEqual(row['user_id']['email'], 'guest@example.com')
+        self.assertEqual(row['listing_id']['host_id']['email'], 'host@example.com')
+        self.assertEqual(row['listing_id']['destination_id']['slug'], 'destino')
+        self.assertEqual(row['listing_id']['category_id']['name'], 'Categoría')
+        self.assertEqual(len(row['listing_id']['images']), 2)
+        self.assertEqual(set(row['listing_id']['images'][0]), {'image_id', 'listing_id', 'url', 'is_main'})
+
+
+@override_settings(SEARCH_STATS_FLUSH_INTERVAL=0)
+class ListingQueryCountTests(ConstantQueriesMixin, TestCase):
+    """Listados de propiedades con un número fijo de consultas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_listing(0)
+
+    @staticmethod
+    def create_listing(i):
+        # Cada propiedad con su anfitrión, destino, categoría e imágenes
+        host = User.objects.create(email=f'host{i}@example.com', name=f'Host {i}', password_hash='x', role='host')
+        destination = Destination.objects.create(name=f'Destino {i}', country='País', description='', slug=f'destino-{i}')
+        category = Category.objects.create(name=f'Categoría {i}', icon_name='icon', description='')
+        listing = Listing.objects.create(
+            host_id=host, destination_id=destination, category_id=category, title=f'Casa en la playa {i}',
+            description='', price_per_night=Decimal('80.00'),
+        )
+        Image.objects.bulk_create([Image(listing_id=listing, url=f'https://example.com/{i}-{n}.jpg') for n in range(2)])
+
+    def add_listings(self):
+        for i in range(1, 6):
+            self.create_listing(i)
+
+    def test_listing_list(self):
+        self.assertConstantQueries('/api/listings/', self.add_listings)
+
+    def test_filter_results(self):
+        self.assertConstantQueries('/api/filter/?min_price=50&ordering=rating', self.add_listings)
+
+    def test_search(self):
+        self.assertConstantQueries('/api/search/?q=playa', self.add_listings)
+
+
+class AsyncReadViewTests(TestCase):
+    """Las rutas async responden con los mismos bytes que su `sync_view` y delegan las escrituras"""
+
+    @classmethod
+    def setUpTestData(cls):
+        admin = User.objects.create(email='admin@example.com', name='Admin', password_hash='x', role='admin')
+        host = User.objects.create(email='host@example.com', name='Anfitriona', password_hash='x', role='host')
+        cls.destination = Destination.objects.create(name='Málaga', country='España', description='Costa del Sol', slug='malaga')
+        cls.listing = Listing.objects.create(
+            host_id=host, destination_id=cls.destination, title='Ático con vistas', description='',
+            price_per_night=Decimal('95.50'),
+        )
+        Image.objects.create(listing_id=cls.listing, url='https://example.com/atico.jpg', is_main=True)
+        ClimaDestino.objects.bulk_create([
+            ClimaDestino(
+                destino_id=cls.destination, mes=mes, temperatura_promedio=Decimal('21.50'),
+                temperatura_min=Decimal('14.00'), temperatura_max=Decimal('30.25'),
+            )
+            for mes in (1, 8)
+        ])
+        AtraccionDestino.objects.create(
+            destino_id=cls.destination, nombre='Alcazaba', descripcion='', categoria='monumento',
+            latitud=Decimal('36.721300'), longitud=Decimal('-4.416000'),
+        )
+        Recomendacion.objects.create(titulo='Espetos', descripcion='', tipo='restaurante', ubicacion='Málaga')
+        cls.token = AuthToken.objects.create(user_id=admin)
+
+    def routes(self):
+        """(ruta async, vista síncrona, argumentos de la URL)"""
+        destination = self.destination.pk
+        return [
+            ('/api/destinations/', DestinationListView, {}),
+            ('/api/destinations/?fields=name,slug', DestinationListView, {}),
+            (f'/api/listings/{self.listing.pk}/', ListingDetailView, {'listing_id': self.listing.pk}),
+            ('/api/listings/999999/', ListingDetailView, {'listing_id': 999999}),
+            (f'/api/destinos/{destination}/clima/', ClimaDestinoView, {'destino_id': destination}),
+            (f'/api/destinos/{destination}/clima/?sideload=1', ClimaDestinoView, {'destino_id': destination}),
+            ('/api/destinos/999999/clima/', ClimaDestinoView, {'destino_id': 999999}),
+            (f'/api/destinos/{destination}/atracciones/', AtraccionDestinoListView, {'destino_id': destination}),
+            ('/api/recomendaciones/?tipo=restaurante', RecomendacionListView, {}),
+        ]
+
+    def sync_response(self, view, path, kwargs):
+        cache.clear()
+        response = view.as_view()(APIRequestFactory().get(path), **kwargs)
+        return response.render()
+
+    async def test_same_bytes_as_sync_view(self):
+        for path, view, kwargs in self.routes():
+            with self.subTest(path=path):
+                await sync_to_async(cache.clear)()
+                response = await self.async_client.get(path)
+                expected = await sync_to_async(self.sync_response)(view, path, kwargs)
+                self.assertEqual(response.status_code, expected.status_code)
+                self.assertEqual(response['Content-Type'], expected['Content-Type'])
+                self.assertEqual(response.content, expected.content)
+
+    async def test_msgpack(self):
+        for path, view, kwargs in self.routes():
+            with self.subTest(path=path):
+                as_json = await self.async_client.get(path)
+                separator = '&' if '?' in path else '?'
+                for response in (
+                    await self.async_client.get(path, headers={'Accept': 'application/msgpack'}),
+                    await self.async_client.get(f'{path}{separator}format=msgpack'),
+                ):
+                    self.assertEqual(response.status_code, as_json.status_code)
+                    self.assertEqual(response['Content-Type'], 'application/msgpack')
+                    self.assertEqual(msgpack.unpackb(response.content), as_json.json())
+
+    async def test_not_acceptable(self):
+        response = await self.async_client.get('/api/destinations/', headers={'Accept': 'text/csv'})
+        self.assertEqual(response.status_code, 406)
+
+    async def test_post_is_delegated(self):
+        response = await self.async_client.post(
+            '/api/destinations/', {'name': 'Cádiz', 'country': 'España', 'description': '', 'slug': 'cadiz'},
+            content_type='application/json', headers={'Authorization': f'Token {self.token.key}'},
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(response.json()['slug'], 'cadiz')
+        self.assertTrue(await Destination.objects.filter(slug='cadiz').aexists())
+
+    async def test_method_without_sync_handler(self):
+        response = await self.async_client.put('/api/destinations/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 405)
+        self.assertNotIn('PUT', response['Allow'])
+        self.assertIn('POST', response['Allow'])
+
+    def test_read_is_abstract(self):
+        class SinLectura(AsyncReadView):
+            sync_view = DestinationListView
+
+        with self.assertRaises(TypeError):
+            SinLectura()
+
+
+class RendererTests(TestCase):
+    """OrjsonRenderer/OrjsonParser frente a los de DRF y negociación de MessagePack"""
+
+    payload = {
+        'decimal': Decimal('95.50'),
+        'datetime': datetime(2027, 1, 2, 3, 4, 5, 678901, tzinfo=dt_timezone.utc),
+        'naive': datetime(2027, 1, 2, 3, 4, 5),
+        'date': date(2027, 1, 2),
+        'time': time(9, 30),
+        'timedelta': timedelta(days=1, seconds=5),
+        'uuid': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+        'text': 'Málaga\u2028línea\u2029párrafo "comillas" \\ </script>',
+        'numbers': [0, -1, 2 ** 63 - 1, 0.1, 1.5, True, False, None],
+        'nested': {'lista': [{'a': 1}, []], 'vacío': {}},
+    }
+
+    def test_same_bytes_as_json_renderer(self):
+        self.assertEqual(OrjsonRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_fallbacks(self):
+        # Enteros de más de 64 bits y salida con sangría pasan por el renderer estándar
+        big = dict(self.payload, big=2 ** 70)
+        self.assertEqual(OrjsonRenderer().render(big), JSONRenderer().render(big))
+        indented = 'application/json; indent=4'
+        self.assertEqual(
+            OrjsonRenderer().render(self.payload, indented, {}), JSONRenderer().render(self.payload, indented, {}),
+        )
+
+    def test_float_exponent(self):
+        # Única diferencia conocida: 1e+16 en json, 1e16 en orjson; el valor es el mismo
+        data = {'grande': 1e16, 'pequeño': 1e-7}
+        self.assertEqual(json.loads(OrjsonRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_msgpack_negotiation(self):
+        Category.objects.create(name='Playa', icon_name='sol', description='Costa')
+        as_json = self.client.get('/api/categories/')
+        for response in (
+            self.client.get('/api/categories/', headers={'Accept': 'application/msgpack'}),
+            self.client.get('/api/categories/?format=msgpack'),
+        ):
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+            self.assertEqual(msgpack.unpackb(response.content), as_json.json())
+        self.assertEqual(as_json['Content-Type'], 'application/json')
+
+    def test_msgpack_types(self):
+        data = msgpack.unpackb(MessagePackRenderer().render(self.payload))
+        self.assertEqual(data, json.loads(JSONRenderer().render(self.payload)))
+
+    def test_parser(self):
+        body = json.dumps({'name': 'Málaga', 'precio': 95.5, 'lista': [1, None, True]}).encode()
+        self.assertEqual(OrjsonParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        for invalid in (b'{"a": NaN}', b'{"a": Infinity}', b'{"a": ', b''):
+            with self.subTest(body=invalid):
+                with self.assertRaises(ParseError):
+                    OrjsonParser().parse(io.BytesIO(invalid))
+        # Otros charsets se delegan en el parser de DRF
+        latin1 = '{"name": "Málaga"}'.encode('latin-1')
+        self.assertEqual(OrjsonParser().parse(io.BytesIO(latin1), parser_context={'encoding': 'latin-1'}), {'name': 'Málaga'})
+
+    def test_parser_in_request(self):
+        user = User.objects.create(email='guest@example.com', name='Guest', password_hash='x', role='guest')
+        token = AuthToken.objects.create(user_id=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        response = client.put('/api/auth/profile/', '{"name": "Íñigo"}', content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'Íñigo')
+        response = client.put('/api/auth/profile/', '{"name": NaN}', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+
+class TokenCacheTests(TestCase):
+    """Caché de tokens: LRU, caducidad e invalidación por logout, perfil y señales"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create(email=f'user{i}@example.com', name=f'User {i}', password_hash='x', role='guest')
+            for i in range(3)
+        ]
+        cls.tokens = [AuthToken.objects.create(user_id=user) for user in cls.users]
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.client = self.client_for(self.tokens[0])
+
+    def client_for(self, token):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+        return client
+
+    def profile(self, client=None):
+        return (client or self.client).get('/api/auth/profile/')
+
+    def test_cached_token_skips_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.profile().status_code, 200)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.profile().json()['email'], 'user0@example.com')
+
+    def test_logout_is_immediate(self):
+        self.profile()
+        self.assertEqual(self.client.post('/api/auth/logout/').status_code, 200)
+        self.assertEqual(self.profile().status_code, 401)
+
+    def test_profile_update_is_visible(self):
+        self.profile()
+        self.assertEqual(self.client.put('/api/auth/profile/', {'name': 'Nuevo'}, format='json').status_code, 200)
+        self.assertEqual(self.profile().json()['name'], 'Nuevo')
+
+    def test_signals(self):
+        other = self.client_for(self.tokens[1])
+        self.profile()
+        self.profile(other)
+
+        # Un cambio de usuario invalida solo los tokens de ese usuario
+        self.users[0].name = 'Con señal'
+        self.users[0].save(update_fields=['name'])
+        self.assertIsNone(token_cache.get(self.tokens[0].key))
+        self.assertIsNotNone(token_cache.get(self.tokens[1].key))
+        self.assertEqual(self.profile().json()['name'], 'Con señal')
+
+        self.tokens[1].delete()
+        self.assertEqual(self.profile(other).status_code, 401)
+
+    def test_cached_user_is_a_copy(self):
+        self.profile()
+        user, token = token_cache.get(self.tokens[0].key)
+        user.name = 'Modificado en una petición'
+        self.assertEqual(token_cache.get(self.tokens[0].key)[0].name, 'User 0')
+
+    @override_settings(AUTH_TOKEN_CACHE_SIZE=2)
+    def test_lru_eviction(self):
+        cache_ = TokenCache()
+        cache_.set(self.tokens[0])
+        cache_.set(self.tokens[1])
+        cache_.get(self.tokens[0].key)  # el menos usado pasa a ser tokens[1]
+        cache_.set(self.tokens[2])
+        self.assertIsNotNone(cache_.get(self.tokens[0].key))
+        self.assertIsNone(cache_.get(self.tokens[1].key))
+        self.assertIsNotNone(cache_.get(self.tokens[2].key))
+        # El índice por usuario no guarda claves expulsadas
+        self.assertNotIn(self.users[1].pk, cache_._keys_by_user)
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=60)
+    def test_ttl(self):
+        cache_ = TokenCache()
+        with mock.patch('Tablas.authentication.time.monotonic', return_value=1000.0):
+            cache_.set(self.tokens[0])
+        with mock.patch('Tablas.authentication.time.monotonic', return_value=1059.0):
+            self.assertIsNotNone(cache_.get(self.tokens[0].key))
+        with mock.patch('Tablas.authentication.time.monotonic', return_value=1061.0):
+            self.assertIsNone(cache_.get(self.tokens[0].key))
+        self.assertEqual(cache_._keys_by_user, {})
+
+    @override_settings(AUTH_TOKEN_CACHE_TTL=0)
+    def test_ttl_zero_disables_cache(self):
+        with self.assertNumQueries(1):
+            self.profile()
+        with self.assertNumQueries(1):
+            self.profile()
+
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRoutingTests(TransactionTestCase):
+    """
+    Lecturas en réplica. La réplica es una segunda conexión a la misma base de
+    datos de pruebas, así que los datos tienen que estar confirmados (TransactionTestCase).
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        # El alias se añade aquí (y no en `databases`): el runner crea las bases
+        # de pruebas antes y 'replica' solo apunta a la de 'default' ya creada
+        default = connections['default'].settings_dict
+        connections.settings[REPLICA] = {**default, 'TEST': {**default['TEST'], 'MIRROR': 'default'}}
+        cls.databases = {'default', REPLICA}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections[REPLICA]
+        del connections.settings[REPLICA]
+
+    def setUp(self):
+        cache.clear()
+        token_cache.clear()
+        user = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        self.listing = Listing.objects.create(
+            host_id=user, destination_id=destination, title='Casa en la playa', description='', price_per_night=Decimal('80.00'),
+        )
+        self.token = AuthToken.objects.create(user_id=user)
+
+    def get(self, path, **extra):
+        """(respuesta, tablas leídas de 'default', tablas leídas de la réplica)"""
+        with CaptureQueriesContext(connections['default']) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = self.client.get(path, **extra)
+        self.assertEqual(response.status_code, 200, path)
+        return response, self.tables(primary), self.tables(replica)
+
+    def tables(self, queries):
+        return {
+            table for query in queries.captured_queries if query['sql'].lstrip().upper().startswith('SELECT')
+            for table in re.findall(r'FROM "(\w+)"', query['sql'])
+        }
+
+    def test_get_reads_from_replica(self):
+        for path in ('/api/listings/', '/api/categories/', f'/api/listings/{self.listing.pk}/availability/', '/api/destinations/'):
+            with self.subTest(path=path):
+                response, primary, replica = self.get(path)
+                self.assertEqual(primary, set())
+                self.assertTrue(replica, path)
+        _, primary, replica = self.get('/api/listings/')
+        self.assertIn('listing', replica)
+
+    def test_auth_token_reads_from_default(self):
+        _, primary, replica = self.get('/api/listings/', HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.assertEqual(primary, {'auth_token'})
+        self.assertIn('listing', replica)
+        self.assertNotIn('auth_token', replica)
+
+    @override_settings(SEARCH_STATS_FLUSH_INTERVAL=0)
+    def test_write_pins_request_to_default(self):
+        # El volcado de la búsqueda escribe antes del listado: el resto de la petición lee de 'default'
+        response, primary, replica = self.get('/api/search/?q=playa')
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertIn('listing', primary)
+        self.assertEqual(replica, set())
+
+    def test_read_from_replicas_block(self):
+        with read_from_replicas():
+            self.assertEqual(Listing.objects.get(pk=self.listing.pk)._state.db, REPLICA)
+            self.assertEqual(AuthToken.objects.get(pk=self.token.pk)._state.db, 'default')
+            Destination.objects.create(name='Otro', country='País', description='', slug='otro')
+            self.assertEqual(Listing.objects.get(pk=self.listing.pk)._state.db, 'default')
+        # Fuera del bloque se lee de 'default'
+        self.assertEqual(Listing.objects.get(pk=self.listing.pk)._state.db, 'default')
+
+    def test_routing_state_is_reset(self):
+        self.get('/api/listings/')
+        self.assertIsNone(_routing.get())
+        with self.assertRaises(ValueError):
+            with read_from_replicas():
+                raise ValueError
+        self.assertIsNone(_routing.get())
+        self.assertEqual(Listing.objects.get(pk=self.listing.pk)._state.db, 'default')
+
+
+class CompressionStreamingTests(TestCase):
+    """Brotli/gzip según Accept-Encoding, también en streaming, y listados con ?stream=1"""
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        listings = Listing.objects.bulk_create([
+            Listing(
+                host_id=host, destination_id=destination, title=f'Alojamiento {i}', description='Descripción ' * 10,
+                price_per_night=Decimal(50 + i),
+            )
+            for i in range(7)
+        ])
+        Image.objects.bulk_create([Image(listing_id=listing, url=f'https://example.com/{listing.pk}.jpg') for listing in listings])
+
+    def setUp(self):
+        cache.clear()
+
+    def content(self, response):
+        return b''.join(response.streaming_content) if response.streaming else response.content
+
+    def test_brotli(self):
+        plain = self.client.get('/api/listings/')
+        response = self.client.get('/api/listings/', headers={'Accept-Encoding': 'gzip, br'})
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(brotli.decompress(response.content), plain.content)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_gzip_fallback(self):
+        plain = self.client.get('/api/listings/')
+        for header in ('gzip', 'br;q=0, gzip', 'gzip;q=0.5, br;q=0'):
+            with self.subTest(header=header):
+                response = self.client.get('/api/listings/', headers={'Accept-Encoding': header})
+                self.assertEqual(response['Content-Encoding'], 'gzip')
+                self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertFalse(self.client.get('/api/listings/').has_header('Content-Encoding'))
+
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get('/api/categories/', headers={'Accept-Encoding': 'br'})
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @override_settings(API_STREAM_CHUNK_SIZE=2)
+    def test_streaming_is_compressed_by_chunk(self):
+        plain = self.content(self.client.get('/api/listings/?stream=1'))
+        response = self.client.get('/api/listings/?stream=1', headers={'Accept-Encoding': 'br'})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertFalse(response.has_header('Content-Length'))
+        chunks = list(response.streaming_content)
+        # '[' , 4 bloques de 2 filas, ']' y el final del compresor
+        self.assertGreaterEqual(len(chunks), 5)
+        decompressor = brotli.Decompressor()
+        received = b''
+        for chunk in chunks[:-1]:
+            # Cada bloque se puede descomprimir sin esperar a los siguientes
+            output = decompressor.process(chunk)
+            self.assertTrue(output)
+            received += output
+        received += decompressor.process(chunks[-1])
+        self.assertEqual(received, plain)
+
+    @override_settings(API_STREAM_CHUNK_SIZE=2)
+    def test_streaming_gzip(self):
+        plain = self.content(self.client.get('/api/listings/?stream=1'))
+        response = self.client.get('/api/listings/?stream=1', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(self.content(response)), plain)
+
+    @override_settings(API_STREAM_CHUNK_SIZE=2)
+    def test_stream_matches_paginated_results(self):
+        for query in ('', '&fields=listing_id,title,images', '&expand=destination_id'):
+            with self.subTest(query=query):
+                paginated = self.client.get(f'/api/listings/?page_size=100{query}').json()
+                response = self.client.get(f'/api/listings/?stream=1{query}')
+                self.assertTrue(response.streaming)
+                self.assertEqual(response['Content-Type'], 'application/json')
+                self.assertEqual(json.loads(self.content(response)), paginated['results'])
+
+    def test_empty_stream(self):
+        response = self.client.get('/api/listings/?stream=1&destination_id=999999')
+        self.assertEqual(json.loads(self.content(response)), [])
+
+    def test_stream_bypasses_response_cache(self):
+        destination = Destination.objects.get()
+        # update() no pasa por las señales: una respuesta cacheada seguiría viendo el nombre anterior
+        self.client.get('/api/destinations/')
+        self.content(self.client.get('/api/destinations/?stream=1'))
+        Destination.objects.filter(pk=destination.pk).update(name='Renombrado')
+        self.assertEqual(self.client.get('/api/destinations/').json()[0]['name'], 'Destino')
+        streamed = json.loads(self.content(self.client.get('/api/destinations/?stream=1')))
+        self.assertEqual(streamed[0]['name'], 'Renombrado')
+
+
+class ResponseCacheTests(TestCase):
+    """Cada escritura invalida solo las respuestas de sus etiquetas"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Category.objects.create(name='Playa', icon_name='sol', description='')
+        cls.destinations = [
+            Destination.objects.create(name=f'Destino {i}', country='País', description='', slug=f'destino-{i}')
+            for i in range(2)
+        ]
+        for destination in cls.destinations:
+            ClimaDestino.objects.create(
+                destino_id=destination, mes=7, temperatura_promedio=Decimal('25.00'),
+                temperatura_min=Decimal('18.00'), temperatura_max=Decimal('32.00'),
+            )
+            GaleriaDestino.objects.create(destino_id=destination, imagen_url='https://example.com/a.jpg')
+
+    def setUp(self):
+        cache.clear()
+        self.paths = {'destinations': '/api/destinations/', 'categories': '/api/categories/'}
+        for i, destination in enumerate(self.destinations):
+            self.paths[f'clima {i}'] = f'/api/destinos/{destination.pk}/clima/'
+            self.paths[f'galeria {i}'] = f'/api/destinos/{destination.pk}/galeria/'
+        for path in self.paths.values():
+            self.get(path)
+
+    def get(self, path):
+        """(respuesta, servida desde la caché)"""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, path)
+        return response, not queries.captured_queries
+
+    def assertInvalidated(self, *names):
+        invalidated = {name for name, path in self.paths.items() if not self.get(path)[1]}
+        self.assertEqual(invalidated, set(names))
+
+    def test_category(self):
+        Category.objects.create(name='Montaña', icon_name='pico', description='')
+        self.assertInvalidated('categories')
+
+    def test_destination(self):
+        destination = self.destinations[0]
+        destination.name = 'Renombrado'
+        destination.save()
+        self.assertInvalidated('destinations', 'clima 0', 'galeria 0')
+        self.assertEqual(self.get(self.paths['clima 0'])[0].json()[0]['destino_id']['name'], 'Renombrado')
+
+    def test_clima(self):
+        ClimaDestino.objects.filter(destino_id=self.destinations[1]).get().delete()
+        self.assertInvalidated('clima 1')
+
+    def test_galeria(self):
+        GaleriaDestino.objects.create(destino_id=self.destinations[0], imagen_url='https://example.com/b.jpg')
+        self.assertInvalidated('galeria 0')
+
+    def test_query_parameter_order(self):
+        base = self.paths['clima 0']
+        first, cached = self.get(f'{base}?mes=7&fields=mes,temperatura_max')
+        self.assertFalse(cached)
+        for query in ('fields=mes,temperatura_max&mes=7', 'fields=mes,temperatura_max&vacio=&mes=7'):
+            with self.subTest(query=query):
+                response, cached = self.get(f'{base}?{query}')
+                self.assertTrue(cached)
+                self.assertEqual(response.content, first.content)
+        self.assertFalse(self.get(f'{base}?mes=8&fields=mes,temperatura_max')[1])
+
+    def test_normalize_query(self):
+        self.assertEqual(normalize_query(QueryDict('b=2&a=1&a=0&c=')), 'a=0&a=1&b=2')
+        self.assertEqual(normalize_query(QueryDict('a=0&b=2&a=1')), normalize_query(QueryDict('b=2&a=1&a=0&c=')))
+
+
+@override_settings(SEARCH_STATS_FLUSH_INTERVAL=0)
+class SearchTests(TestCase):
+    """Búsqueda FTS5: sincronización por triggers, prefijos, relevancia y entrada arbitraria"""
+
+    @classmethod
+    def setUpTestData(cls):
+        host = User.objects.create(email='host@example.com', name='Host', password_hash='x', role='host')
+        cls.destination = Destination.objects.create(name='Málaga', country='España', description='', slug='malaga')
+        cls.category = Category.objects.create(name='Apartamento', icon_name='icon', description='')
+        cls.listing = Listing.objects.create(
+            host_id=host, destination_id=cls.destination, category_id=cls.category, title='Ático junto al puerto',
+            description='Terraza con vistas', price_per_night=Decimal('90.00'),
+        )
+        other = Destination.objects.create(name='Toledo', country='España', description='', slug='toledo')
+        cls.other = Listing.objects.create(
+            host_id=host, destination_id=other, title='Casa rural', description='Chimenea', price_per_night=Decimal('70.00'),
+        )
+
+    def search(self, text):
+        response = self.client.get('/api/search/', {'q': text})
+        self.assertEqual(response.status_code, 200, text)
+        return [row['listing_id'] for row in response.json()['results']]
+
+    def test_fields(self):
+        for text in ('ático', 'terraza', 'malaga', 'apartamento', 'vistas puerto'):
+            with self.subTest(text=text):
+                self.assertEqual(self.search(text), [self.listing.pk])
+        self.assertEqual(self.search('ático toledo'), [])
+        self.assertEqual(sorted(self.search('españa')), sorted([self.listing.pk, self.other.pk]))
+
+    def test_prefix(self):
+        for text in ('Áti', 'pue', 'mal', 'ter vis'):
+            with self.subTest(text=text):
+                self.assertEqual(self.search(text), [self.listing.pk])
+
+    def test_rename_destination(self):
+        self.destination.name = 'Marbella'
+        self.destination.save()
+        self.assertEqual(self.search('marbella'), [self.listing.pk])
+        self.assertEqual(self.search('malaga'), [])
+
+    def test_rename_category(self):
+        Category.objects.filter(pk=self.category.pk).update(name='Loft')
+        self.assertEqual(self.search('loft'), [self.listing.pk])
+        self.assertEqual(self.search('apartamento'), [])
+
+    def test_rename_listing(self):
+        self.listing.title = 'Estudio en la playa'
+        self.listing.save()
+        self.assertEqual(self.search('estudio'), [self.listing.pk])
+        self.assertEqual(self.search('ático'), [])
+        # También con update(), que no pasa por save()
+        Listing.objects.filter(pk=self.other.pk).update(title='Cortijo', category_id=self.category)
+        self.assertEqual(self.search('cortijo apartamento'), [self.other.pk])
+
+    def test_move_listing_to_other_destination(self):
+        Listing.objects.filter(pk=self.listing.pk).update(destination_id=self.other.destination_id)
+        self.assertEqual(sorted(self.search('toledo')), sorted([self.listing.pk, self.other.pk]))
+
+    def test_deactivate_and_delete(self):
+        Listing.objects.filter(pk=self.listing.pk).update(is_active=False)
+        self.assertEqual(self.search('ático'), [])
+        self.other.delete()
+        self.assertEqual(self.search('casa'), [])
+        self.assertFalse(ListingSearch.objects.filter(pk=self.other.pk).exists())
+
+    def test_ranking(self):
+        playa = Listing.objects.create(
+            host_id=self.listing.host_id, destination_id=self.destination, title='Playa, playa y más playa',
+            description='', price_per_night=Decimal('60.00'),
+        )
+        lejos = Listing.objects.create(
+            host_id=self.listing.host_id, destination_id=self.destination, title='Piso céntrico',
+            description='Cerca de la catedral, del mercado y, a veinte minutos en autobús, de la playa',
+            price_per_night=Decimal('60.00'),
+        )
+        self.assertEqual(self.search('playa'), [playa.pk, lejos.pk])
+
+    def test_fts_syntax(self):
+        for text in ('"', '"ático', 'NEAR(ático puerto)', 'ático NEAR puerto', '*', 'át*', '-ático', 'ático -puerto',
+                     'ático OR casa', 'AND', 'NOT', '^ático', 'title:ático', '(', ')', '{title}: x', "'; DROP TABLE listing; --"):
+            with self.subTest(text=text):
+                self.search(text)
+        # Los operadores se tratan como palabras: "OR" no une las dos búsquedas
+        self.assertEqual(self.search('ático OR casa'), [])
+        self.assertEqual(self.search('-ático'), [self.listing.pk])
+        self.assertEqual(self.search('*'), [])
+
+
+class WriterQueueTests(SimpleTestCase):
+    """
+    Cola de escritura de Tablas.sqlite_backend. La base de datos de test está
+    en memoria (sin cola), así que se abren conexiones propias a un archivo.
+    """
+    ALIAS = 'cola'
+
+    def setUp(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        self.settings_dict = {
+            **connection.settings_dict,
+            'NAME': f'{directory}/cola.sqlite3',
+            'OPTIONS': {'timeout': 0.2, 'transaction_mode': 'IMMEDIATE', 'serialize_writes': True},
+        }
+        self.lock = writer_lock(self.settings_dict['NAME'])
+        self.addCleanup(self.connect().close)
+        with connections[self.ALIAS].cursor() as cursor:
+            cursor.execute('CREATE TABLE t (x INTEGER)')
+
+    def connect(self):
+        """Registra una conexión propia en el hilo actual (connections es por hilo)"""
+        wrapper = DatabaseWrapper(self.settings_dict, alias=self.ALIAS)
+        connections[self.ALIAS] = wrapper
+        return wrapper
+
+    def insert(self):
+        with connections[self.ALIAS].cursor() as cursor:
+            cursor.execute('INSERT INTO t VALUES (1)')
+
+    def test_autocommit_write_skips_queue(self):
+        with self.lock:
+            self.insert()
+
+    def test_released_on_commit(self):
+        with transaction.atomic(using=self.ALIAS):
+            self.assertTrue(self.lock.locked())
+            self.insert()
+        self.assertFalse(self.lock.locked())
+
+    def test_released_on_rollback(self):
+        with self.assertRaises(ZeroDivisionError):
+            with transaction.atomic(using=self.ALIAS):
+                self.insert()
+                1 / 0
+        self.assertFalse(self.lock.locked())
+        with connections[self.ALIAS].cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM t')
+            self.assertEqual(cursor.fetchone(), (0,))
+
+    def test_released_when_begin_fails(self):
+        with mock.patch.object(
+            sqlite_base.DatabaseWrapper, '_start_transaction_under_autocommit', side_effect=OperationalError('disk I/O error'),
+        ):
+            with self.assertRaises(OperationalError):
+                with transaction.atomic(using=self.ALIAS):
+                    pass
+        self.assertFalse(self.lock.locked())
+        with transaction.atomic(using=self.ALIAS):
+            self.insert()
+
+    def test_second_writer_times_out(self):
+        errors = []
+
+        def writer():
+            wrapper = self.connect()
+            try:
+                with transaction.atomic(using=self.ALIAS):
+                    self.insert()
+            except OperationalError as exc:
+                errors.append(exc)
+            finally:
+                wrapper.close()
+
+        with transaction.atomic(using=self.ALIAS):
+            self.insert()
+            thread = threading.Thread(target=writer)
+            thread.start()
+            thread.join(timeout=5)
+            self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
+        self.assertIn('cola de escritura', str(errors[0]))
+        self.assertFalse(self.lock.locked())
+
+        # Con la cola libre el mismo escritor entra
+        thread = threading.Thread(target=writer)
+        thread.start()
+        thread.join(timeout=5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(errors), 1)
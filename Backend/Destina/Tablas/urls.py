@@ -3,11 +3,11 @@ from .views import (
     # Auth
     SignupView, LoginView, LogoutView, ProfileView,
     # Destinations
-    DestinationListView, DestinationDetailView, SaveFavoriteDestinationView,
+    AsyncDestinationListView, DestinationDetailView, SaveFavoriteDestinationView,
     # Categories
     CategoryListView,
     # Listings
-    ListingListView, ListingDetailView, CreateListingView, UpdateListingView,
+    ListingListView, AsyncListingDetailView, CreateListingView, UpdateListingView, ListingAvailabilityView,
     # Images
     ListingImagesView, UploadImageView,
     # Bookings
@@ -26,7 +26,7 @@ urlpatterns = [
     path('auth/profile/', ProfileView.as_view(), name='profile'),
     
     # Destinations
-    path('destinations/', DestinationListView.as_view(), name='destination-list'),
+    path('destinations/', AsyncDestinationListView.as_view(), name='destination-list'),
     path('destinations/<int:destination_id>/', DestinationDetailView.as_view(), name='destination-detail'),
     path('destinations/<int:destination_id>/favorite/', SaveFavoriteDestinationView.as_view(), name='save-favorite'),
     
@@ -35,9 +35,10 @@ urlpatterns = [
     
     # Listings
     path('listings/', ListingListView.as_view(), name='listing-list'),
-    path('listings/<int:listing_id>/', ListingDetailView.as_view(), name='listing-detail'),
+    path('listings/<int:listing_id>/', AsyncListingDetailView.as_view(), name='listing-detail'),
     path('listings/create/', CreateListingView.as_view(), name='create-listing'),
     path('listings/<int:listing_id>/update/', UpdateListingView.as_view(), name='update-listing'),
+    path('listings/<int:listing_id>/availability/', ListingAvailabilityView.as_view(), name='listing-availability'),
     
     # Images
     path('listings/<int:listing_id>/images/', ListingImagesView.as_view(), name='listing-images'),
@@ -7,60 +7,93 @@
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
-from rest_framework.authtoken.models import Token
-from django.contrib.auth.hashers import make_password, check_password
-from .models import User, Destination, Category, Listing, Booking, ChatMessage, Image, PopularSearch
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, HTTP_409_CONFLICT
+import json
+from datetime import timedelta
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from .models import User, AuthToken, Destination, Category, Listing, Booking, ChatMessage, Image, PopularSearch
 from .serializers import (
     UserSerializer, DestinationSerializer, CategorySerializer, 
     ListingSerializer, BookingSerializer, ChatMessageSerializer, 
-    ImageSerializer, PopularSearchSerializer
+    ChatMessageCompactSerializer, ImageSerializer, PopularSearchSerializer
 )
+from .async_views import AsyncReadView, NegotiatedRenderMixin
+from .db_router import ReplicaReadsMixin
+from .eager_loading import eager_load
+from .pagination import KeysetPagination
+from .streaming import stream_list, wants_stream
+from .search import SEARCH_ORDERING, search_listings
+from .popular_searches import search_hits
+from .response_cache import cache_response
+from .availability import get_blocked_intervals, overlapping_bookings
+from .hashing import acheck_password, amake_password
 
 # ============== USER AUTHENTICATION ==============
 
-class SignupView(APIView):
-    """Registrar nuevo usuario"""
+def _request_data(request):
+    """Cuerpo JSON o de formulario (las vistas async no pasan por los parsers de DRF).
+    El JSON puede no ser un objeto: las vistas lo comprueban antes de leer campos"""
+    if request.content_type == 'application/json':
+        return json.loads(request.body or b'{}')
+    return request.POST
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class SignupView(NegotiatedRenderMixin, View):
+    """Registrar nuevo usuario (async: el hash se calcula en el pool de hashing)"""
 
     # Comentario: Endpoint verificado, funcional y estable.
     # TODO: agregar validaciones adicionales (por ejemplo, campos duplicados)
 
-    permission_classes = [AllowAny]
-    
-    def post(self, request):
+    async def post(self, request):
+        api_request = self.api_request(request)
         try:
-            user = User.objects.create(
-                email=request.data['email'],
-                name=request.data['name'],
-                password_hash=make_password(request.data['password']),
+            data = _request_data(request)
+            if not isinstance(data, dict):
+                return self.render(api_request, {'error': 'Request body must be a JSON object'}, HTTP_400_BAD_REQUEST)
+            user = await User.objects.acreate(
+                email=data['email'],
+                name=data['name'],
+                password_hash=await amake_password(data['password']),
                 role='guest'
             )
-            token, created = Token.objects.get_or_create(user=user)
-            return Response({
-                'user': UserSerializer(user).data,
+            token, created = await AuthToken.objects.aget_or_create(user_id=user)
+            return self.render(api_request, {
+                'user': UserSerializer(user, context={'request': request}).data,
                 'token': token.key
-            }, status=HTTP_201_CREATED)
+            }, HTTP_201_CREATED)
         except Exception as e:
-            return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
+            return self.render(api_request, {'error': str(e)}, HTTP_400_BAD_REQUEST)
 
 
-class LoginView(APIView):
-    """Iniciar sesión"""
-    permission_classes = [AllowAny]
+@method_decorator(csrf_exempt, name='dispatch')
+class LoginView(NegotiatedRenderMixin, View):
+    """Iniciar sesión (async: la verificación del hash no bloquea el worker)"""
     
-    def post(self, request):
+    async def post(self, request):
+        api_request = self.api_request(request)
         try:
-            user = User.objects.get(email=request.data['email'])
-            if check_password(request.data['password'], user.password_hash):
-                token, created = Token.objects.get_or_create(user=user)
-                return Response({
-                    'user': UserSerializer(user).data,
+            data = _request_data(request)
+            if not isinstance(data, dict):
+                return self.render(api_request, {'error': 'Request body must be a JSON object'}, HTTP_400_BAD_REQUEST)
+            user = await User.objects.aget(email=data['email'])
+            if await acheck_password(data['password'], user.password_hash):
+                token, created = await AuthToken.objects.aget_or_create(user_id=user)
+                return self.render(api_request, {
+                    'user': UserSerializer(user, context={'request': request}).data,
                     'token': token.key
                 })
             else:
-                return Response({'error': 'Invalid credentials'}, status=HTTP_400_BAD_REQUEST)
+                return self.render(api_request, {'error': 'Invalid credentials'}, HTTP_400_BAD_REQUEST)
         except User.DoesNotExist:
-            return Response({'error': 'User not found'}, status=HTTP_404_NOT_FOUND)
+            return self.render(api_request, {'error': 'User not found'}, HTTP_404_NOT_FOUND)
+        except (KeyError, ValueError):
+            return self.render(api_request, {'error': 'Email and password are required'}, HTTP_400_BAD_REQUEST)
 
 
 class LogoutView(APIView):
@@ -68,7 +101,8 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
     
     def post(self, request):
-        request.user.auth_token.delete()
+        # request.auth es el AuthToken ya resuelto por la autenticación
+        request.auth.delete()
         return Response({'message': 'Logged out successfully'})
 
 
@@ -77,26 +111,31 @@ class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        serializer = UserSerializer(request.user)
+        serializer = UserSerializer(request.user, context={'request': request})
         return Response(serializer.data)
     
     def put(self, request):
         user = request.user
         user.name = request.data.get('name', user.name)
         user.email = request.data.get('email', user.email)
-        user.save()
-        return Response(UserSerializer(user).data)
+        # request.user puede venir de la caché de tokens: un save() completo
+        # pisaría los contadores que usuarios.signals actualiza con F()
+        user.save(update_fields=['name', 'email'])
+        return Response(UserSerializer(user, context={'request': request}).data)
 
 
 # ============== DESTINATIONS ==============
 
-class DestinationListView(APIView):
+class DestinationListView(ReplicaReadsMixin, APIView):
     """Listar y crear destinos"""
     permission_classes = [AllowAny]
     
+    @cache_response('destinations')
     def get(self, request):
         destinations = Destination.objects.all()
-        serializer = DestinationSerializer(destinations, many=True)
+        if wants_stream(request):
+            return stream_list(request, destinations.order_by('destination_id'), DestinationSerializer)
+        serializer = DestinationSerializer(destinations, many=True, context={'request': request})
         return Response(serializer.data)
     
     def post(self, request):
@@ -111,19 +150,35 @@ class DestinationListView(APIView):
                 description=request.data['description'],
                 slug=request.data['slug']
             )
-            return Response(DestinationSerializer(destination).data, status=HTTP_201_CREATED)
+            return Response(DestinationSerializer(destination, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
 
-class DestinationDetailView(APIView):
+class AsyncDestinationListView(AsyncReadView):
+    """GET async de DestinationListView (POST y ?stream=1 los atiende la vista síncrona)"""
+    sync_view = DestinationListView
+    cache_tags = ('destinations',)
+    
+    async def get(self, request):
+        if wants_stream(self.api_request(request)):
+            return await self.delegate(request)
+        return await super().get(request)
+    
+    async def read(self, request):
+        destinations = [destination async for destination in Destination.objects.all()]
+        serializer = DestinationSerializer(destinations, many=True, context={'request': request})
+        return serializer.data, HTTP_200_OK
+
+
+class DestinationDetailView(ReplicaReadsMixin, APIView):
     """Detalle de destino"""
     permission_classes = [AllowAny]
     
     def get(self, request, destination_id):
         try:
             destination = Destination.objects.get(destination_id=destination_id)
-            serializer = DestinationSerializer(destination)
+            serializer = DestinationSerializer(destination, context={'request': request})
             return Response(serializer.data)
         except Destination.DoesNotExist:
             return Response({'error': 'Destination not found'}, status=HTTP_404_NOT_FOUND)
@@ -144,19 +199,20 @@ class SaveFavoriteDestinationView(APIView):
 
 # ============== CATEGORIES ==============
 
-class CategoryListView(APIView):
+class CategoryListView(ReplicaReadsMixin, APIView):
     """Listar categorías"""
     permission_classes = [AllowAny]
     
+    @cache_response('categories')
     def get(self, request):
         categories = Category.objects.all()
-        serializer = CategorySerializer(categories, many=True)
+        serializer = CategorySerializer(categories, many=True, context={'request': request})
         return Response(serializer.data)
 
 
 # ============== LISTINGS ==============
 
-class ListingListView(APIView):
+class ListingListView(ReplicaReadsMixin, APIView):
     """Listar propiedades/alojamientos"""
     permission_classes = [AllowAny]
     
@@ -170,23 +226,40 @@ class ListingListView(APIView):
         if category_id:
             listings = listings.filter(category_id=category_id)
         
-        serializer = ListingSerializer(listings, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination(ordering=('-created_at', '-listing_id'))
+        listings = eager_load(listings, ListingSerializer, context={'request': request})
+        if wants_stream(request):
+            return stream_list(request, listings.order_by(*paginator.ordering), ListingSerializer)
+        page = paginator.paginate_queryset(listings, request, view=self)
+        serializer = ListingSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 
-class ListingDetailView(APIView):
+class ListingDetailView(ReplicaReadsMixin, APIView):
     """Detalle de propiedad"""
     permission_classes = [AllowAny]
     
     def get(self, request, listing_id):
         try:
-            listing = Listing.objects.get(listing_id=listing_id)
-            serializer = ListingSerializer(listing)
+            listing = eager_load(Listing.objects.all(), ListingSerializer, context={'request': request}).get(listing_id=listing_id)
+            serializer = ListingSerializer(listing, context={'request': request})
             return Response(serializer.data)
         except Listing.DoesNotExist:
             return Response({'error': 'Listing not found'}, status=HTTP_404_NOT_FOUND)
 
 
+class AsyncListingDetailView(AsyncReadView):
+    """GET async de ListingDetailView"""
+    sync_view = ListingDetailView
+    
+    async def read(self, request, listing_id):
+        try:
+            listing = await eager_load(Listing.objects.all(), ListingSerializer, context={'request': request}).aget(listing_id=listing_id)
+            return ListingSerializer(listing, context={'request': request}).data, HTTP_200_OK
+        except Listing.DoesNotExist:
+            return {'error': 'Listing not found'}, HTTP_404_NOT_FOUND
+
+
 class CreateListingView(APIView):
     """Crear nueva propiedad (solo hosts)"""
     permission_classes = [IsAuthenticated]
@@ -204,7 +277,7 @@ class CreateListingView(APIView):
                 description=request.data['description'],
                 price_per_night=request.data['price_per_night']
             )
-            return Response(ListingSerializer(listing).data, status=HTTP_201_CREATED)
+            return Response(ListingSerializer(listing, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
@@ -216,28 +289,60 @@ class UpdateListingView(APIView):
     def put(self, request, listing_id):
         try:
             listing = Listing.objects.get(listing_id=listing_id)
-            if listing.host_id != request.user:
+            if listing.host_id_id != request.user.pk:
                 return Response({'error': 'Unauthorized'}, status=HTTP_400_BAD_REQUEST)
             
             listing.title = request.data.get('title', listing.title)
             listing.description = request.data.get('description', listing.description)
             listing.price_per_night = request.data.get('price_per_night', listing.price_per_night)
             listing.save()
-            return Response(ListingSerializer(listing).data)
+            return Response(ListingSerializer(listing, context={'request': request}).data)
         except Listing.DoesNotExist:
             return Response({'error': 'Listing not found'}, status=HTTP_404_NOT_FOUND)
 
 
+class ListingAvailabilityView(ReplicaReadsMixin, APIView):
+    """Noches ocupadas de una propiedad en un rango de fechas"""
+    permission_classes = [AllowAny]
+    max_range_days = 366
+    
+    def get(self, request, listing_id):
+        try:
+            from_param, to_param = request.query_params.get('from'), request.query_params.get('to')
+            from_date = parse_date(from_param) if from_param else timezone.localdate()
+            # parse_date devuelve None si el formato no es AAAA-MM-DD
+            if from_date is None:
+                raise ValueError(from_param)
+            to_date = parse_date(to_param) if to_param else from_date + timedelta(days=30)
+            if to_date is None:
+                raise ValueError(to_param)
+        except ValueError:
+            return Response({'error': 'Invalid dates'}, status=HTTP_400_BAD_REQUEST)
+        
+        if to_date <= from_date or (to_date - from_date).days > self.max_range_days:
+            return Response({'error': 'Invalid date range'}, status=HTTP_400_BAD_REQUEST)
+        if not Listing.objects.filter(listing_id=listing_id).exists():
+            return Response({'error': 'Listing not found'}, status=HTTP_404_NOT_FOUND)
+        
+        intervals = get_blocked_intervals(listing_id)
+        return Response({
+            'listing_id': listing_id,
+            'from': from_date,
+            'to': to_date,
+            'blocked_nights': intervals.blocked_nights(from_date, to_date),
+        })
+
+
 # ============== IMAGES ==============
 
-class ListingImagesView(APIView):
+class ListingImagesView(ReplicaReadsMixin, APIView):
     """Obtener imágenes de una propiedad"""
     permission_classes = [AllowAny]
     
     def get(self, request, listing_id):
         try:
             images = Image.objects.filter(listing_id=listing_id)
-            serializer = ImageSerializer(images, many=True)
+            serializer = ImageSerializer(images, many=True, context={'request': request})
             return Response(serializer.data)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
@@ -250,7 +355,7 @@ class UploadImageView(APIView):
     def post(self, request, listing_id):
         try:
             listing = Listing.objects.get(listing_id=listing_id)
-            if listing.host_id != request.user:
+            if listing.host_id_id != request.user.pk:
                 return Response({'error': 'Unauthorized'}, status=HTTP_400_BAD_REQUEST)
             
             image = Image.objects.create(
@@ -258,7 +363,7 @@ class UploadImageView(APIView):
                 url=request.data['url'],
                 is_main=request.data.get('is_main', False)
             )
-            return Response(ImageSerializer(image).data, status=HTTP_201_CREATED)
+            return Response(ImageSerializer(image, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
@@ -271,14 +376,25 @@ class CreateBookingView(APIView):
     
     def post(self, request):
         try:
-            booking = Booking.objects.create(
-                user_id=request.user,
-                listing_id=Listing.objects.get(listing_id=request.data['listing_id']),
-                start_date=request.data['start_date'],
-                end_date=request.data['end_date'],
-                total_price=request.data['total_price']
-            )
-            return Response(BookingSerializer(booking).data, status=HTTP_201_CREATED)
+            start_date = parse_date(request.data['start_date'])
+            end_date = parse_date(request.data['end_date'])
+            if not start_date or not end_date or start_date >= end_date:
+                return Response({'error': 'Invalid dates'}, status=HTTP_400_BAD_REQUEST)
+            
+            # La comprobación y la inserción van en la misma transacción
+            with transaction.atomic():
+                listing = Listing.objects.select_for_update().get(listing_id=request.data['listing_id'])
+                if overlapping_bookings(listing.listing_id, start_date, end_date).exists():
+                    return Response({'error': 'Listing not available for those dates'}, status=HTTP_409_CONFLICT)
+                
+                booking = Booking.objects.create(
+                    user_id=request.user,
+                    listing_id=listing,
+                    start_date=start_date,
+                    end_date=end_date,
+                    total_price=request.data['total_price']
+                )
+            return Response(BookingSerializer(booking, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
@@ -288,9 +404,13 @@ class BookingHistoryView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        bookings = Booking.objects.filter(user_id=request.user)
-        serializer = BookingSerializer(bookings, many=True)
-        return Response(serializer.data)
+        bookings = eager_load(Booking.objects.filter(user_id=request.user), BookingSerializer, context={'request': request})
+        paginator = KeysetPagination(ordering=('-created_at', '-booking_id'))
+        if wants_stream(request):
+            return stream_list(request, bookings.order_by(*paginator.ordering), BookingSerializer)
+        page = paginator.paginate_queryset(bookings, request, view=self)
+        serializer = BookingSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 
 class BookingDetailView(APIView):
@@ -299,10 +419,10 @@ class BookingDetailView(APIView):
     
     def get(self, request, booking_id):
         try:
-            booking = Booking.objects.get(booking_id=booking_id)
-            if booking.user_id != request.user and booking.listing_id.host_id != request.user:
+            booking = eager_load(Booking.objects.all(), BookingSerializer, context={'request': request}).get(booking_id=booking_id)
+            if booking.user_id_id != request.user.pk and booking.listing_id.host_id_id != request.user.pk:
                 return Response({'error': 'Unauthorized'}, status=HTTP_400_BAD_REQUEST)
-            return Response(BookingSerializer(booking).data)
+            return Response(BookingSerializer(booking, context={'request': request}).data)
         except Booking.DoesNotExist:
             return Response({'error': 'Booking not found'}, status=HTTP_404_NOT_FOUND)
 
@@ -314,7 +434,7 @@ class CancelBookingView(APIView):
     def post(self, request, booking_id):
         try:
             booking = Booking.objects.get(booking_id=booking_id)
-            if booking.user_id != request.user:
+            if booking.user_id_id != request.user.pk:
                 return Response({'error': 'Unauthorized'}, status=HTTP_400_BAD_REQUEST)
             
             booking.status = 'cancelled'
@@ -338,7 +458,7 @@ class SendChatMessageView(APIView):
                 sender=request.data['sender'],
                 message_text=request.data['message_text']
             )
-            return Response(ChatMessageSerializer(message).data, status=HTTP_201_CREATED)
+            return Response(ChatMessageSerializer(message, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
@@ -348,46 +468,66 @@ class ChatHistoryView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request, session_id):
-        messages = ChatMessage.objects.filter(session_id=session_id)
-        serializer = ChatMessageSerializer(messages, many=True)
-        return Response(serializer.data)
+        compact = request.query_params.get('compact') in ('1', 'true')
+        serializer_class = ChatMessageCompactSerializer if compact else ChatMessageSerializer
+        messages = eager_load(ChatMessage.objects.filter(session_id=session_id), serializer_class, context={'request': request})
+        paginator = KeysetPagination(ordering=('timestamp', 'message_id'))
+        
+        # Sondeo incremental: solo los mensajes posteriores a ?after=<message_id>
+        after = request.query_params.get('after')
+        if after:
+            try:
+                anchor = ChatMessage.objects.values_list('timestamp', 'message_id').get(
+                    message_id=after, session_id=session_id
+                )
+            except (ChatMessage.DoesNotExist, ValueError):
+                return Response({'error': 'Message not found'}, status=HTTP_404_NOT_FOUND)
+            messages = messages.filter(paginator.keyset_filter(anchor))
+        
+        if wants_stream(request):
+            return stream_list(request, messages.order_by(*paginator.ordering), serializer_class)
+        page = paginator.paginate_queryset(messages, request, view=self)
+        serializer = serializer_class(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 
 # ============== SEARCH & RECOMMENDATIONS ==============
 
-class SearchListingsView(APIView):
+class SearchListingsView(ReplicaReadsMixin, APIView):
     """Buscar propiedades"""
     permission_classes = [AllowAny]
     
     def get(self, request):
-        search_text = request.query_params.get('q', '')
+        search_text = request.query_params.get('q', '').strip()
         
-        # Registrar búsqueda popular
-        popular_search, created = PopularSearch.objects.get_or_create(search_text=search_text)
-        if not created:
-            popular_search.times_used += 1
-            popular_search.save()
+        # Registrar búsqueda popular (se acumula en memoria y se vuelca por lotes)
+        search_hits.record(search_text)
         
-        # Filtrar propiedades
-        listings = Listing.objects.filter(
-            title__icontains=search_text,
-            is_active=True
-        )
-        serializer = ListingSerializer(listings, many=True)
-        return Response(serializer.data)
+        # Filtrar propiedades: con texto se usa el índice FTS y se ordena por relevancia
+        listings = Listing.objects.filter(is_active=True)
+        ordering = ('-created_at', '-listing_id')
+        if search_text:
+            listings = search_listings(listings, search_text)
+            ordering = SEARCH_ORDERING
+        
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(eager_load(listings, ListingSerializer, context={'request': request}), request, view=self)
+        serializer = ListingSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 
-class PopularSearchesView(APIView):
+class PopularSearchesView(ReplicaReadsMixin, APIView):
     """Obtener búsquedas más populares"""
     permission_classes = [AllowAny]
     
+    @cache_response('popular-searches')
     def get(self, request):
         popular = PopularSearch.objects.order_by('-times_used')[:10]
-        serializer = PopularSearchSerializer(popular, many=True)
+        serializer = PopularSearchSerializer(popular, many=True, context={'request': request})
         return Response(serializer.data)
 
 
-class FilterResultsView(APIView):
+class FilterResultsView(ReplicaReadsMixin, APIView):
     """Filtrar resultados de búsqueda"""
     permission_classes = [AllowAny]
     
@@ -405,5 +545,12 @@ class FilterResultsView(APIView):
         if rating:
             listings = listings.filter(rating_avg__gte=rating)
         
-        serializer = ListingSerializer(listings, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        # ?ordering=rating ordena por la columna indexada rating_avg
+        if request.query_params.get('ordering') == 'rating':
+            ordering = ('-rating_avg', '-listing_id')
+        else:
+            ordering = ('-created_at', '-listing_id')
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(eager_load(listings, ListingSerializer, context={'request': request}), request, view=self)
+        serializer = ListingSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
\ No newline at end of file
@@ -0,0 +1,443 @@
+"""
+Benchmark de extremo a extremo de la API: un escenario cronometrado por
+endpoint (y método) de Tablas/urls.py y de los urls.py de cada app.
+
+Se crea una base SQLite temporal, se llena con benchmarks.dataset (la misma
+semilla da los mismos datos) y cada escenario se ejecuta en proceso con el
+Client de Django: --warmup peticiones de calentamiento, una petición con las
+consultas capturadas y --iterations peticiones cronometradas. Por defecto se
+vacía la caché de respuestas antes de cada petición, para medir la vista y
+no la caché (--warm-cache la conserva). Las escrituras usan datos distintos
+en cada iteración y, si hace falta, preparan su estado fuera del cronómetro.
+
+La salida es JSON (p50/p95/p99, consultas por petición, estados HTTP y pico
+de RSS del proceso) para guardarla y comparar entre commits:
+
+Uso (desde Backend/Destina):
+    python -m benchmarks.api --users 1000 --iterations 30 --output base.json
+    python -m benchmarks.api --scenarios listing,plan --output nuevo.json
+    python -m benchmarks.api compare base.json nuevo.json --threshold 1.2
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Destina.settings')
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def configure(database):
+    """Apunta la base de datos al archivo del benchmark antes de django.setup()"""
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = database
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['*']
+
+    import django
+    django.setup()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb():
+    # ru_maxrss: KB en Linux, bytes en macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class Actors:
+    """Usuarios de los datos sembrados con los que se hacen las peticiones"""
+
+    def __init__(self):
+        from django.db.models import Count
+
+        from planes.models import Plan
+        from recomendaciones.models import Recomendacion
+        from Tablas.models import Booking, ChatMessage, Destination, Listing, User
+
+        from .dataset import ADMIN_EMAIL
+
+        self.admin = User.objects.get(email=ADMIN_EMAIL)
+        self.host = User.objects.filter(role='host').annotate(n=Count('listings')).order_by('-n', 'pk').first()
+        booking = Booking.objects.filter(user_id__role='guest').order_by('booking_id').first()
+        self.guest = booking.user_id
+        self.booking = booking
+        self.listing = Listing.objects.filter(host_id=self.host, is_active=True).order_by('listing_id').first()
+        self.destination = Destination.objects.order_by('destination_id').first()
+        self.other = User.objects.filter(role='guest').exclude(pk=self.guest.pk).order_by('pk').first()
+        self.popular = User.objects.order_by('-followers_count', 'pk').first()
+        self.session_id = ChatMessage.objects.filter(user_id=self.guest).values_list('session_id', flat=True).first()
+        self.plan = Plan.objects.filter(user_id=self.guest).order_by('plan_id').first() or Plan.objects.create(
+            user_id=self.guest, destino_id=self.destination, titulo='Plan del benchmark', descripcion='',
+            fecha_inicio=date(2026, 6, 1), fecha_fin=date(2026, 6, 8),
+        )
+        self.recomendacion = Recomendacion.objects.filter(is_active=True).order_by('recomendacion_id').first()
+        self.attraction = self.destination.atracciones.order_by('atraccion_id').first()
+        self.clients = {}
+
+    def client(self, user):
+        """Client autenticado con el token de `user` (None: anónimo)"""
+        from django.test import Client
+
+        from Tablas.models import AuthToken
+
+        key = user.pk if user is not None else None
+        if key not in self.clients:
+            headers = {}
+            if user is not None:
+                token, created = AuthToken.objects.get_or_create(user_id=user)
+                headers['HTTP_AUTHORIZATION'] = f'Token {token.key}'
+            self.clients[key] = Client(**headers)
+        return self.clients[key]
+
+
+class Scenario:
+    """
+    Una petición repetible. `body` y `setup` reciben el número de iteración:
+    `body` devuelve el cuerpo JSON y `setup` prepara el estado sin cronometrar.
+    """
+
+    def __init__(self, url_name, method='get', kwargs=None, query='', user=None, body=None, setup=None):
+        self.url_name = url_name
+        self.method = method
+        self.kwargs = kwargs or {}
+        self.query = query
+        self.user = user
+        self.body = body
+        self.setup = setup
+        self.name = f'{method.upper()} {url_name}' + (f'?{query}' if query else '')
+
+    def path(self):
+        from django.urls import reverse
+        path = reverse(self.url_name, kwargs=self.kwargs)
+        return f'{path}?{self.query}' if self.query else path
+
+    def request(self, client, path, iteration):
+        if self.setup:
+            self.setup(iteration)
+        if self.method == 'get':
+            return lambda: client.get(path)
+        body = self.body(iteration) if callable(self.body) else (self.body or {})
+        return lambda: getattr(client, self.method)(path, json.dumps(body), content_type='application/json')
+
+
+def scenarios(actors):
+    from destinos.models import ClimaDestino
+    from Tablas.models import AuthToken
+    from usuarios.models import ResenaUsuario, SeguimientoUsuario
+
+    from .dataset import PASSWORD
+
+    admin, host, guest = actors.admin, actors.host, actors.guest
+    destination = {'destination_id': actors.destination.pk}
+    destino = {'destino_id': actors.destination.pk}
+    listing = {'listing_id': actors.listing.pk}
+    plan = {'plan_id': actors.plan.pk}
+    recomendacion = {'recomendacion_id': actors.recomendacion.pk}
+    other = {'user_id': actors.other.pk}
+    popular = {'user_id': actors.popular.pk}
+    lat, lon = float(actors.attraction.latitud), float(actors.attraction.longitud)
+    logout_user = actors.other
+
+    def fresh_token(iteration):
+        # LogoutView borra el token: se vuelve a crear con la misma clave
+        key = actors.client(logout_user).defaults['HTTP_AUTHORIZATION'].split()[1]
+        AuthToken.objects.get_or_create(key=key, defaults={'user_id': logout_user})
+
+    def unfollow(iteration):
+        SeguimientoUsuario.objects.filter(seguidor_id=guest, seguido_id=actors.other).delete()
+
+    def follow(iteration):
+        SeguimientoUsuario.objects.get_or_create(seguidor_id=guest, seguido_id=actors.other)
+
+    def remove_review(iteration):
+        for resena in ResenaUsuario.objects.filter(usuario_resenador_id=guest, usuario_resenado_id=actors.other):
+            resena.delete()
+
+    def free_month(iteration):
+        ClimaDestino.objects.filter(destino_id=actors.destination, mes=1 + iteration % 12).delete()
+
+    def booking_dates(iteration):
+        start = date(2035, 1, 1) + timedelta(days=3 * iteration)
+        return {
+            'listing_id': actors.listing.pk, 'start_date': start.isoformat(),
+            'end_date': (start + timedelta(days=2)).isoformat(), 'total_price': '200.00',
+        }
+
+    return [
+        # Tablas
+        Scenario('signup', 'post', body=lambda i: {'email': f'nuevo{i}@example.com', 'name': f'Nuevo {i}', 'password': PASSWORD}),
+        Scenario('login', 'post', body={'email': guest.email, 'password': PASSWORD}),
+        Scenario('logout', 'post', user=logout_user, setup=fresh_token),
+        Scenario('profile', user=guest),
+        Scenario('profile', 'put', user=guest, body={'name': guest.name}),
+        Scenario('destination-list'),
+        Scenario('destination-list', 'post', user=admin, body=lambda i: {
+            'name': f'Destino nuevo {i}', 'country': 'País', 'description': 'Descripción', 'slug': f'destino-nuevo-{i}',
+        }),
+        Scenario('destination-detail', kwargs=destination),
+        Scenario('save-favorite', 'post', kwargs=destination, user=guest),
+        Scenario('category-list'),
+        Scenario('listing-list'),
+        Scenario('listing-list', query=f'destination_id={actors.destination.pk}'),
+        Scenario('listing-detail', kwargs=listing),
+        Scenario('create-listing', 'post', user=host, body=lambda i: {
+            'destination_id': actors.destination.pk, 'category_id': actors.listing.category_id_id,
+            'title': f'Alojamiento nuevo {i}', 'description': 'Descripción', 'price_per_night': '90.00',
+        }),
+        Scenario('update-listing', 'put', kwargs=listing, user=host, body={'price_per_night': str(actors.listing.price_per_night)}),
+        Scenario('listing-availability', kwargs=listing, query='from=2026-01-01&to=2026-12-31'),
+        Scenario('listing-images', kwargs=listing),
+        Scenario('upload-image', 'post', kwargs=listing, user=host, body=lambda i: {'url': f'https://cdn.example.com/nuevas/{i}.jpg'}),
+        Scenario('create-booking', 'post', user=guest, body=booking_dates),
+        Scenario('booking-history', user=guest),
+        Scenario('booking-detail', kwargs={'booking_id': actors.booking.pk}, user=guest),
+        Scenario('cancel-booking', 'post', kwargs={'booking_id': actors.booking.pk}, user=guest),
+        Scenario('send-message', 'post', user=guest, body=lambda i: {
+            'session_id': actors.session_id, 'sender': 'user', 'message_text': f'Mensaje {i}',
+        }),
+        Scenario('chat-history', kwargs={'session_id': actors.session_id}, user=guest),
+        Scenario('search-listings', query='q=playa'),
+        Scenario('popular-searches'),
+        Scenario('filter-results', query='min_price=50&max_price=150'),
+        Scenario('filter-results', query='rating=4&ordering=rating'),
+        # destinos
+        Scenario('atracciones-destino', kwargs=destino),
+        Scenario('atracciones-destino', 'post', kwargs=destino, user=admin, body=lambda i: {
+            'nombre': f'Atracción nueva {i}', 'descripcion': 'Descripción', 'categoria': 'museo', 'latitud': lat, 'longitud': lon,
+        }),
+        Scenario('atracciones-cercanas', query=f'lat={lat}&lon={lon}&km=50'),
+        Scenario('atraccion-detail', kwargs={'atraccion_id': actors.attraction.pk}),
+        Scenario('galeria-destino', kwargs=destino),
+        Scenario('galeria-destino', 'post', kwargs=destino, user=admin, body=lambda i: {'imagen_url': f'https://cdn.example.com/galeria/{i}.jpg'}),
+        Scenario('clima-destino', kwargs=destino),
+        Scenario('clima-destino', 'post', kwargs=destino, user=admin, setup=free_month, body=lambda i: {
+            'mes': 1 + i % 12, 'temperatura_promedio': '21.0', 'temperatura_min': '12.0', 'temperatura_max': '30.0',
+        }),
+        # planes
+        Scenario('plan-list'),
+        Scenario('plan-list', query=f'destino_id={actors.destination.pk}'),
+        Scenario('plan-list', 'post', user=guest, body=lambda i: {
+            'titulo': f'Plan nuevo {i}', 'descripcion': 'Descripción', 'destino_id': actors.destination.pk,
+            'fecha_inicio': '2026-07-01', 'fecha_fin': '2026-07-08',
+        }),
+        Scenario('mis-planes', user=guest),
+        Scenario('plan-detail', kwargs=plan, user=guest),
+        Scenario('plan-detail', 'put', kwargs=plan, user=guest, body={'titulo': actors.plan.titulo}),
+        Scenario('actividades-plan', kwargs=plan, user=guest),
+        Scenario('actividades-plan', 'post', kwargs=plan, user=guest, body=lambda i: {
+            'titulo': f'Actividad {i}', 'fecha_actividad': '2026-06-02',
+        }),
+        Scenario('actividades-plan-lote', 'post', kwargs=plan, user=guest, body=lambda i: {
+            'crear': [{'titulo': f'Lote {i}-{n}', 'fecha_actividad': '2026-06-03'} for n in range(5)],
+        }),
+        # recomendaciones
+        Scenario('recomendacion-list'),
+        Scenario('recomendacion-list', query='tipo=restaurante'),
+        Scenario('recomendacion-list', 'post', user=admin, body=lambda i: {
+            'titulo': f'Recomendación nueva {i}', 'descripcion': 'Descripción', 'tipo': 'restaurante', 'ubicacion': 'Madrid',
+        }),
+        Scenario('recomendacion-detail', kwargs=recomendacion),
+        Scenario('guardar-recomendacion', 'post', kwargs=recomendacion, user=guest, body={'nota_personal': 'Para el verano'}),
+        Scenario('mis-recomendaciones', user=guest),
+        Scenario('recomendaciones-para-mi', user=guest),
+        # usuarios
+        Scenario('perfil-usuario', user=guest),
+        Scenario('perfil-usuario', 'put', user=guest, body={'bio': 'Viajera'}),
+        Scenario('perfil-usuario-detail', kwargs=other, user=guest),
+        Scenario('seguir-usuario', 'post', kwargs=other, user=guest, setup=unfollow),
+        Scenario('seguir-usuario', 'delete', kwargs=other, user=guest, setup=follow),
+        Scenario('seguidores', kwargs=popular),
+        Scenario('siguiendo', kwargs=popular),
+        Scenario('grafo-seguidores', kwargs=popular),
+        Scenario('grafo-siguiendo', kwargs=popular),
+        Scenario('resenas-usuario', kwargs=popular, user=guest),
+        Scenario('resenas-usuario', 'post', kwargs=other, user=guest, setup=remove_review, body={'rating': 4, 'comentario': 'Muy amable'}),
+    ]
+
+
+def uncovered(selected):
+    """Nombres de URL de la API sin ningún escenario"""
+    from django.urls import get_resolver
+
+    names = {key for key in get_resolver().reverse_dict if isinstance(key, str)}
+    return sorted(names - {scenario.url_name for scenario in selected})
+
+
+def run_scenario(scenario, actors, args):
+    from django.core.cache import cache
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    client = actors.client(scenario.user)
+    path = scenario.path()
+    iteration = 0
+
+    def send():
+        nonlocal iteration
+        if not args.warm_cache:
+            cache.clear()
+        request = scenario.request(client, path, iteration)
+        iteration += 1
+        return request
+
+    for _ in range(args.warmup):
+        send()()
+    request = send()
+    with CaptureQueriesContext(connection) as queries:
+        request()
+    # captured_queries se lee del log de la conexión, que cada petición vacía
+    query_count = len(queries.captured_queries)
+
+    statuses = {}
+    latencies = []
+    rss_before = peak_rss_mb()
+    for _ in range(args.iterations):
+        request = send()
+        started = time.perf_counter()
+        response = request()
+        latencies.append(time.perf_counter() - started)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    return {
+        'path': path,
+        'iterations': len(latencies),
+        'statuses': {str(status): count for status, count in sorted(statuses.items())},
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+        'queries': query_count,
+        'peak_rss_mb': peak_rss_mb(),
+        'rss_growth_mb': round(peak_rss_mb() - rss_before, 1),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    with tempfile.TemporaryDirectory() as directory:
+        configure(os.path.join(directory, 'benchmark.sqlite3'))
+        import django
+        from django.core.management import call_command
+
+        from .dataset import generate
+
+        call_command('migrate', verbosity=0)
+        started = time.perf_counter()
+        dataset = generate(args.users, args.seed)
+        seed_s = time.perf_counter() - started
+
+        actors = Actors()
+        selected = scenarios(actors)
+        if args.scenarios:
+            filters = args.scenarios.split(',')
+            selected = [scenario for scenario in selected if any(text in scenario.name for text in filters)]
+        missing = uncovered(scenarios(actors))
+        if missing:
+            print(f'Endpoints sin escenario: {", ".join(missing)}', file=sys.stderr)
+
+        results = {}
+        for scenario in selected:
+            results[scenario.name] = run_scenario(scenario, actors, args)
+            print(f'{scenario.name}: p50 {results[scenario.name]["p50_ms"]} ms', file=sys.stderr)
+
+    return {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'cpu_count': os.cpu_count(),
+        'users': args.users,
+        'seed': args.seed,
+        'iterations': args.iterations,
+        'warmup': args.warmup,
+        'warm_cache': args.warm_cache,
+        'dataset': dataset,
+        'seed_s': round(seed_s, 2),
+        'uncovered_endpoints': missing,
+        'peak_rss_mb': peak_rss_mb(),
+        'scenarios': results,
+    }
+
+
+def compare(base_file, new_file, threshold):
+    """Cocientes nuevo/base por escenario; con threshold, lista los que empeoran"""
+    with open(base_file) as base_handle, open(new_file) as new_handle:
+        base, new = json.load(base_handle), json.load(new_handle)
+    rows = {}
+    regressions = []
+    for name, result in new['scenarios'].items():
+        previous = base['scenarios'].get(name)
+        if previous is None:
+            continue
+        row = {
+            f'{metric}_ratio': round(result[metric] / previous[metric], 2) if previous[metric] else None
+            for metric in ('p50_ms', 'p95_ms', 'p99_ms')
+        }
+        row['queries'] = [previous['queries'], result['queries']]
+        rows[name] = row
+        if threshold and ((row['p95_ms_ratio'] or 0) > threshold or result['queries'] > previous['queries']):
+            regressions.append(name)
+    return {
+        'base': base.get('revision'),
+        'new': new.get('revision'),
+        'peak_rss_mb': [base['peak_rss_mb'], new['peak_rss_mb']],
+        'scenarios': rows,
+        'regressions': regressions,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'compare'])
+    parser.add_argument('files', nargs='*', help='compare: resultado base y resultado nuevo')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--iterations', type=int, default=30)
+    parser.add_argument('--warmup', type=int, default=3)
+    parser.add_argument('--warm-cache', action='store_true', help='No vaciar la caché de respuestas entre peticiones')
+    parser.add_argument('--scenarios', help='Solo los escenarios cuyo nombre contenga alguno de estos textos (separados por comas)')
+    parser.add_argument('--output', help='Archivo JSON de salida (por defecto, stdout)')
+    parser.add_argument('--threshold', type=float, help='compare: cociente p95 a partir del cual un escenario empeora')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        if len(args.files) != 2:
+            parser.error('compare necesita dos archivos de resultados')
+        results = compare(*args.files, args.threshold)
+    else:
+        results = run(args)
+
+    output = open(args.output, 'w') if args.output else sys.stdout
+    json.dump(results, output, indent=2)
+    output.write('\n')
+    if args.output:
+        output.close()
+    if args.command == 'compare' and results['regressions']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
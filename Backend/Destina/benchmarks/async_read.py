@@ -0,0 +1,261 @@
+"""
+Benchmark de carga de las vistas públicas de lectura: despliegue WSGI con las
+APIView síncronas frente a ASGI con las vistas async (Tablas.async_views).
+
+Se crea una base SQLite temporal con datos de catálogo y se levanta cada
+despliegue en un proceso aparte:
+    wsgi        servidor WSGI con un hilo por petición (wsgiref) y vistas síncronas
+    asgi-sync   uvicorn con las vistas síncronas (cada petición pasa por sync_to_async)
+    asgi-async  uvicorn con las vistas async
+Un cliente asyncio mantiene --concurrency peticiones en vuelo repartidas entre
+los cinco endpoints y mide peticiones por segundo y latencias p50/p99.
+
+Uso (desde Backend/Destina, requiere uvicorn):
+    python -m benchmarks.async_read --concurrency 64 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Destina.settings')
+
+MODES = ('wsgi', 'asgi-sync', 'asgi-async')
+
+
+def configure(database):
+    """Apunta la base de datos al archivo del benchmark antes de django.setup()"""
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = database
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ['*']
+
+    import django
+    django.setup()
+
+
+def sync_urlpatterns():
+    """Las mismas rutas públicas servidas por las APIView síncronas"""
+    from django.urls import include, path
+
+    from destinos.views import AtraccionDestinoListView, ClimaDestinoView
+    from recomendaciones.views import RecomendacionListView
+    from Tablas.views import DestinationListView, ListingDetailView
+
+    return [
+        path('api/destinations/', DestinationListView.as_view()),
+        path('api/listings/<int:listing_id>/', ListingDetailView.as_view()),
+        path('api/destinos/<int:destino_id>/atracciones/', AtraccionDestinoListView.as_view()),
+        path('api/destinos/<int:destino_id>/clima/', ClimaDestinoView.as_view()),
+        path('api/recomendaciones/', RecomendacionListView.as_view()),
+        path('', include('Destina.urls')),
+    ]
+
+
+def seed(destinations=50, listings=2000):
+    from destinos.models import AtraccionDestino, ClimaDestino
+    from recomendaciones.models import Recomendacion
+    from Tablas.models import Category, Destination, Image, Listing, User
+
+    host = User.objects.create(email='host@example.com', name='Anfitriona', password_hash='x', role='host')
+    destinos = Destination.objects.bulk_create([
+        Destination(name=f'Destino {i}', country='País', description='Descripción del destino. ' * 10, slug=f'destino-{i}')
+        for i in range(destinations)
+    ])
+    categories = Category.objects.bulk_create([
+        Category(name=f'Categoría {i}', icon_name='icon', description='') for i in range(5)
+    ])
+    created = Listing.objects.bulk_create([
+        Listing(
+            host_id=host, destination_id=destinos[i % destinations], category_id=categories[i % 5],
+            title=f'Alojamiento {i}', description='Apartamento luminoso con vistas. ' * 5,
+            price_per_night=Decimal('80.00') + i % 50,
+        )
+        for i in range(listings)
+    ])
+    Image.objects.bulk_create([
+        Image(listing_id=listing, url=f'https://cdn.example.com/{listing.pk}/{n}.jpg', is_main=n == 0)
+        for listing in created for n in range(3)
+    ])
+    AtraccionDestino.objects.bulk_create([
+        AtraccionDestino(
+            destino_id=destino, nombre=f'Atracción {n}', descripcion='Visita guiada. ' * 5,
+            categoria='museo', latitud=40 + n / 100, longitud=-3 - n / 100,
+        )
+        for destino in destinos for n in range(10)
+    ])
+    ClimaDestino.objects.bulk_create([
+        ClimaDestino(destino_id=destino, mes=mes, temperatura_promedio=20, temperatura_min=10, temperatura_max=30)
+        for destino in destinos for mes in range(1, 13)
+    ])
+    Recomendacion.objects.bulk_create([
+        Recomendacion(titulo=f'Recomendación {i}', descripcion='Muy recomendable. ' * 5, tipo='restaurante', ubicacion='Madrid')
+        for i in range(100)
+    ])
+    return [destino.pk for destino in destinos], [listing.pk for listing in created]
+
+
+def serve(mode, database, port):
+    configure(database)
+    from django.conf import settings
+
+    if mode != 'asgi-async':
+        settings.ROOT_URLCONF = __name__
+    if mode == 'wsgi':
+        from socketserver import ThreadingMixIn
+        from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+        from django.core.wsgi import get_wsgi_application
+
+        class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+            daemon_threads = True
+            request_queue_size = 1024
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        make_server('127.0.0.1', port, get_wsgi_application(), ThreadingWSGIServer, QuietHandler).serve_forever()
+    else:
+        import uvicorn
+
+        from django.core.asgi import get_asgi_application
+
+        uvicorn.run(
+            get_asgi_application(), host='127.0.0.1', port=port, log_level='warning',
+            access_log=False, lifespan='off', backlog=1024,
+        )
+
+
+def __getattr__(name):
+    # ROOT_URLCONF = este módulo en los modos con vistas síncronas
+    if name == 'urlpatterns':
+        return sync_urlpatterns()
+    raise AttributeError(name)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def fetch(port, path):
+    """GET con una conexión nueva por petición (wsgiref no mantiene conexiones abiertas)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode())
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    return int(response.split(b' ', 2)[1])
+
+
+async def wait_until_ready(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await fetch(port, '/api/recomendaciones/')
+            return
+        except (ConnectionError, OSError, IndexError):
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f'El servidor del puerto {port} no arrancó')
+
+
+async def load(port, paths, concurrency, duration):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(offset):
+        nonlocal errors
+        index = offset
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await fetch(port, paths[index % len(paths)])
+            except (ConnectionError, OSError, IndexError, ValueError):
+                status = None
+            if status != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+            index += concurrency
+
+    started = time.perf_counter()
+    await asyncio.gather(*[worker(offset) for offset in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    ordered = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'requests_per_s': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(statistics.median(ordered) * 1000, 2),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+    }
+
+
+def run_mode(mode, database, paths, args):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, '-m', 'benchmarks.async_read', 'serve', '--mode', mode, '--db', database, '--port', str(port)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    try:
+        asyncio.run(wait_until_ready(port))
+        asyncio.run(load(port, paths, args.concurrency, 1))  # calentamiento
+        return asyncio.run(load(port, paths, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'serve'])
+    parser.add_argument('--mode', choices=MODES)
+    parser.add_argument('--db')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--modes', default=','.join(MODES))
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.mode, args.db, args.port)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, 'benchmark.sqlite3')
+        configure(database)
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+        destinos, listings = seed()
+
+        paths = []
+        for i in range(100):
+            destino = destinos[i % len(destinos)]
+            paths.extend([
+                '/api/destinations/',
+                f'/api/listings/{listings[i * 7 % len(listings)]}/',
+                f'/api/destinos/{destino}/atracciones/',
+                f'/api/destinos/{destino}/clima/',
+                '/api/recomendaciones/?tipo=restaurante',
+            ])
+        results = {
+            'cpu_count': os.cpu_count(),
+            'concurrency': args.concurrency,
+            'duration_s': args.duration,
+            'modes': {mode: run_mode(mode, database, paths, args) for mode in args.modes.split(',')},
+        }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+"""
+Datos sintéticos para los benchmarks (manage.py sembrar_datos).
+
+Todo escala a partir del número de usuarios con proporciones de una
+plataforma real: pocos anfitriones y destinos, varias reservas y mensajes de
+chat por usuario, galería, clima y atracciones por destino... Con la misma
+semilla se genera siempre el mismo conjunto, así que los resultados de
+distintos commits son comparables.
+
+Todos los usuarios comparten la contraseña PASSWORD (se calcula un solo hash).
+"""
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+PASSWORD = 'benchmark-password'
+ADMIN_EMAIL = 'admin@example.com'
+
+# Proporciones por usuario, por destino, por propiedad y por plan
+HOST_RATIO = 0.05
+PER_USER = {
+    'destinations': 1 / 50,
+    'listings': 1 / 2,
+    'bookings': 2,
+    'plans': 1 / 4,
+    'chat_messages': 10,
+    'follows': 5,
+    'reviews': 1,
+    'recomendaciones': 1 / 10,
+    'saved_recomendaciones': 2,
+}
+PER_DESTINATION = {'attractions': 15, 'gallery': 6}
+IMAGES_PER_LISTING = 3
+ACTIVITIES_PER_PLAN = 5
+CHAT_SESSIONS_PER_USER = 2
+
+CATEGORIES = ['Apartamento', 'Casa rural', 'Hotel', 'Hostal', 'Villa', 'Cabaña', 'Loft', 'Estudio']
+WORDS = [
+    'playa', 'montaña', 'centro', 'luminoso', 'terraza', 'piscina', 'rústico', 'moderno', 'vistas',
+    'tranquilo', 'familiar', 'jardín', 'histórico', 'acogedor', 'amplio', 'céntrico', 'lago', 'bosque',
+]
+BOOKING_STATUSES = ['confirmed'] * 12 + ['completed'] * 5 + ['pending'] * 2 + ['cancelled']
+
+
+def _text(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+
+def scaled_counts(users):
+    """Número de filas de cada tipo para `users` usuarios"""
+    counts = {name: max(1, round(users * ratio)) for name, ratio in PER_USER.items()}
+    counts['destinations'] = max(5, counts['destinations'])
+    counts['hosts'] = max(1, round(users * HOST_RATIO))
+    counts['users'] = users
+    return counts
+
+
+@transaction.atomic
+def generate(users=1000, seed=0, password=PASSWORD):
+    """Llena una base de datos vacía y devuelve cuántas filas creó de cada modelo"""
+    from destinos.models import AtraccionDestino, ClimaDestino, GaleriaDestino
+    from planes.models import ActividadPlan, Plan
+    from recomendaciones.models import Recomendacion, RecomendacionUsuario
+    from Tablas.models import Booking, Category, ChatMessage, Destination, Image, Listing, PopularSearch, User
+    from usuarios.agregados import recompute_follow_counts, recompute_reputation
+    from usuarios.models import PerfilUsuario, ResenaUsuario, SeguimientoUsuario
+
+    rng = random.Random(seed)
+    counts = scaled_counts(users)
+    password_hash = make_password(password)
+
+    created = User.objects.bulk_create(
+        [User(email=ADMIN_EMAIL, name='Admin', password_hash=password_hash, role='admin')]
+        + [
+            User(
+                email=f'usuario{n}@example.com', name=f'Usuario {n}', password_hash=password_hash,
+                role='host' if n < counts['hosts'] else 'guest',
+            )
+            for n in range(users)
+        ]
+    )
+    people = created[1:]
+    hosts, guests = people[:counts['hosts']], people[counts['hosts']:] or people
+    PerfilUsuario.objects.bulk_create([
+        PerfilUsuario(user_id=user, bio=_text(rng, 12), pais='España', ciudad='Madrid', preferencias_viaje={'tipo': rng.choice(WORDS)})
+        for user in people
+    ])
+
+    destinations = Destination.objects.bulk_create([
+        Destination(name=f'Destino {n}', country='País', description=_text(rng, 40), slug=f'destino-{n}')
+        for n in range(counts['destinations'])
+    ])
+    centers = {destination.pk: (rng.uniform(-50, 60), rng.uniform(-120, 150)) for destination in destinations}
+    categories = Category.objects.bulk_create([
+        Category(name=name, icon_name=name.lower(), description=_text(rng, 8)) for name in CATEGORIES
+    ])
+
+    listings = Listing.objects.bulk_create([
+        Listing(
+            host_id=hosts[n % len(hosts)], destination_id=rng.choice(destinations), category_id=rng.choice(categories),
+            title=f'{rng.choice(CATEGORIES)} {_text(rng, 3)}', description=_text(rng, 60),
+            price_per_night=Decimal(rng.randrange(30, 400)), rating_avg=round(rng.uniform(3, 5), 2),
+            is_active=rng.random() > 0.1,
+        )
+        for n in range(counts['listings'])
+    ])
+    Image.objects.bulk_create([
+        Image(listing_id=listing, url=f'https://cdn.example.com/listings/{listing.pk}/{n}.jpg', is_main=n == 0)
+        for listing in listings for n in range(IMAGES_PER_LISTING)
+    ])
+
+    # Reservas sin solapamientos: cada propiedad se reserva a partir de su última salida
+    next_free = {listing.pk: date(2026, 1, 1) + timedelta(days=rng.randrange(30)) for listing in listings}
+    bookings = []
+    for n in range(counts['bookings']):
+        listing = rng.choice(listings)
+        nights = rng.randint(1, 7)
+        start = next_free[listing.pk]
+        next_free[listing.pk] = start + timedelta(days=nights + rng.randrange(10))
+        bookings.append(Booking(
+            listing_id=listing, user_id=guests[n % len(guests)], start_date=start, end_date=start + timedelta(days=nights),
+            total_price=listing.price_per_night * nights, status=rng.choice(BOOKING_STATUSES),
+        ))
+    Booking.objects.bulk_create(bookings)
+
+    plans = Plan.objects.bulk_create([
+        Plan(
+            user_id=rng.choice(people), destino_id=rng.choice(destinations), titulo=f'Plan {_text(rng, 2)}',
+            descripcion=_text(rng, 20), fecha_inicio=date(2026, 6, 1), fecha_fin=date(2026, 6, 8),
+            presupuesto_total=Decimal(rng.randrange(300, 3000)),
+            estado='publicado' if rng.random() < 0.6 else rng.choice(['borrador', 'completado']),
+            is_publico=rng.random() < 0.7,
+        )
+        for _ in range(counts['plans'])
+    ])
+    ActividadPlan.objects.bulk_create([
+        ActividadPlan(
+            plan_id=plan, titulo=_text(rng, 3), descripcion=_text(rng, 10), fecha_actividad=date(2026, 6, 1 + n),
+            hora_inicio=time(10), hora_fin=time(12), costo=Decimal(rng.randrange(0, 80)), ubicacion='Centro', orden=n,
+        )
+        for plan in plans for n in range(ACTIVITIES_PER_PLAN)
+    ])
+
+    categorias = [value for value, _ in AtraccionDestino.CATEGORIA_CHOICES]
+    attractions = []
+    for destination in destinations:
+        lat, lon = centers[destination.pk]
+        for n in range(PER_DESTINATION['attractions']):
+            attractions.append(AtraccionDestino(
+                destino_id=destination, nombre=f'Atracción {n}', descripcion=_text(rng, 20),
+                categoria=rng.choice(categorias), rating_promedio=round(rng.uniform(3, 5), 2),
+                latitud=Decimal(f'{lat + rng.uniform(-0.1, 0.1):.6f}'), longitud=Decimal(f'{lon + rng.uniform(-0.1, 0.1):.6f}'),
+            ))
+    AtraccionDestino.objects.bulk_create(attractions)
+    GaleriaDestino.objects.bulk_create([
+        GaleriaDestino(
+            destino_id=destination, imagen_url=f'https://cdn.example.com/destinos/{destination.pk}/{n}.jpg',
+            is_principal=n == 0, orden=n,
+        )
+        for destination in destinations for n in range(PER_DESTINATION['gallery'])
+    ])
+    ClimaDestino.objects.bulk_create([
+        ClimaDestino(
+            destino_id=destination, mes=mes, temperatura_promedio=Decimal(20), temperatura_min=Decimal(10),
+            temperatura_max=Decimal(30), dias_lluvia=rng.randrange(0, 15),
+        )
+        for destination in destinations for mes in range(1, 13)
+    ])
+
+    per_session = max(1, counts['chat_messages'] // (users * CHAT_SESSIONS_PER_USER))
+    ChatMessage.objects.bulk_create([
+        ChatMessage(
+            user_id=user, session_id=f'sesion-{user.pk}-{session}', sender='user' if n % 2 == 0 else 'assistant',
+            message_text=_text(rng, 15),
+        )
+        for user in people for session in range(CHAT_SESSIONS_PER_USER) for n in range(per_session)
+    ])
+
+    follows = set()
+    for user in people:
+        for other in rng.sample(people, min(len(people), PER_USER['follows'] + 1)):
+            if other.pk != user.pk and len(follows) < counts['follows']:
+                follows.add((user.pk, other.pk))
+    SeguimientoUsuario.objects.bulk_create([
+        SeguimientoUsuario(seguidor_id_id=seguidor, seguido_id_id=seguido) for seguidor, seguido in sorted(follows)
+    ])
+    reviews = {(user.pk, rng.choice(hosts).pk) for user in guests}
+    ResenaUsuario.objects.bulk_create([
+        ResenaUsuario(usuario_resenador_id_id=autor, usuario_resenado_id_id=resenado, rating=rng.randint(1, 5), comentario=_text(rng, 12))
+        for autor, resenado in sorted(reviews) if autor != resenado
+    ])
+
+    recomendaciones = Recomendacion.objects.bulk_create([
+        Recomendacion(
+            titulo=f'Recomendación {n}', descripcion=_text(rng, 20), tipo=rng.choice(['destino', 'actividad', 'restaurante', 'alojamiento']),
+            rating=round(rng.uniform(3, 5), 2), ubicacion=rng.choice(['Madrid', 'Sevilla', 'Valencia', 'Bilbao']),
+            precio_estimado=Decimal(rng.randrange(10, 200)), is_active=rng.random() > 0.05,
+        )
+        for n in range(counts['recomendaciones'])
+    ])
+    saved = min(PER_USER['saved_recomendaciones'], len(recomendaciones))
+    RecomendacionUsuario.objects.bulk_create([
+        RecomendacionUsuario(user_id=user, recomendacion_id=recomendacion)
+        for user in people for recomendacion in rng.sample(recomendaciones, saved)
+    ])
+    PopularSearch.objects.bulk_create([
+        PopularSearch(search_text=word, times_used=rng.randrange(1, 500)) for word in WORDS
+    ])
+
+    # bulk_create no pasa por usuarios.signals: se recalculan los agregados en bloque
+    recompute_reputation(User, ResenaUsuario)
+    recompute_follow_counts(User, SeguimientoUsuario)
+
+    return {
+        'users': len(created), 'destinations': len(destinations), 'listings': len(listings), 'bookings': len(bookings),
+        'plans': len(plans), 'attractions': len(attractions), 'chat_messages': ChatMessage.objects.count(),
+        'follows': len(follows), 'reviews': ResenaUsuario.objects.count(), 'recomendaciones': len(recomendaciones),
+    }
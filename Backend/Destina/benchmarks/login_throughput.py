@@ -0,0 +1,155 @@
+"""
+Benchmark de login bajo carga concurrente: vista síncrona anterior (DRF, hash
+en el hilo de la petición) frente a la vista async con pool de hashing.
+
+Se sirve todo por el handler ASGI en proceso. Mientras dura la ráfaga de
+logins, una sonda pide /api/categories/ en bucle para medir cuánto se
+bloquean las demás peticiones.
+
+Uso (desde Backend/Destina):
+    python -m benchmarks.login_throughput --logins 32 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Destina.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.hashers import check_password, make_password  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import AsyncClient  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import include, path  # noqa: E402
+from rest_framework.permissions import AllowAny  # noqa: E402
+from rest_framework.response import Response  # noqa: E402
+from rest_framework.status import HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND  # noqa: E402
+from rest_framework.views import APIView  # noqa: E402
+
+from Tablas.models import AuthToken, Category, User  # noqa: E402
+from Tablas.serializers import UserSerializer  # noqa: E402
+
+PASSWORD = 'benchmark-password'
+
+
+class LegacyLoginView(APIView):
+    """LoginView anterior: check_password en el hilo de la petición"""
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        try:
+            user = User.objects.get(email=request.data['email'])
+            if check_password(request.data['password'], user.password_hash):
+                token, created = AuthToken.objects.get_or_create(user_id=user)
+                return Response({'user': UserSerializer(user).data, 'token': token.key})
+            return Response({'error': 'Invalid credentials'}, status=HTTP_400_BAD_REQUEST)
+        except User.DoesNotExist:
+            return Response({'error': 'User not found'}, status=HTTP_404_NOT_FOUND)
+
+
+urlpatterns = [
+    path('legacy/login/', LegacyLoginView.as_view()),
+    path('', include('Destina.urls')),
+]
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(latencies):
+    return {
+        'count': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2) if latencies else None,
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+async def run_scenario(url, emails, concurrency):
+    client = AsyncClient()
+    queue = asyncio.Queue()
+    for email in emails:
+        queue.put_nowait(email)
+    login_latencies = []
+    probe_latencies = []
+    done = asyncio.Event()
+
+    async def worker():
+        while not queue.empty():
+            email = queue.get_nowait()
+            started = time.perf_counter()
+            response = await client.post(
+                url, {'email': email, 'password': PASSWORD}, content_type='application/json'
+            )
+            assert response.status_code == 200, response.content
+            login_latencies.append(time.perf_counter() - started)
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get('/api/categories/')
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.01)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+
+    return {
+        'url': url,
+        'logins': len(emails),
+        'concurrency': concurrency,
+        'elapsed_s': round(elapsed, 3),
+        'logins_per_s': round(len(emails) / elapsed, 2),
+        'login_latency': summarize(login_latencies),
+        'probe_latency': summarize(probe_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--logins', type=int, default=32)
+    parser.add_argument('--concurrency', type=int, default=8)
+    args = parser.parse_args()
+
+    settings.ROOT_URLCONF = __name__
+    settings.ALLOWED_HOSTS = ['*']
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+
+    # Un solo hash para todos los usuarios: crearlos no forma parte de la medida
+    password_hash = make_password(PASSWORD)
+    emails = [f'bench{i}@example.com' for i in range(args.logins)]
+    User.objects.bulk_create([
+        User(email=email, name=email, password_hash=password_hash, role='guest') for email in emails
+    ])
+    Category.objects.create(name='Playa', icon_name='beach', description='')
+
+    results = {
+        'cpu_count': os.cpu_count(),
+        'password_hashing_workers': getattr(settings, 'PASSWORD_HASHING_WORKERS', None),
+        'before': asyncio.run(run_scenario('/legacy/login/', emails, args.concurrency)),
+        'after': asyncio.run(run_scenario('/api/auth/login/', emails, args.concurrency)),
+    }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark de renderers sobre respuestas de ListingListView: JSONRenderer de
+DRF (json de la biblioteca estándar) frente a OrjsonRenderer y
+MessagePackRenderer.
+
+Se generan alojamientos con imágenes en una base de pruebas y se piden
+páginas de distintos tamaños. Para cada página se mide solo el render de los
+mismos datos (sin base de datos ni serializers) y también la petición completa
+negociando el formato con Accept.
+
+Uso (desde Backend/Destina):
+    python -m benchmarks.renderers --listings 500 --repeat 50
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from decimal import Decimal
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Destina.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import setup_test_environment  # noqa: E402
+from django.urls import include, path  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from Tablas.models import Category, Destination, Image, Listing, User  # noqa: E402
+from Tablas.renderers import MessagePackRenderer, OrjsonRenderer  # noqa: E402
+from Tablas.views import ListingListView  # noqa: E402
+
+RENDERERS = {
+    'json': (JSONRenderer, 'application/json'),
+    'orjson': (OrjsonRenderer, 'application/json'),
+    'msgpack': (MessagePackRenderer, 'application/msgpack'),
+}
+
+
+def seed(listings):
+    host = User.objects.create(email='host@example.com', name='Anfitriona', password_hash='x', role='host')
+    destinations = Destination.objects.bulk_create([
+        Destination(name=f'Destino {i}', country='País', description='Descripción del destino. ' * 20, slug=f'destino-{i}')
+        for i in range(20)
+    ])
+    categories = Category.objects.bulk_create([
+        Category(name=f'Categoría {i}', icon_name='icon', description='') for i in range(5)
+    ])
+    created = Listing.objects.bulk_create([
+        Listing(
+            host_id=host, destination_id=destinations[i % len(destinations)],
+            category_id=categories[i % len(categories)], title=f'Alojamiento {i}',
+            description='Apartamento luminoso con vistas, cocina equipada y wifi. ' * 5,
+            price_per_night=Decimal('80.00') + i % 50, rating_avg=(i % 50) / 10,
+        )
+        for i in range(listings)
+    ])
+    Image.objects.bulk_create([
+        Image(listing_id=listing, url=f'https://cdn.example.com/listings/{listing.pk}/{n}.jpg', is_main=n == 0)
+        for listing in created for n in range(4)
+    ])
+
+
+def summarize(latencies):
+    return {
+        'p50_ms': round(statistics.median(latencies) * 1000, 3),
+        'mean_ms': round(statistics.fmean(latencies) * 1000, 3),
+    }
+
+
+def time_interleaved(calls, repeat):
+    """Alterna las variantes en cada vuelta para que el ruido afecte a todas por igual"""
+    latencies = {name: [] for name in calls}
+    for _ in range(repeat):
+        for name, function in calls.items():
+            started = time.perf_counter()
+            function()
+            latencies[name].append(time.perf_counter() - started)
+    return {name: summarize(values) for name, values in latencies.items()}
+
+
+def run_page(page_size, repeat):
+    request = APIRequestFactory().get('/api/listings/', {'page_size': page_size})
+    data = ListingListView.as_view()(request).data
+    client = Client()
+
+    def render(renderer_class, media_type):
+        renderer = renderer_class()
+        return lambda: renderer.render(data, media_type)
+
+    def get(name, media_type):
+        url = f'{LEGACY_URL if name == "json" else "/api/listings/"}?page_size={page_size}'
+        return lambda: client.get(url, HTTP_ACCEPT=media_type)
+
+    render_times = time_interleaved(
+        {name: render(*options) for name, options in RENDERERS.items()}, repeat,
+    )
+    request_times = time_interleaved(
+        {name: get(name, media_type) for name, (_, media_type) in RENDERERS.items()}, repeat,
+    )
+    results = {
+        name: {
+            'bytes': len(renderer_class().render(data, media_type)),
+            'render': render_times[name],
+            'request': request_times[name],
+        }
+        for name, (renderer_class, media_type) in RENDERERS.items()
+    }
+    return {'page_size': page_size, 'rows': len(data['results']), 'renderers': results}
+
+
+class LegacyListingListView(ListingListView):
+    """ListingListView con el JSONRenderer de DRF como único renderer"""
+    renderer_classes = [JSONRenderer]
+
+
+LEGACY_URL = '/legacy/listings/'
+
+urlpatterns = [
+    path(LEGACY_URL.strip('/') + '/', LegacyListingListView.as_view()),
+    path('', include('Destina.urls')),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--listings', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--page-sizes', default='50,500')
+    args = parser.parse_args()
+
+    settings.ROOT_URLCONF = __name__
+    settings.ALLOWED_HOSTS = ['*']
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    seed(args.listings)
+
+    results = {
+        'listings': args.listings,
+        'repeat': args.repeat,
+        'pages': [run_page(int(size), args.repeat) for size in args.page_sizes.split(',')],
+    }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmark de concurrencia sobre SQLite: configuración anterior (journal
+DELETE, transacciones DEFERRED, timeout de 5 s) frente al perfil de
+producción de settings.DATABASES (WAL, pragmas, BEGIN IMMEDIATE y cola de
+escritura), con y sin la cola.
+
+Para cada perfil se crea una base temporal y se lanzan --processes procesos
+con --threads hilos cada uno. Cada hilo, durante --duration segundos, mezcla
+reservas por CreateBookingView (lee disponibilidad y escribe en la misma
+transacción), volcados de búsquedas populares (escritura por lotes) y
+lecturas del listado de alojamientos. Se cuentan los errores "database is
+locked" y las latencias de escritura y lectura.
+
+Uso (desde Backend/Destina):
+    python -m benchmarks.sqlite_concurrency --processes 4 --threads 8 --duration 10
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Destina.settings')
+
+PROFILES = ('anterior', 'produccion-sin-cola', 'produccion')
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LISTINGS = 200
+
+
+def configure(profile, database):
+    """Ajusta settings.DATABASES al perfil antes de django.setup()"""
+    from django.conf import settings
+    default = dict(settings.DATABASES['default'], NAME=database)
+    if profile == 'anterior':
+        default = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': database}
+    elif profile == 'produccion-sin-cola':
+        default['OPTIONS'] = dict(default['OPTIONS'], serialize_writes=False)
+    settings.DATABASES['default'] = default
+    settings.DEBUG = False
+    # Cada búsqueda registrada se vuelca en el momento: una escritura por operación
+    settings.SEARCH_STATS_FLUSH_INTERVAL = 0
+
+    import django
+    django.setup()
+
+
+def seed():
+    from Tablas.models import Category, Destination, Listing, User
+
+    host = User.objects.create(email='host@example.com', name='Anfitriona', password_hash='x', role='host')
+    destination = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+    category = Category.objects.create(name='Categoría', icon_name='icon', description='')
+    Listing.objects.bulk_create([
+        Listing(
+            host_id=host, destination_id=destination, category_id=category, title=f'Alojamiento {i}',
+            description='', price_per_night=Decimal('80.00'),
+        )
+        for i in range(LISTINGS)
+    ])
+    User.objects.bulk_create([
+        User(email=f'guest{i}@example.com', name=f'guest{i}', password_hash='x', role='guest') for i in range(64)
+    ])
+
+
+def is_lock_error(message):
+    return 'locked' in str(message)
+
+
+def run_thread(index, duration, results):
+    from django.db import DatabaseError, connection
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from Tablas.models import Listing, User
+    from Tablas.popular_searches import search_hits
+    from Tablas.views import CreateBookingView
+
+    rng = random.Random(os.getpid() * 1000 + index)
+    factory = APIRequestFactory()
+    booking_view = CreateBookingView.as_view()
+    user = User.objects.filter(role='guest')[index % 64]
+    counts = {'bookings': 0, 'conflicts': 0, 'search_flushes': 0, 'reads': 0, 'lock_errors': 0, 'other_errors': 0}
+    write_latencies, read_latencies = [], []
+    deadline = time.perf_counter() + duration
+
+    while time.perf_counter() < deadline:
+        operation = rng.random()
+        started = time.perf_counter()
+        try:
+            if operation < 0.4:
+                start = date(2027, 1, 1) + timedelta(days=rng.randrange(3000))
+                request = factory.post('/api/bookings/create/', {
+                    'listing_id': rng.randrange(1, LISTINGS + 1), 'start_date': start.isoformat(),
+                    'end_date': (start + timedelta(days=2)).isoformat(), 'total_price': '160.00',
+                }, format='json')
+                force_authenticate(request, user=user)
+                response = booking_view(request)
+                if response.status_code == 201:
+                    counts['bookings'] += 1
+                elif response.status_code == 409:
+                    counts['conflicts'] += 1
+                elif is_lock_error(response.data.get('error')):
+                    counts['lock_errors'] += 1
+                else:
+                    counts['other_errors'] += 1
+                write_latencies.append(time.perf_counter() - started)
+            elif operation < 0.6:
+                search_hits.record(f'búsqueda {rng.randrange(50)}')
+                counts['search_flushes'] += 1
+                write_latencies.append(time.perf_counter() - started)
+            else:
+                list(Listing.objects.filter(is_active=True).order_by('-created_at')[:50])
+                counts['reads'] += 1
+                read_latencies.append(time.perf_counter() - started)
+        except DatabaseError as exc:
+            counts['lock_errors' if is_lock_error(exc) else 'other_errors'] += 1
+    connection.close()
+    results.append((counts, write_latencies, read_latencies))
+
+
+def worker(profile, database, threads, duration):
+    configure(profile, database)
+    results = []
+    pool = [threading.Thread(target=run_thread, args=(index, duration, results)) for index in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    counts = {}
+    write_latencies, read_latencies = [], []
+    for thread_counts, writes, reads in results:
+        for name, value in thread_counts.items():
+            counts[name] = counts.get(name, 0) + value
+        write_latencies.extend(writes)
+        read_latencies.extend(reads)
+    json.dump({'counts': counts, 'writes': write_latencies, 'reads': read_latencies}, sys.stdout)
+
+
+def summarize(latencies):
+    if not latencies:
+        return None
+    ordered = sorted(latencies)
+    return {
+        'count': len(ordered),
+        'p50_ms': round(statistics.median(ordered) * 1000, 2),
+        'p99_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000, 2),
+        'max_ms': round(ordered[-1] * 1000, 2),
+    }
+
+
+def run_profile(profile, directory, args):
+    database = os.path.join(directory, f'{profile}.sqlite3')
+    base = [sys.executable, '-m', 'benchmarks.sqlite_concurrency']
+    subprocess.run(base + ['setup', '--profile', profile, '--db', database], cwd=PROJECT_DIR, check=True)
+    command = base + [
+        'worker', '--profile', profile, '--db', database,
+        '--threads', str(args.threads), '--duration', str(args.duration),
+    ]
+    processes = [subprocess.Popen(command, stdout=subprocess.PIPE, cwd=PROJECT_DIR) for _ in range(args.processes)]
+    counts = {}
+    write_latencies, read_latencies = [], []
+    for process in processes:
+        output, _ = process.communicate()
+        result = json.loads(output)
+        for name, value in result['counts'].items():
+            counts[name] = counts.get(name, 0) + value
+        write_latencies.extend(result['writes'])
+        read_latencies.extend(result['reads'])
+    return {
+        'counts': counts,
+        'writes_per_s': round((counts['bookings'] + counts['conflicts'] + counts['search_flushes']) / args.duration, 1),
+        'write_latency': summarize(write_latencies),
+        'read_latency': summarize(read_latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', nargs='?', default='run', choices=['run', 'setup', 'worker'])
+    parser.add_argument('--profile', choices=PROFILES)
+    parser.add_argument('--db')
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--profiles', default=','.join(PROFILES))
+    args = parser.parse_args()
+
+    if args.command == 'setup':
+        configure(args.profile, args.db)
+        from django.core.management import call_command
+        call_command('migrate', verbosity=0)
+        seed()
+        return
+    if args.command == 'worker':
+        worker(args.profile, args.db, args.threads, args.duration)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        results = {
+            'cpu_count': os.cpu_count(),
+            'processes': args.processes,
+            'threads': args.threads,
+            'duration_s': args.duration,
+            'profiles': {profile: run_profile(profile, directory, args) for profile in args.profiles.split(',')},
+        }
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
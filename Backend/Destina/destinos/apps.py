@@ -5,3 +5,5 @@ class DestinosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'destinos'
 
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,162 @@
+import math
+
+from django.db import connections
+
+# Índice espacial de atracciones (SQLite R*Tree) mantenido con triggers.
+# Cada atracción con coordenadas es un "rectángulo" degenerado (un punto); las
+# búsquedas por radio consultan primero la caja que contiene el círculo y solo
+# calculan la distancia exacta para esos candidatos.
+
+GEO_TABLE = 'atraccion_geo'
+
+EARTH_RADIUS_KM = 6371.0088
+
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+INITIAL_RADIUS_KM = 1.0
+
+CREATE_INDEX_SQL = f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {GEO_TABLE} USING rtree(
+    id, min_lat, max_lat, min_lon, max_lon
+)
+"""
+
+_INDEX_ATRACCION_SQL = f"""
+    INSERT INTO {GEO_TABLE}(id, min_lat, max_lat, min_lon, max_lon)
+    SELECT NEW.atraccion_id, CAST(NEW.latitud AS REAL), CAST(NEW.latitud AS REAL),
+           CAST(NEW.longitud AS REAL), CAST(NEW.longitud AS REAL)
+    WHERE NEW.latitud IS NOT NULL AND NEW.longitud IS NOT NULL;
+"""
+
+CREATE_TRIGGERS_SQL = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS atraccion_geo_ai AFTER INSERT ON atraccion_destino BEGIN
+        {_INDEX_ATRACCION_SQL}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS atraccion_geo_ad AFTER DELETE ON atraccion_destino BEGIN
+        DELETE FROM {GEO_TABLE} WHERE id = OLD.atraccion_id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS atraccion_geo_au
+    AFTER UPDATE OF latitud, longitud ON atraccion_destino BEGIN
+        DELETE FROM {GEO_TABLE} WHERE id = OLD.atraccion_id;
+        {_INDEX_ATRACCION_SQL}
+    END
+    """,
+]
+
+REBUILD_INDEX_SQL = f"""
+INSERT INTO {GEO_TABLE}(id, min_lat, max_lat, min_lon, max_lon)
+SELECT atraccion_id, CAST(latitud AS REAL), CAST(latitud AS REAL),
+       CAST(longitud AS REAL), CAST(longitud AS REAL)
+FROM atraccion_destino
+WHERE latitud IS NOT NULL AND longitud IS NOT NULL
+"""
+
+DROP_INDEX_SQL = [
+    'DROP TRIGGER IF EXISTS atraccion_geo_ai',
+    'DROP TRIGGER IF EXISTS atraccion_geo_ad',
+    'DROP TRIGGER IF EXISTS atraccion_geo_au',
+    f'DROP TABLE IF EXISTS {GEO_TABLE}',
+]
+
+
+def install_geo_triggers(apps, schema_editor):
+    """
+    Crea los triggers de sincronización. Las migraciones que reconstruyan la
+    tabla atraccion_destino en SQLite deben volver a llamarla.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in CREATE_TRIGGERS_SQL:
+        schema_editor.execute(statement)
+
+
+def create_geo_index(apps, schema_editor):
+    """Crea la tabla R*Tree, sus triggers y la llena con las atracciones existentes"""
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(CREATE_INDEX_SQL)
+    install_geo_triggers(apps, schema_editor)
+    schema_editor.execute(f'DELETE FROM {GEO_TABLE}')
+    schema_editor.execute(REBUILD_INDEX_SQL)
+
+
+def drop_geo_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for statement in DROP_INDEX_SQL:
+        schema_editor.execute(statement)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_boxes(lat, lon, km):
+    """
+    Cajas (min_lat, max_lat, min_lon, max_lon) que contienen el círculo de
+    radio `km`. Si la caja cruza el antimeridiano se parte en dos.
+    """
+    delta_lat = km / KM_PER_DEGREE_LAT
+    min_lat, max_lat = max(lat - delta_lat, -90.0), min(lat + delta_lat, 90.0)
+
+    # Cerca de los polos el círculo cubre todas las longitudes
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    if cos_lat <= 0 or km / (KM_PER_DEGREE_LAT * cos_lat) >= 180:
+        return [(min_lat, max_lat, -180.0, 180.0)]
+
+    delta_lon = km / (KM_PER_DEGREE_LAT * cos_lat)
+    min_lon, max_lon = lon - delta_lon, lon + delta_lon
+    if min_lon < -180:
+        return [(min_lat, max_lat, min_lon + 360, 180.0), (min_lat, max_lat, -180.0, max_lon)]
+    if max_lon > 180:
+        return [(min_lat, max_lat, min_lon, 180.0), (min_lat, max_lat, -180.0, max_lon - 360)]
+    return [(min_lat, max_lat, min_lon, max_lon)]
+
+
+def _candidates(queryset, lat, lon, km):
+    """(distancia, id) de las filas del queryset a menos de `km`, usando el índice para la caja"""
+    sqlite = connections[queryset.db].vendor == 'sqlite'
+    seen = {}
+    for min_lat, max_lat, min_lon, max_lon in bounding_boxes(lat, lon, km):
+        if sqlite:
+            box = queryset.filter(
+                ubicacion__min_lat__lte=max_lat, ubicacion__max_lat__gte=min_lat,
+                ubicacion__min_lon__lte=max_lon, ubicacion__max_lon__gte=min_lon,
+            )
+        else:
+            box = queryset.filter(
+                latitud__gte=min_lat, latitud__lte=max_lat,
+                longitud__gte=min_lon, longitud__lte=max_lon,
+            )
+        for pk, point_lat, point_lon in box.values_list('pk', 'latitud', 'longitud'):
+            distance = haversine_km(lat, lon, float(point_lat), float(point_lon))
+            if distance <= km:
+                seen[pk] = distance
+    return [(distance, pk) for pk, distance in seen.items()]
+
+
+def nearest(queryset, lat, lon, limit, max_km):
+    """
+    Los `limit` puntos más cercanos a menos de `max_km`, como lista de
+    (distancia_km, pk). El radio crece desde INITIAL_RADIUS_KM hasta reunir
+    suficientes candidatos: cualquier punto fuera del radio está más lejos que
+    los de dentro, así que el resultado es exacto.
+    """
+    radius = min(INITIAL_RADIUS_KM, max_km)
+    while True:
+        found = _candidates(queryset, lat, lon, radius)
+        if len(found) >= limit or radius >= max_km:
+            break
+        radius = min(radius * 4, max_km)
+    found.sort()
+    return found[:limit]
@@ -0,0 +1,209 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError, transaction
+
+from Tablas.models import Destination
+from Tablas.response_cache import invalidate
+from destinos.models import AtraccionDestino, ClimaDestino
+
+
+def read_rows(path, file_format):
+    """Lee el archivo fila a fila (sin cargarlo entero en memoria)"""
+    with open(path, newline='', encoding='utf-8') as handle:
+        if file_format == 'csv':
+            for line_number, row in enumerate(csv.DictReader(handle), start=2):
+                yield line_number, row
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield line_number, json.loads(line)
+                except ValueError as e:
+                    yield line_number, e
+
+
+class CatalogImporter:
+    """Convierte filas en instancias validadas y las escribe por lotes"""
+    model = None
+    fields = ()
+    required = ()
+    # Clave natural del upsert: volver a importar un archivo actualiza las filas en vez de duplicarlas
+    unique_fields = ()
+
+    def __init__(self):
+        self.touched_destinations = set()
+
+    def build(self, row):
+        missing = [name for name in self.required if row.get(name) in (None, '')]
+        if missing:
+            raise ValidationError(f"Faltan campos: {', '.join(missing)}")
+
+        instance = self.model()
+        for name in self.fields:
+            if name not in row:
+                continue
+            field = self.model._meta.get_field(name)
+            value = row[name]
+            if value == '' and field.null:
+                value = None
+            elif isinstance(value, float):
+                # Los números de JSONL llegan como float: DecimalField.to_python los
+                # convertiría con max_digits de precisión (40.41 -> 40.4100000)
+                value = str(value)
+            setattr(instance, field.attname, field.to_python(value))
+        self.resolve_relations(instance, row)
+        instance.clean_fields(exclude=self.excluded_from_validation())
+        return instance
+
+    def resolve_relations(self, instance, row):
+        pass
+
+    def excluded_from_validation(self):
+        return []
+
+    def write(self, batch):
+        self.model.objects.bulk_create(
+            batch, update_conflicts=True, unique_fields=self.unique_fields,
+            update_fields=[name for name in self.fields if name not in self.unique_fields],
+        )
+
+    def invalidate_cache(self):
+        pass
+
+
+class DestinoFKMixin:
+    """Resuelve `destino_slug` a destination_id con un mapa en memoria cargado una sola vez"""
+
+    def __init__(self):
+        super().__init__()
+        self.slugs = dict(Destination.objects.values_list('slug', 'destination_id'))
+
+    def resolve_relations(self, instance, row):
+        slug = row.get('destino_slug')
+        try:
+            instance.destino_id_id = self.slugs[slug]
+        except KeyError:
+            raise ValidationError(f'Destino desconocido: {slug!r}')
+        self.touched_destinations.add(instance.destino_id_id)
+
+    def excluded_from_validation(self):
+        return ['destino_id']
+
+
+class DestinoImporter(CatalogImporter):
+    model = Destination
+    fields = ('name', 'country', 'description', 'slug')
+    required = fields
+    unique_fields = ('slug',)
+
+    def write(self, batch):
+        super().write(batch)
+        self.touched_destinations.update(destination.pk for destination in batch if destination.pk)
+
+    def invalidate_cache(self):
+        # Clima y galería incluyen el destino serializado
+        invalidate('destinations', *[f'destination:{pk}' for pk in self.touched_destinations])
+
+
+class AtraccionImporter(DestinoFKMixin, CatalogImporter):
+    model = AtraccionDestino
+    fields = (
+        'nombre', 'descripcion', 'categoria', 'latitud', 'longitud', 'imagen_url',
+        'precio_entrada', 'horario_apertura', 'horario_cierre', 'rating_promedio', 'is_active',
+    )
+    required = ('destino_slug', 'nombre', 'descripcion', 'categoria')
+    unique_fields = ('destino_id', 'nombre')
+
+
+class ClimaImporter(DestinoFKMixin, CatalogImporter):
+    model = ClimaDestino
+    fields = (
+        'mes', 'temperatura_promedio', 'temperatura_min', 'temperatura_max',
+        'dias_lluvia', 'descripcion',
+    )
+    required = ('destino_slug', 'mes', 'temperatura_promedio', 'temperatura_min', 'temperatura_max')
+    unique_fields = ('destino_id', 'mes')
+
+    def invalidate_cache(self):
+        invalidate(*[f'destination:{pk}:clima' for pk in self.touched_destinations])
+
+
+IMPORTERS = {
+    'destinos': DestinoImporter,
+    'atracciones': AtraccionImporter,
+    'clima': ClimaImporter,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Importa destinos, atracciones o clima desde CSV/JSONL con escrituras por lotes. '
+        'Las filas existentes (mismo slug, destino y nombre, o destino y mes) se actualizan'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tipo', choices=sorted(IMPORTERS))
+        parser.add_argument('archivo')
+        parser.add_argument('--formato', choices=['csv', 'jsonl'], help='Por defecto, según la extensión')
+        parser.add_argument('--lote', type=int, default=2000, help='Filas por transacción')
+        parser.add_argument('--max-errores', type=int, default=20, help='Errores a mostrar')
+
+    def handle(self, *args, **options):
+        path = Path(options['archivo'])
+        if not path.exists():
+            raise CommandError(f'No existe el archivo {path}')
+        file_format = options['formato'] or ('csv' if path.suffix.lower() == '.csv' else 'jsonl')
+        batch_size = options['lote']
+        if batch_size <= 0:
+            raise CommandError('--lote debe ser mayor que 0')
+
+        importer = IMPORTERS[options['tipo']]()
+        self.max_errors = options['max_errores']
+        self.errors = 0
+        imported = 0
+        batch = []
+
+        for line_number, row in read_rows(path, file_format):
+            try:
+                if isinstance(row, Exception):
+                    raise ValidationError(str(row))
+                if not isinstance(row, dict):
+                    raise ValidationError('Cada fila debe ser un objeto')
+                batch.append(importer.build(row))
+            except (ValidationError, ValueError, TypeError) as e:
+                self.report_error(line_number, e)
+                continue
+
+            if len(batch) >= batch_size:
+                imported += self.write_batch(importer, batch)
+                batch = []
+
+        if batch:
+            imported += self.write_batch(importer, batch)
+
+        importer.invalidate_cache()
+        self.stdout.write(self.style.SUCCESS(
+            f'{imported} filas importadas en {path.name}, {self.errors} con errores'
+        ))
+
+    def write_batch(self, importer, batch):
+        try:
+            with transaction.atomic():
+                importer.write(batch)
+        except DatabaseError as e:
+            self.errors += len(batch)
+            self.stderr.write(f'Lote de {len(batch)} filas descartado: {e}')
+            return 0
+        return len(batch)
+
+    def report_error(self, line_number, error):
+        self.errors += 1
+        if self.errors <= self.max_errors:
+            messages = error.messages if isinstance(error, ValidationError) else [str(error)]
+            self.stderr.write(f"Línea {line_number}: {'; '.join(messages)}")
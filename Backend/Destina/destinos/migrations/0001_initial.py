@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:52
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('Tablas', '0002_booking_category_chatmessage_destination_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AtraccionDestino',
+            fields=[
+                ('atraccion_id', models.AutoField(primary_key=True, serialize=False)),
+                ('nombre', models.CharField(max_length=200)),
+                ('descripcion', models.TextField()),
+                ('categoria', models.CharField(choices=[('monumento', 'Monumento'), ('museo', 'Museo'), ('naturaleza', 'Naturaleza'), ('playa', 'Playa'), ('gastronomia', 'Gastronomía'), ('entretenimiento', 'Entretenimiento'), ('cultura', 'Cultura'), ('deporte', 'Deporte')], max_length=20)),
+                ('latitud', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('longitud', models.DecimalField(blank=True, decimal_places=6, max_digits=9, null=True)),
+                ('imagen_url', models.CharField(blank=True, max_length=500, null=True)),
+                ('precio_entrada', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('horario_apertura', models.TimeField(blank=True, null=True)),
+                ('horario_cierre', models.TimeField(blank=True, null=True)),
+                ('rating_promedio', models.FloatField(default=0.0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)])),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('destino_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='atracciones', to='Tablas.destination')),
+            ],
+            options={
+                'verbose_name_plural': 'atracciones_destino',
+                'db_table': 'atraccion_destino',
+            },
+        ),
+        migrations.CreateModel(
+            name='GaleriaDestino',
+            fields=[
+                ('galeria_id', models.AutoField(primary_key=True, serialize=False)),
+                ('imagen_url', models.CharField(max_length=500)),
+                ('descripcion', models.CharField(blank=True, max_length=300, null=True)),
+                ('is_principal', models.BooleanField(default=False)),
+                ('orden', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('destino_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='galeria', to='Tablas.destination')),
+            ],
+            options={
+                'db_table': 'galeria_destino',
+                'ordering': ['is_principal', 'orden'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ClimaDestino',
+            fields=[
+                ('clima_id', models.AutoField(primary_key=True, serialize=False)),
+                ('mes', models.IntegerField(choices=[(1, 'Enero'), (2, 'Febrero'), (3, 'Marzo'), (4, 'Abril'), (5, 'Mayo'), (6, 'Junio'), (7, 'Julio'), (8, 'Agosto'), (9, 'Septiembre'), (10, 'Octubre'), (11, 'Noviembre'), (12, 'Diciembre')])),
+                ('temperatura_promedio', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('temperatura_min', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('temperatura_max', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('dias_lluvia', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(31)])),
+                ('descripcion', models.CharField(blank=True, max_length=200, null=True)),
+                ('destino_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='clima', to='Tablas.destination')),
+            ],
+            options={
+                'db_table': 'clima_destino',
+                'ordering': ['mes'],
+                'unique_together': {('destino_id', 'mes')},
+            },
+        ),
+    ]
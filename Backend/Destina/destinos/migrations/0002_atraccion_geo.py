@@ -0,0 +1,30 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:59
+
+import django.db.models.deletion
+import destinos.geo
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('destinos', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AtraccionUbicacion',
+            fields=[
+                ('atraccion_id', models.OneToOneField(db_column='id', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='ubicacion', serialize=False, to='destinos.atracciondestino')),
+                ('min_lat', models.FloatField()),
+                ('max_lat', models.FloatField()),
+                ('min_lon', models.FloatField()),
+                ('max_lon', models.FloatField()),
+            ],
+            options={
+                'db_table': 'atraccion_geo',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(destinos.geo.create_geo_index, destinos.geo.drop_geo_index),
+    ]
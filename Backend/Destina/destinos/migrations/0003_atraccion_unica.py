@@ -0,0 +1,31 @@
+# Generated by Django 5.2.5 on 2026-10-18 14:05
+
+from django.db import migrations
+
+
+def remove_duplicate_atracciones(apps, schema_editor):
+    """Deja una atracción por (destino, nombre): la más reciente, la de la última importación"""
+    AtraccionDestino = apps.get_model('destinos', 'AtraccionDestino')
+    seen = set()
+    for atraccion in AtraccionDestino.objects.order_by('-atraccion_id'):
+        key = (atraccion.destino_id_id, atraccion.nombre)
+        if key in seen:
+            atraccion.delete()
+        else:
+            seen.add(key)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0010_hot_path_indexes'),
+        ('destinos', '0002_atraccion_geo'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_atracciones, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='atracciondestino',
+            unique_together={('destino_id', 'nombre')},
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
+from .geo import GEO_TABLE
 
 # Atracción del Destino Model
 class AtraccionDestino(models.Model):
@@ -35,6 +36,23 @@ class AtraccionDestino(models.Model):
     class Meta:
         db_table = 'atraccion_destino'
         verbose_name_plural = 'atracciones_destino'
+        unique_together = ['destino_id', 'nombre']
+
+
+# Índice espacial de atracciones (tabla virtual R*Tree, mantenida por triggers)
+class AtraccionUbicacion(models.Model):
+    atraccion_id = models.OneToOneField(
+        AtraccionDestino, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='id', related_name='ubicacion'
+    )
+    min_lat = models.FloatField()
+    max_lat = models.FloatField()
+    min_lon = models.FloatField()
+    max_lon = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = GEO_TABLE
 
 
 # Galería de Imágenes del Destino Model
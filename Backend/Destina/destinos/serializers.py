@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import AtraccionDestino, GaleriaDestino, ClimaDestino
 from Tablas.serializers import DestinationSerializer
+from Tablas.sparse_fields import SparseModelSerializer
 
 
-class AtraccionDestinoSerializer(serializers.ModelSerializer):
+class AtraccionDestinoSerializer(SparseModelSerializer):
     destino_id = DestinationSerializer(read_only=True)
     
     class Meta:
@@ -17,7 +18,14 @@ class AtraccionDestinoSerializer(serializers.ModelSerializer):
         read_only_fields = ['atraccion_id', 'created_at']
 
 
-class GaleriaDestinoSerializer(serializers.ModelSerializer):
+class AtraccionCercanaSerializer(AtraccionDestinoSerializer):
+    distancia_km = serializers.FloatField(read_only=True)
+    
+    class Meta(AtraccionDestinoSerializer.Meta):
+        fields = AtraccionDestinoSerializer.Meta.fields + ['distancia_km']
+
+
+class GaleriaDestinoSerializer(SparseModelSerializer):
     destino_id = DestinationSerializer(read_only=True)
     
     class Meta:
@@ -29,7 +37,7 @@ class GaleriaDestinoSerializer(serializers.ModelSerializer):
         read_only_fields = ['galeria_id', 'created_at']
 
 
-class ClimaDestinoSerializer(serializers.ModelSerializer):
+class ClimaDestinoSerializer(SparseModelSerializer):
     destino_id = DestinationSerializer(read_only=True)
     mes_nombre = serializers.CharField(source='get_mes_display', read_only=True)
     
@@ -0,0 +1,15 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from Tablas.response_cache import invalidate
+from .models import ClimaDestino, GaleriaDestino
+
+
+@receiver([post_save, post_delete], sender=ClimaDestino)
+def invalidate_clima_cache(sender, instance, **kwargs):
+    invalidate(f'destination:{instance.destino_id_id}:clima')
+
+
+@receiver([post_save, post_delete], sender=GaleriaDestino)
+def invalidate_galeria_cache(sender, instance, **kwargs):
+    invalidate(f'destination:{instance.destino_id_id}:galeria')
@@ -1,4 +1,207 @@
+import json
+import os
+import tempfile
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from Tablas.models import Destination
+
+from .models import AtraccionDestino, AtraccionUbicacion, ClimaDestino, GaleriaDestino
+
+CERCANAS = '/api/destinos/atracciones/cerca/'
+
+
+class AtraccionesCercanasTests(TestCase):
+    """Búsqueda por radio y k vecinos sobre el índice R*Tree"""
+
+    @classmethod
+    def setUpTestData(cls):
+        destino = Destination.objects.create(name='Madrid', country='España', description='', slug='madrid')
+
+        def atraccion(nombre, lat, lon, categoria='museo', is_active=True):
+            return AtraccionDestino.objects.create(
+                destino_id=destino, nombre=nombre, descripcion='', categoria=categoria,
+                latitud=Decimal(lat), longitud=Decimal(lon), is_active=is_active,
+            )
+
+        # Distancias aproximadas desde la Puerta del Sol (40.4168, -3.7038)
+        cls.prado = atraccion('Prado', '40.413800', '-3.692100')            # ~1 km
+        cls.retiro = atraccion('Retiro', '40.415300', '-3.684500', 'naturaleza')  # ~1.7 km
+        cls.escorial = atraccion('Escorial', '40.589000', '-4.147900')      # ~42 km
+        cls.toledo = atraccion('Toledo', '39.862800', '-4.027300')          # ~68 km
+        atraccion('Cerrada', '40.416900', '-3.703900', is_active=False)
+
+    def cercanas(self, query):
+        response = self.client.get(f'{CERCANAS}?{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_radio(self):
+        resultado = self.cercanas('lat=40.4168&lon=-3.7038&km=50')
+        self.assertEqual([a['atraccion_id'] for a in resultado], [self.prado.pk, self.retiro.pk, self.escorial.pk])
+        distancias = [a['distancia_km'] for a in resultado]
+        self.assertEqual(distancias, sorted(distancias))
+        self.assertLess(distancias[-1], 50)
+
+    def test_k_vecinos(self):
+        resultado = self.cercanas('lat=40.4168&lon=-3.7038&k=2')
+        self.assertEqual([a['atraccion_id'] for a in resultado], [self.prado.pk, self.retiro.pk])
+
+    def test_k_vecinos_fuera_del_radio_inicial(self):
+        resultado = self.cercanas('lat=40.4168&lon=-3.7038&k=4')
+        self.assertEqual(resultado[-1]['atraccion_id'], self.toledo.pk)
+
+    def test_categoria(self):
+        resultado = self.cercanas('lat=40.4168&lon=-3.7038&km=50&categoria=naturaleza')
+        self.assertEqual([a['atraccion_id'] for a in resultado], [self.retiro.pk])
+
+    def test_parametros_no_finitos(self):
+        for query in ('lat=48&lon=2&km=nan', 'lat=48&lon=2&km=inf', 'lat=nan&lon=2', 'lat=48&lon=-inf'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'{CERCANAS}?{query}').status_code, 400)
+
+    def test_parametros_invalidos(self):
+        for query in ('lon=2', 'lat=48&lon=2&km=0', 'lat=91&lon=2', 'lat=48&lon=2&k=-1'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'{CERCANAS}?{query}').status_code, 400)
+
+
+class ImportarCatalogoTests(TestCase):
+    """importar_catalogo: conversión de tipos, upserts y filas con errores"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.destino = Destination.objects.create(name='Madrid', country='España', description='', slug='madrid')
+
+    def importar(self, tipo, nombre, contenido):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, nombre)
+        with open(path, 'w', encoding='utf-8') as handle:
+            handle.write(contenido)
+        stdout, stderr = StringIO(), StringIO()
+        call_command('importar_catalogo', tipo, path, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def jsonl(self, *rows):
+        return '\n'.join(json.dumps(row) for row in rows) + '\n'
+
+    def test_jsonl_con_decimales_sin_comillas(self):
+        stdout, stderr = self.importar('atracciones', 'atracciones.jsonl', self.jsonl({
+            'destino_slug': 'madrid', 'nombre': 'Prado', 'descripcion': 'Museo', 'categoria': 'museo',
+            'latitud': 40.41, 'longitud': -3.6921, 'precio_entrada': 15.5, 'rating_promedio': 4.7,
+        }))
+        self.assertEqual(stderr, '')
+        atraccion = AtraccionDestino.objects.get(nombre='Prado')
+        self.assertEqual(atraccion.latitud, Decimal('40.41'))
+        self.assertEqual(atraccion.longitud, Decimal('-3.6921'))
+        self.assertEqual(atraccion.precio_entrada, Decimal('15.5'))
+        self.assertEqual(atraccion.rating_promedio, 4.7)
+
+    def test_clima_upsert_por_destino_y_mes(self):
+        fila = {'destino_slug': 'madrid', 'mes': 7, 'temperatura_promedio': 25.5, 'temperatura_min': 18.2, 'temperatura_max': 34.9}
+        self.importar('clima', 'clima.jsonl', self.jsonl(fila))
+        self.importar('clima', 'clima.jsonl', self.jsonl(dict(fila, temperatura_max=36.1, dias_lluvia=2)))
+        clima = ClimaDestino.objects.get(destino_id=self.destino, mes=7)
+        self.assertEqual(ClimaDestino.objects.count(), 1)
+        self.assertEqual(clima.temperatura_max, Decimal('36.1'))
+        self.assertEqual(clima.dias_lluvia, 2)
+
+    def test_atracciones_reimportadas_se_actualizan(self):
+        filas = [
+            {'destino_slug': 'madrid', 'nombre': 'Prado', 'descripcion': 'Museo', 'categoria': 'museo', 'latitud': 40.41, 'longitud': -3.69},
+            {'destino_slug': 'madrid', 'nombre': 'Retiro', 'descripcion': 'Parque', 'categoria': 'naturaleza'},
+        ]
+        self.importar('atracciones', 'atracciones.jsonl', self.jsonl(*filas))
+        prado = AtraccionDestino.objects.get(nombre='Prado')
+        stdout, stderr = self.importar('atracciones', 'atracciones.jsonl', self.jsonl(
+            dict(filas[0], descripcion='Pinacoteca', latitud=40.4138),
+            filas[1],
+        ))
+        self.assertEqual(stderr, '')
+        self.assertIn('2 filas importadas', stdout)
+        self.assertEqual(AtraccionDestino.objects.count(), 2)
+        prado_actualizado = AtraccionDestino.objects.get(nombre='Prado')
+        self.assertEqual(prado_actualizado.pk, prado.pk)
+        self.assertEqual(prado_actualizado.descripcion, 'Pinacoteca')
+        # El índice espacial sigue la coordenada actualizada
+        self.assertAlmostEqual(AtraccionUbicacion.objects.get(atraccion_id=prado).min_lat, 40.4138, places=4)
+
+    def test_destinos_upsert_por_slug_desde_csv(self):
+        self.importar('destinos', 'destinos.csv', 'name,country,description,slug\nMadrid centro,España,Capital,madrid\nSevilla,España,Sur,sevilla\n')
+        self.assertEqual(Destination.objects.count(), 2)
+        self.assertEqual(Destination.objects.get(slug='madrid').name, 'Madrid centro')
+
+    def test_filas_con_errores(self):
+        stdout, stderr = self.importar('atracciones', 'atracciones.jsonl', self.jsonl(
+            {'destino_slug': 'madrid', 'nombre': 'Retiro', 'descripcion': 'Parque', 'categoria': 'naturaleza', 'latitud': 40.4153},
+            {'destino_slug': 'lisboa', 'nombre': 'Belém', 'descripcion': 'Torre', 'categoria': 'monumento'},
+            {'destino_slug': 'madrid', 'nombre': 'Sol', 'descripcion': 'Plaza', 'categoria': 'museo', 'latitud': 40.1234567},
+            ['no es un objeto'],
+        ))
+        self.assertIn('1 filas importadas', stdout)
+        self.assertIn('3 con errores', stdout)
+        self.assertEqual(list(AtraccionDestino.objects.values_list('nombre', flat=True)), ['Retiro'])
+
+
+class SideloadTests(TestCase):
+    """?sideload=1: el destino sale una sola vez en `included` y las filas llevan solo su id"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.destino = Destination.objects.create(name='Madrid', country='España', description='Capital', slug='madrid')
+        otro = Destination.objects.create(name='Sevilla', country='España', description='Sur', slug='sevilla')
+        for destino in (cls.destino, otro):
+            GaleriaDestino.objects.bulk_create([
+                GaleriaDestino(destino_id=destino, imagen_url=f'https://example.com/{destino.slug}-{i}.jpg', orden=i)
+                for i in range(3)
+            ])
+            ClimaDestino.objects.bulk_create([
+                ClimaDestino(
+                    destino_id=destino, mes=mes, temperatura_promedio=Decimal('20.00'),
+                    temperatura_min=Decimal('10.00'), temperatura_max=Decimal('30.00'),
+                )
+                for mes in (1, 7, 12)
+            ])
+            AtraccionDestino.objects.bulk_create([
+                AtraccionDestino(destino_id=destino, nombre=f'{destino.name} {i}', descripcion='', categoria='museo')
+                for i in range(2)
+            ])
+
+    def get(self, path, query):
+        response = self.client.get(f'/api/destinos/{self.destino.pk}/{path}/?{query}')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_included_destination(self):
+        key = str(self.destino.pk)
+        for path, rows in (('galeria', 3), ('clima', 3), ('atracciones', 2)):
+            with self.subTest(path=path):
+                data = self.get(path, 'sideload=1')
+                self.assertEqual(set(data), {'results', 'included'})
+                self.assertEqual(len(data['results']), rows)
+                self.assertEqual({row['destino_id'] for row in data['results']}, {self.destino.pk})
+                self.assertEqual(data['included'], {'destination': {key: {
+                    'destination_id': self.destino.pk, 'name': 'Madrid', 'country': 'España',
+                    'description': 'Capital', 'slug': 'madrid',
+                }}})
+
+    def test_same_rows_as_nested(self):
+        for path in ('galeria', 'clima', 'atracciones'):
+            with self.subTest(path=path):
+                nested = self.get(path, '')
+                sideloaded = self.get(path, 'sideload=1')
+                destino = sideloaded['included']['destination'][str(self.destino.pk)]
+                self.assertEqual([dict(row, destino_id=destino) for row in sideloaded['results']], nested)
+
+    def test_with_fields(self):
+        data = self.get('clima', 'sideload=1&fields=mes,destino_id.name')
+        self.assertEqual(data['results'], [{'mes': mes, 'destino_id': self.destino.pk} for mes in (1, 7, 12)])
+        self.assertEqual(data['included'], {'destination': {str(self.destino.pk): {'name': 'Madrid'}}})
 
+    def test_with_fields_without_relation(self):
+        # Sin relaciones que incluir la respuesta es la lista de siempre
+        self.assertEqual(self.get('galeria', 'sideload=1&fields=orden'), [{'orden': 0}, {'orden': 1}, {'orden': 2}])
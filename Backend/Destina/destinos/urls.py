@@ -1,15 +1,17 @@
 from django.urls import path
 from .views import (
-    AtraccionDestinoListView,
+    AsyncAtraccionDestinoListView,
     AtraccionDestinoDetailView,
+    AtraccionesCercanasView,
     GaleriaDestinoView,
-    ClimaDestinoView
+    AsyncClimaDestinoView
 )
 
 urlpatterns = [
-    path('<int:destino_id>/atracciones/', AtraccionDestinoListView.as_view(), name='atracciones-destino'),
+    path('<int:destino_id>/atracciones/', AsyncAtraccionDestinoListView.as_view(), name='atracciones-destino'),
+    path('atracciones/cerca/', AtraccionesCercanasView.as_view(), name='atracciones-cercanas'),
     path('atracciones/<int:atraccion_id>/', AtraccionDestinoDetailView.as_view(), name='atraccion-detail'),
     path('<int:destino_id>/galeria/', GaleriaDestinoView.as_view(), name='galeria-destino'),
-    path('<int:destino_id>/clima/', ClimaDestinoView.as_view(), name='clima-destino'),
+    path('<int:destino_id>/clima/', AsyncClimaDestinoView.as_view(), name='clima-destino'),
 ]
 
@@ -1,13 +1,20 @@
+import math
+
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 from .models import AtraccionDestino, GaleriaDestino, ClimaDestino
-from .serializers import AtraccionDestinoSerializer, GaleriaDestinoSerializer, ClimaDestinoSerializer
+from .serializers import AtraccionDestinoSerializer, AtraccionCercanaSerializer, GaleriaDestinoSerializer, ClimaDestinoSerializer
+from .geo import nearest
 from Tablas.models import Destination
+from Tablas.async_views import AsyncReadView
+from Tablas.db_router import ReplicaReadsMixin
+from Tablas.eager_loading import eager_load
+from Tablas.response_cache import cache_response
 
 
-class AtraccionDestinoListView(APIView):
+class AtraccionDestinoListView(ReplicaReadsMixin, APIView):
     """Listar atracciones de un destino"""
     permission_classes = [AllowAny]
     
@@ -20,7 +27,8 @@ class AtraccionDestinoListView(APIView):
             if categoria:
                 atracciones = atracciones.filter(categoria=categoria)
             
-            serializer = AtraccionDestinoSerializer(atracciones, many=True)
+            atracciones = eager_load(atracciones, AtraccionDestinoSerializer, context={'request': request})
+            serializer = AtraccionDestinoSerializer(atracciones, many=True, context={'request': request})
             return Response(serializer.data)
         except Destination.DoesNotExist:
             return Response({'error': 'Destino no encontrado'}, status=HTTP_404_NOT_FOUND)
@@ -46,36 +54,98 @@ class AtraccionDestinoListView(APIView):
                 horario_cierre=request.data.get('horario_cierre', None),
                 rating_promedio=request.data.get('rating_promedio', 0.0)
             )
-            return Response(AtraccionDestinoSerializer(atraccion).data, status=HTTP_201_CREATED)
+            return Response(AtraccionDestinoSerializer(atraccion, context={'request': request}).data, status=HTTP_201_CREATED)
         except Destination.DoesNotExist:
             return Response({'error': 'Destino no encontrado'}, status=HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
 
-class AtraccionDestinoDetailView(APIView):
+class AsyncAtraccionDestinoListView(AsyncReadView):
+    """GET async de AtraccionDestinoListView"""
+    sync_view = AtraccionDestinoListView
+    
+    async def read(self, request, destino_id):
+        if not await Destination.objects.filter(destination_id=destino_id).aexists():
+            return {'error': 'Destino no encontrado'}, HTTP_404_NOT_FOUND
+        atracciones = AtraccionDestino.objects.filter(destino_id=destino_id, is_active=True)
+        categoria = request.query_params.get('categoria')
+        
+        if categoria:
+            atracciones = atracciones.filter(categoria=categoria)
+        
+        atracciones = eager_load(atracciones, AtraccionDestinoSerializer, context={'request': request})
+        atracciones = [atraccion async for atraccion in atracciones]
+        return AtraccionDestinoSerializer(atracciones, many=True, context={'request': request}).data, HTTP_200_OK
+
+
+class AtraccionDestinoDetailView(ReplicaReadsMixin, APIView):
     """Detalle de una atracción"""
     permission_classes = [AllowAny]
     
     def get(self, request, atraccion_id):
         try:
-            atraccion = AtraccionDestino.objects.get(atraccion_id=atraccion_id, is_active=True)
-            serializer = AtraccionDestinoSerializer(atraccion)
+            atraccion = eager_load(AtraccionDestino.objects.all(), AtraccionDestinoSerializer, context={'request': request}).get(
+                atraccion_id=atraccion_id, is_active=True
+            )
+            serializer = AtraccionDestinoSerializer(atraccion, context={'request': request})
             return Response(serializer.data)
         except AtraccionDestino.DoesNotExist:
             return Response({'error': 'Atracción no encontrada'}, status=HTTP_404_NOT_FOUND)
 
 
-class GaleriaDestinoView(APIView):
+class AtraccionesCercanasView(ReplicaReadsMixin, APIView):
+    """Atracciones cercanas a un punto (radio y k vecinos más cercanos)"""
+    permission_classes = [AllowAny]
+    default_km = 20000.0
+    default_k = 20
+    max_k = 100
+    
+    def get(self, request):
+        try:
+            lat = float(request.query_params['lat'])
+            lon = float(request.query_params['lon'])
+            km = float(request.query_params.get('km', self.default_km))
+            k = int(request.query_params.get('k', self.default_k))
+        except (KeyError, ValueError):
+            return Response({'error': 'Parámetros lat, lon, km o k inválidos'}, status=HTTP_400_BAD_REQUEST)
+        
+        # nan pasa todas las comparaciones y el radio de nearest() nunca llegaría a km
+        if not all(math.isfinite(value) for value in (lat, lon, km)):
+            return Response({'error': 'Parámetros lat, lon, km o k inválidos'}, status=HTTP_400_BAD_REQUEST)
+        if not (-90 <= lat <= 90 and -180 <= lon <= 180) or km <= 0 or k <= 0:
+            return Response({'error': 'Parámetros lat, lon, km o k inválidos'}, status=HTTP_400_BAD_REQUEST)
+        
+        atracciones = AtraccionDestino.objects.filter(is_active=True)
+        categoria = request.query_params.get('categoria')
+        if categoria:
+            atracciones = atracciones.filter(categoria=categoria)
+        
+        cercanas = nearest(atracciones, lat, lon, min(k, self.max_k), km)
+        por_id = eager_load(AtraccionDestino.objects.all(), AtraccionCercanaSerializer, context={'request': request}).in_bulk(
+            [pk for _, pk in cercanas]
+        )
+        resultado = []
+        for distancia, pk in cercanas:
+            atraccion = por_id[pk]
+            atraccion.distancia_km = round(distancia, 3)
+            resultado.append(atraccion)
+        
+        serializer = AtraccionCercanaSerializer(resultado, many=True, context={'request': request})
+        return Response(serializer.data)
+
+
+class GaleriaDestinoView(ReplicaReadsMixin, APIView):
     """Gestionar galería de imágenes de un destino"""
     permission_classes = [AllowAny]
     
+    @cache_response('destination:{destino_id}', 'destination:{destino_id}:galeria')
     def get(self, request, destino_id):
         """Obtener galería de un destino"""
         try:
             destino = Destination.objects.get(destination_id=destino_id)
-            galeria = GaleriaDestino.objects.filter(destino_id=destino)
-            serializer = GaleriaDestinoSerializer(galeria, many=True)
+            galeria = eager_load(GaleriaDestino.objects.filter(destino_id=destino), GaleriaDestinoSerializer, context={'request': request})
+            serializer = GaleriaDestinoSerializer(galeria, many=True, context={'request': request})
             return Response(serializer.data)
         except Destination.DoesNotExist:
             return Response({'error': 'Destino no encontrado'}, status=HTTP_404_NOT_FOUND)
@@ -95,17 +165,18 @@ class GaleriaDestinoView(APIView):
                 is_principal=request.data.get('is_principal', False),
                 orden=request.data.get('orden', 0)
             )
-            return Response(GaleriaDestinoSerializer(imagen).data, status=HTTP_201_CREATED)
+            return Response(GaleriaDestinoSerializer(imagen, context={'request': request}).data, status=HTTP_201_CREATED)
         except Destination.DoesNotExist:
             return Response({'error': 'Destino no encontrado'}, status=HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
 
-class ClimaDestinoView(APIView):
+class ClimaDestinoView(ReplicaReadsMixin, APIView):
     """Gestionar información climática de un destino"""
     permission_classes = [AllowAny]
     
+    @cache_response('destination:{destino_id}', 'destination:{destino_id}:clima')
     def get(self, request, destino_id):
         """Obtener información climática de un destino"""
         try:
@@ -116,7 +187,8 @@ class ClimaDestinoView(APIView):
             if mes:
                 clima = clima.filter(mes=mes)
             
-            serializer = ClimaDestinoSerializer(clima, many=True)
+            clima = eager_load(clima, ClimaDestinoSerializer, context={'request': request})
+            serializer = ClimaDestinoSerializer(clima, many=True, context={'request': request})
             return Response(serializer.data)
         except Destination.DoesNotExist:
             return Response({'error': 'Destino no encontrado'}, status=HTTP_404_NOT_FOUND)
@@ -149,9 +221,27 @@ class ClimaDestinoView(APIView):
                 clima.descripcion = request.data.get('descripcion', clima.descripcion)
                 clima.save()
             
-            return Response(ClimaDestinoSerializer(clima).data, status=HTTP_201_CREATED)
+            return Response(ClimaDestinoSerializer(clima, context={'request': request}).data, status=HTTP_201_CREATED)
         except Destination.DoesNotExist:
             return Response({'error': 'Destino no encontrado'}, status=HTTP_404_NOT_FOUND)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
+
+class AsyncClimaDestinoView(AsyncReadView):
+    """GET async de ClimaDestinoView (misma caché por etiquetas)"""
+    sync_view = ClimaDestinoView
+    cache_tags = ('destination:{destino_id}', 'destination:{destino_id}:clima')
+    
+    async def read(self, request, destino_id):
+        if not await Destination.objects.filter(destination_id=destino_id).aexists():
+            return {'error': 'Destino no encontrado'}, HTTP_404_NOT_FOUND
+        mes = request.query_params.get('mes')
+        
+        clima = ClimaDestino.objects.filter(destino_id=destino_id)
+        if mes:
+            clima = clima.filter(mes=mes)
+        
+        clima = eager_load(clima, ClimaDestinoSerializer, context={'request': request})
+        clima = [registro async for registro in clima]
+        return ClimaDestinoSerializer(clima, many=True, context={'request': request}).data, HTTP_200_OK
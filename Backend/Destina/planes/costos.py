@@ -0,0 +1,44 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, Sum
+
+from .models import ActividadPlan
+
+# Costos de los planes agregados en la base de datos: una sola consulta
+# agrupada por (plan, día) para todos los planes de una página, de la que
+# también salen los totales por plan. Así el cliente no necesita descargar
+# las actividades para mostrar el presupuesto.
+
+
+def attach_costs(planes):
+    """
+    Añade a cada plan costo_total, presupuesto_restante y costos_por_dia
+    (lista de {fecha, costo, actividades} ordenada por fecha).
+    """
+    planes = list(planes)
+    if not planes:
+        return planes
+
+    por_dia = defaultdict(list)
+    filas = (
+        ActividadPlan.objects.filter(plan_id__in=[plan.pk for plan in planes])
+        .values('plan_id', 'fecha_actividad')
+        .annotate(costo=Sum('costo'), actividades=Count('pk'))
+        .order_by('plan_id', 'fecha_actividad')
+    )
+    for fila in filas:
+        por_dia[fila['plan_id']].append({
+            'fecha': fila['fecha_actividad'],
+            'costo': fila['costo'] or Decimal('0'),
+            'actividades': fila['actividades'],
+        })
+
+    for plan in planes:
+        plan.costos_por_dia = por_dia.get(plan.pk, [])
+        plan.costo_total = sum((dia['costo'] for dia in plan.costos_por_dia), Decimal('0'))
+        plan.presupuesto_restante = (
+            None if plan.presupuesto_total is None
+            else Decimal(plan.presupuesto_total) - plan.costo_total
+        )
+    return planes
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:52
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('Tablas', '0002_booking_category_chatmessage_destination_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Plan',
+            fields=[
+                ('plan_id', models.AutoField(primary_key=True, serialize=False)),
+                ('titulo', models.CharField(max_length=200)),
+                ('descripcion', models.TextField()),
+                ('fecha_inicio', models.DateField()),
+                ('fecha_fin', models.DateField()),
+                ('presupuesto_total', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('estado', models.CharField(choices=[('borrador', 'Borrador'), ('publicado', 'Publicado'), ('completado', 'Completado'), ('cancelado', 'Cancelado')], default='borrador', max_length=20)),
+                ('is_publico', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('destino_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='planes', to='Tablas.destination')),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='planes', to='Tablas.user')),
+            ],
+            options={
+                'db_table': 'plan',
+            },
+        ),
+        migrations.CreateModel(
+            name='ActividadPlan',
+            fields=[
+                ('actividad_plan_id', models.AutoField(primary_key=True, serialize=False)),
+                ('titulo', models.CharField(max_length=200)),
+                ('descripcion', models.TextField(blank=True, null=True)),
+                ('fecha_actividad', models.DateField()),
+                ('hora_inicio', models.TimeField(blank=True, null=True)),
+                ('hora_fin', models.TimeField(blank=True, null=True)),
+                ('costo', models.DecimalField(decimal_places=2, default=0.0, max_digits=10)),
+                ('ubicacion', models.CharField(blank=True, max_length=200, null=True)),
+                ('orden', models.IntegerField(default=0, validators=[django.core.validators.MinValueValidator(0)])),
+                ('plan_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='actividades', to='planes.plan')),
+            ],
+            options={
+                'db_table': 'actividad_plan',
+                'ordering': ['fecha_actividad', 'orden'],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0010_hot_path_indexes'),
+        ('planes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(condition=models.Q(('estado', 'publicado'), ('is_publico', True)), fields=['created_at', 'plan_id'], name='plan_public_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plan',
+            index=models.Index(condition=models.Q(('estado', 'publicado'), ('is_publico', True)), fields=['destino_id', 'created_at', 'plan_id'], name='plan_public_destino_idx'),
+        ),
+    ]
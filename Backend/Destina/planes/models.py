@@ -28,6 +28,17 @@ class Plan(models.Model):
 
     class Meta:
         db_table = 'plan'
+        # Listado público de planes (PlanListView), con y sin filtro de destino
+        indexes = [
+            models.Index(
+                fields=['created_at', 'plan_id'], condition=models.Q(is_publico=True, estado='publicado'),
+                name='plan_public_recent_idx',
+            ),
+            models.Index(
+                fields=['destino_id', 'created_at', 'plan_id'], condition=models.Q(is_publico=True, estado='publicado'),
+                name='plan_public_destino_idx',
+            ),
+        ]
 
 
 # Actividad del Plan Model
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Plan, ActividadPlan
 from Tablas.serializers import UserSerializer, DestinationSerializer
+from Tablas.sparse_fields import SparseModelSerializer
 
 
-class ActividadPlanSerializer(serializers.ModelSerializer):
+class ActividadPlanSerializer(SparseModelSerializer):
     class Meta:
         model = ActividadPlan
         fields = [
@@ -14,17 +15,40 @@ class ActividadPlanSerializer(serializers.ModelSerializer):
         read_only_fields = ['actividad_plan_id']
 
 
-class PlanSerializer(serializers.ModelSerializer):
+class ActividadItinerarioSerializer(ActividadPlanSerializer):
+    """Actividad dentro de una edición en lote: el plan lo fija la URL"""
+    class Meta(ActividadPlanSerializer.Meta):
+        fields = [name for name in ActividadPlanSerializer.Meta.fields if name != 'plan_id']
+
+
+class CostoDiarioSerializer(serializers.Serializer):
+    fecha = serializers.DateField(read_only=True)
+    costo = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    actividades = serializers.IntegerField(read_only=True)
+
+
+class PlanSerializer(SparseModelSerializer):
+    """Los campos de costos los calcula planes.costos.attach_costs"""
     user_id = UserSerializer(read_only=True)
     destino_id = DestinationSerializer(read_only=True)
-    actividades = ActividadPlanSerializer(source='actividades', many=True, read_only=True)
+    actividades = ActividadPlanSerializer(many=True, read_only=True)
+    costo_total = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    presupuesto_restante = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True, allow_null=True)
+    costos_por_dia = CostoDiarioSerializer(many=True, read_only=True)
     
     class Meta:
         model = Plan
         fields = [
             'plan_id', 'user_id', 'titulo', 'descripcion', 'destino_id',
             'fecha_inicio', 'fecha_fin', 'presupuesto_total', 'estado',
-            'is_publico', 'created_at', 'updated_at', 'actividades'
+            'is_publico', 'created_at', 'updated_at', 'costo_total',
+            'presupuesto_restante', 'costos_por_dia', 'actividades'
         ]
         read_only_fields = ['plan_id', 'created_at', 'updated_at']
 
+
+class PlanResumenSerializer(PlanSerializer):
+    """Plan con sus costos agregados pero sin la lista de actividades"""
+    class Meta(PlanSerializer.Meta):
+        fields = [name for name in PlanSerializer.Meta.fields if name != 'actividades']
+
@@ -1,4 +1,98 @@
+from datetime import date
+from decimal import Decimal
+
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from Tablas.models import AuthToken, Destination, User
+from Tablas.tests import ConstantQueriesMixin, QueryPlanMixin
+
+from .models import ActividadPlan, Plan
+
+
+class PlanListQueryPlanTests(QueryPlanMixin, TestCase):
+    """Listado público de planes sin recorridos completos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email='viajera@example.com', name='Viajera', password_hash='x', role='guest')
+        cls.destino = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        Plan.objects.bulk_create([
+            Plan(
+                user_id=user, destino_id=cls.destino, titulo=f'Plan {i}', descripcion='',
+                fecha_inicio=date(2027, 1, 1), fecha_fin=date(2027, 1, 8),
+                estado='publicado' if i % 3 else 'borrador', is_publico=i % 2 == 0,
+            )
+            for i in range(20)
+        ])
+
+    def test_plan_list(self):
+        self.assertNoFullScan('/api/planes/')
+        self.assertNoFullScan(f'/api/planes/?destino_id={self.destino.pk}')
+        self.assertNoFullScan('/api/planes/?actividades=0')
+
+
+class ItinerarioLoteTests(TestCase):
+    """Edición del itinerario en lote"""
+
+    @classmethod
+    def setUpTestData(cls):
+        user = User.objects.create(email='viajera@example.com', name='Viajera', password_hash='x', role='guest')
+        destino = Destination.objects.create(name='Destino', country='País', description='', slug='destino')
+        cls.plan = Plan.objects.create(
+            user_id=user, destino_id=destino, titulo='Plan', descripcion='',
+            fecha_inicio=date(2027, 1, 1), fecha_fin=date(2027, 1, 8),
+        )
+        cls.actividad = ActividadPlan.objects.create(plan_id=cls.plan, titulo='Museo', fecha_actividad=date(2027, 1, 2))
+        cls.token = AuthToken.objects.create(user_id=user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        self.url = f'/api/planes/{self.plan.pk}/actividades/lote/'
+
+    def test_lote(self):
+        response = self.client.post(self.url, {
+            'crear': [{'titulo': 'Cena', 'fecha_actividad': '2027-01-02', 'orden': 1}],
+            'actualizar': [{'actividad_plan_id': self.actividad.pk, 'titulo': 'Museo del Prado'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual([a['titulo'] for a in response.json()], ['Museo del Prado', 'Cena'])
+
+    def test_cuerpo_que_no_es_objeto(self):
+        for cuerpo in ([], ['crear'], 'crear', 1):
+            with self.subTest(cuerpo=cuerpo):
+                response = self.client.post(self.url, cuerpo, format='json')
+                self.assertEqual(response.status_code, 400)
+        self.assertEqual(ActividadPlan.objects.filter(plan_id=self.plan).count(), 1)
+
+
+class PlanListQueryCountTests(ConstantQueriesMixin, TestCase):
+    """El listado de planes hace las mismas consultas con uno que con varios"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.create_plan(0)
+
+    @staticmethod
+    def create_plan(i):
+        user = User.objects.create(email=f'viajera{i}@example.com', name=f'Viajera {i}', password_hash='x', role='guest')
+        destino = Destination.objects.create(name=f'Destino {i}', country='País', description='', slug=f'destino-{i}')
+        plan = Plan.objects.create(
+            user_id=user, destino_id=destino, titulo=f'Plan {i}', descripcion='', fecha_inicio=date(2027, 1, 1),
+            fecha_fin=date(2027, 1, 8), presupuesto_total=Decimal('500.00'), estado='publicado', is_publico=True,
+        )
+        ActividadPlan.objects.bulk_create([
+            ActividadPlan(plan_id=plan, titulo=f'Actividad {n}', fecha_actividad=date(2027, 1, 1 + n), costo=Decimal('20.00'))
+            for n in range(3)
+        ])
+
+    def add_plans(self):
+        for i in range(1, 6):
+            self.create_plan(i)
 
-# Create your tests here.
+    def test_plan_list(self):
+        self.assertConstantQueries('/api/planes/', self.add_plans)
 
+    def test_plan_list_without_activities(self):
+        self.assertConstantQueries('/api/planes/?actividades=0', self.add_plans)
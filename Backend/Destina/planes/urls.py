@@ -3,7 +3,8 @@ from .views import (
     PlanListView,
     PlanDetailView,
     MisPlanesView,
-    ActividadPlanView
+    ActividadPlanView,
+    ItinerarioLoteView
 )
 
 urlpatterns = [
@@ -11,5 +12,6 @@ urlpatterns = [
     path('mis-planes/', MisPlanesView.as_view(), name='mis-planes'),
     path('<int:plan_id>/', PlanDetailView.as_view(), name='plan-detail'),
     path('<int:plan_id>/actividades/', ActividadPlanView.as_view(), name='actividades-plan'),
+    path('<int:plan_id>/actividades/lote/', ItinerarioLoteView.as_view(), name='actividades-plan-lote'),
 ]
 
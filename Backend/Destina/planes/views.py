@@ -2,9 +2,21 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from django.db import transaction
+from django.utils import timezone
 from .models import Plan, ActividadPlan
-from .serializers import PlanSerializer, ActividadPlanSerializer
+from .serializers import PlanSerializer, PlanResumenSerializer, ActividadPlanSerializer, ActividadItinerarioSerializer
+from .costos import attach_costs
 from Tablas.models import Destination
+from Tablas.eager_loading import eager_load
+from Tablas.pagination import KeysetPagination
+
+
+def plan_serializer_class(request):
+    """?actividades=0 deja fuera la lista de actividades (y su prefetch)"""
+    if request.query_params.get('actividades', '').lower() in ('0', 'false', 'no'):
+        return PlanResumenSerializer
+    return PlanSerializer
 
 
 class PlanListView(APIView):
@@ -22,8 +34,11 @@ class PlanListView(APIView):
             if int(user_id) == request.user.user_id:
                 planes = Plan.objects.filter(user_id=user_id)
         
-        serializer = PlanSerializer(planes, many=True)
-        return Response(serializer.data)
+        serializer_class = plan_serializer_class(request)
+        paginator = KeysetPagination(ordering=('-created_at', '-plan_id'))
+        page = paginator.paginate_queryset(eager_load(planes, serializer_class, context={'request': request}), request, view=self)
+        serializer = serializer_class(attach_costs(page), many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
     
     def post(self, request):
         """Crear nuevo plan de viaje"""
@@ -43,7 +58,8 @@ class PlanListView(APIView):
                 estado=request.data.get('estado', 'borrador'),
                 is_publico=request.data.get('is_publico', False)
             )
-            return Response(PlanSerializer(plan).data, status=HTTP_201_CREATED)
+            attach_costs([plan])
+            return Response(PlanSerializer(plan, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
@@ -54,11 +70,13 @@ class PlanDetailView(APIView):
     
     def get(self, request, plan_id):
         try:
-            plan = Plan.objects.get(plan_id=plan_id)
-            if not plan.is_publico and plan.user_id != request.user:
+            serializer_class = plan_serializer_class(request)
+            plan = eager_load(Plan.objects.all(), serializer_class, context={'request': request}).get(plan_id=plan_id)
+            if not plan.is_publico and plan.user_id_id != request.user.pk:
                 return Response({'error': 'No autorizado'}, status=HTTP_400_BAD_REQUEST)
             
-            serializer = PlanSerializer(plan)
+            attach_costs([plan])
+            serializer = serializer_class(plan, context={'request': request})
             return Response(serializer.data)
         except Plan.DoesNotExist:
             return Response({'error': 'Plan no encontrado'}, status=HTTP_404_NOT_FOUND)
@@ -71,7 +89,7 @@ class PlanDetailView(APIView):
         
         try:
             plan = Plan.objects.get(plan_id=plan_id)
-            if plan.user_id != request.user:
+            if plan.user_id_id != request.user.pk:
                 return Response({'error': 'No autorizado'}, status=HTTP_400_BAD_REQUEST)
             
             plan.titulo = request.data.get('titulo', plan.titulo)
@@ -83,7 +101,8 @@ class PlanDetailView(APIView):
             plan.is_publico = request.data.get('is_publico', plan.is_publico)
             plan.save()
             
-            return Response(PlanSerializer(plan).data)
+            attach_costs([plan])
+            return Response(PlanSerializer(plan, context={'request': request}).data)
         except Plan.DoesNotExist:
             return Response({'error': 'Plan no encontrado'}, status=HTTP_404_NOT_FOUND)
 
@@ -93,8 +112,9 @@ class MisPlanesView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        planes = Plan.objects.filter(user_id=request.user)
-        serializer = PlanSerializer(planes, many=True)
+        serializer_class = plan_serializer_class(request)
+        planes = eager_load(Plan.objects.filter(user_id=request.user), serializer_class, context={'request': request})
+        serializer = serializer_class(attach_costs(planes), many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -106,7 +126,7 @@ class ActividadPlanView(APIView):
         """Agregar actividad a un plan"""
         try:
             plan = Plan.objects.get(plan_id=plan_id)
-            if plan.user_id != request.user:
+            if plan.user_id_id != request.user.pk:
                 return Response({'error': 'No autorizado'}, status=HTTP_400_BAD_REQUEST)
             
             actividad = ActividadPlan.objects.create(
@@ -120,7 +140,7 @@ class ActividadPlanView(APIView):
                 ubicacion=request.data.get('ubicacion', ''),
                 orden=request.data.get('orden', 0)
             )
-            return Response(ActividadPlanSerializer(actividad).data, status=HTTP_201_CREATED)
+            return Response(ActividadPlanSerializer(actividad, context={'request': request}).data, status=HTTP_201_CREATED)
         except Plan.DoesNotExist:
             return Response({'error': 'Plan no encontrado'}, status=HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -130,12 +150,103 @@ class ActividadPlanView(APIView):
         """Listar actividades de un plan"""
         try:
             plan = Plan.objects.get(plan_id=plan_id)
-            if not plan.is_publico and plan.user_id != request.user:
+            if not plan.is_publico and plan.user_id_id != request.user.pk:
                 return Response({'error': 'No autorizado'}, status=HTTP_400_BAD_REQUEST)
             
             actividades = ActividadPlan.objects.filter(plan_id=plan)
-            serializer = ActividadPlanSerializer(actividades, many=True)
+            serializer = ActividadPlanSerializer(actividades, many=True, context={'request': request})
             return Response(serializer.data)
         except Plan.DoesNotExist:
             return Response({'error': 'Plan no encontrado'}, status=HTTP_404_NOT_FOUND)
 
+
+class ItinerarioLoteView(APIView):
+    """
+    Editar el itinerario de un plan en una sola petición. Cuerpo (todas las
+    claves son opcionales):
+        crear:      [{titulo, fecha_actividad, ...}]
+        actualizar: [{actividad_plan_id, campos a cambiar...}]
+        eliminar:   [actividad_plan_id, ...]
+        orden:      [actividad_plan_id, ...]  (orden = posición en la lista)
+    Se aplica todo o nada en una transacción y devuelve el itinerario resultante.
+    """
+    permission_classes = [IsAuthenticated]
+    max_operaciones = 500
+    
+    def post(self, request, plan_id):
+        if not isinstance(request.data, dict):
+            return Response({'error': 'El cuerpo debe ser un objeto JSON'}, status=HTTP_400_BAD_REQUEST)
+        crear = request.data.get('crear', [])
+        actualizar = request.data.get('actualizar', [])
+        eliminar = request.data.get('eliminar', [])
+        orden = request.data.get('orden', [])
+        if not all(isinstance(value, list) for value in (crear, actualizar, eliminar, orden)):
+            return Response({'error': 'crear, actualizar, eliminar y orden deben ser listas'}, status=HTTP_400_BAD_REQUEST)
+        if len(crear) + len(actualizar) + len(eliminar) + len(orden) > self.max_operaciones:
+            return Response({'error': f'Máximo {self.max_operaciones} operaciones por lote'}, status=HTTP_400_BAD_REQUEST)
+        
+        try:
+            eliminar = {int(pk) for pk in eliminar}
+            orden = [int(pk) for pk in orden]
+            cambios = {int(item['actividad_plan_id']): item for item in actualizar}
+        except (KeyError, TypeError, ValueError):
+            return Response({'error': 'Ids de actividad inválidos'}, status=HTTP_400_BAD_REQUEST)
+        if len(cambios) != len(actualizar) or len(set(orden)) != len(orden):
+            return Response({'error': 'Ids de actividad repetidos'}, status=HTTP_400_BAD_REQUEST)
+        if eliminar & (cambios.keys() | set(orden)):
+            return Response({'error': 'No se puede modificar una actividad que se elimina'}, status=HTTP_400_BAD_REQUEST)
+        
+        nuevas = ActividadItinerarioSerializer(data=crear, many=True)
+        if not nuevas.is_valid():
+            return Response({'error': 'Actividades a crear inválidas', 'detalle': nuevas.errors}, status=HTTP_400_BAD_REQUEST)
+        
+        with transaction.atomic():
+            try:
+                plan = Plan.objects.select_for_update().get(plan_id=plan_id)
+            except Plan.DoesNotExist:
+                return Response({'error': 'Plan no encontrado'}, status=HTTP_404_NOT_FOUND)
+            if plan.user_id_id != request.user.pk:
+                return Response({'error': 'No autorizado'}, status=HTTP_400_BAD_REQUEST)
+            
+            existentes = ActividadPlan.objects.filter(plan_id=plan).in_bulk(
+                eliminar | cambios.keys() | set(orden)
+            )
+            desconocidas = (eliminar | cambios.keys() | set(orden)) - existentes.keys()
+            if desconocidas:
+                return Response(
+                    {'error': f'Actividades que no pertenecen al plan: {sorted(desconocidas)}'},
+                    status=HTTP_404_NOT_FOUND,
+                )
+            
+            campos = set()
+            modificadas = {}
+            for pk, item in cambios.items():
+                datos = {name: value for name, value in item.items() if name != 'actividad_plan_id'}
+                serializer = ActividadItinerarioSerializer(existentes[pk], data=datos, partial=True)
+                if not serializer.is_valid():
+                    return Response(
+                        {'error': f'Actividad {pk} inválida', 'detalle': serializer.errors},
+                        status=HTTP_400_BAD_REQUEST,
+                    )
+                for name, value in serializer.validated_data.items():
+                    setattr(existentes[pk], name, value)
+                    campos.add(name)
+                modificadas[pk] = existentes[pk]
+            for posicion, pk in enumerate(orden):
+                existentes[pk].orden = posicion
+                campos.add('orden')
+                modificadas[pk] = existentes[pk]
+            
+            if eliminar:
+                ActividadPlan.objects.filter(plan_id=plan, actividad_plan_id__in=eliminar).delete()
+            if modificadas:
+                ActividadPlan.objects.bulk_update(modificadas.values(), sorted(campos))
+            if nuevas.validated_data:
+                ActividadPlan.objects.bulk_create([
+                    ActividadPlan(plan_id=plan, **datos) for datos in nuevas.validated_data
+                ])
+            Plan.objects.filter(plan_id=plan.plan_id).update(updated_at=timezone.now())
+        
+        actividades = ActividadPlan.objects.filter(plan_id=plan)
+        serializer = ActividadPlanSerializer(actividades, many=True, context={'request': request})
+        return Response(serializer.data)
@@ -0,0 +1,98 @@
+import numpy as np
+from scipy import sparse
+
+# Filtrado colaborativo ítem-ítem sobre feedback implícito: las recomendaciones
+# guardadas (RecomendacionUsuario) forman una matriz binaria usuario × ítem.
+# La similitud entre ítems es el coseno entre sus columnas y la puntuación de
+# un ítem para un usuario es la suma de similitudes con los ítems que guardó.
+
+# Peso de la popularidad para desempatar (y rellenar a usuarios con poca
+# señal); es muy inferior a cualquier similitud real
+POPULARITY_PRIOR = 1e-6
+
+
+def interaction_matrix(pairs, user_ids, item_ids):
+    """Matriz CSR binaria usuarios × ítems a partir de pares (user_id, item_id)"""
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    rows = np.searchsorted(user_ids, pairs[:, 0])
+    cols = np.searchsorted(item_ids, pairs[:, 1])
+    data = np.ones(len(pairs), dtype=np.float32)
+    matrix = sparse.csr_matrix((data, (rows, cols)), shape=(len(user_ids), len(item_ids)))
+    matrix.data[:] = 1.0  # pares repetidos cuentan una vez
+    return matrix
+
+
+def item_similarity(matrix, neighbors=None):
+    """Coseno ítem × ítem (CSR), sin diagonal y opcionalmente podado a los `neighbors` más similares"""
+    norms = np.sqrt(np.asarray(matrix.sum(axis=0)).ravel())
+    norms[norms == 0] = 1.0
+    normalized = matrix @ sparse.diags(1.0 / norms).astype(np.float32)
+    similarity = (normalized.T @ normalized).tocsr()
+    similarity.setdiag(0)
+    similarity.eliminate_zeros()
+    if neighbors:
+        similarity = _prune_rows(similarity, neighbors)
+    return similarity
+
+
+def _prune_rows(matrix, k):
+    """Conserva en cada fila solo los k valores mayores"""
+    matrix = matrix.tocsr()
+    indptr = matrix.indptr
+    keep = np.zeros(matrix.nnz, dtype=bool)
+    for row in range(matrix.shape[0]):
+        start, end = indptr[row], indptr[row + 1]
+        if end - start <= k:
+            keep[start:end] = True
+        else:
+            top = np.argpartition(matrix.data[start:end], -k)[-k:]
+            keep[start + top] = True
+    matrix.data[~keep] = 0
+    matrix.eliminate_zeros()
+    return matrix
+
+
+def top_n(matrix, similarity, n, candidates, chunk_size=1024):
+    """
+    Mejores `n` ítems por usuario (índices de columna y puntuaciones), sin los
+    ya guardados ni los ítems fuera de `candidates` (máscara booleana). Se
+    calcula por bloques de usuarios para acotar la memoria.
+    """
+    n_users, n_items = matrix.shape
+    n = min(n, n_items)
+    popularity = np.asarray(matrix.sum(axis=0)).ravel()
+    prior = POPULARITY_PRIOR * popularity / max(popularity.max(initial=0), 1)
+    excluded = ~candidates
+
+    indices = np.full((n_users, n), -1, dtype=np.int32)
+    scores = np.zeros((n_users, n), dtype=np.float32)
+    for start in range(0, n_users, chunk_size):
+        block = matrix[start:start + chunk_size]
+        dense = (block @ similarity).toarray() + prior
+        dense[:, excluded] = -np.inf
+        seen_rows, seen_cols = block.nonzero()
+        dense[seen_rows, seen_cols] = -np.inf
+
+        if n < n_items:
+            best = np.argpartition(-dense, n - 1, axis=1)[:, :n]
+        else:
+            best = np.broadcast_to(np.arange(n_items), (dense.shape[0], n_items))
+        best_scores = np.take_along_axis(dense, best, axis=1)
+        order = np.argsort(-best_scores, axis=1, kind='stable')
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+
+        missing = ~np.isfinite(best_scores)
+        best = np.where(missing, -1, best)
+        best_scores = np.where(missing, 0, best_scores)
+        indices[start:start + len(best)] = best
+        scores[start:start + len(best)] = best_scores
+    return indices, scores
+
+
+def popular_items(matrix, candidates, n):
+    """Índices de los `n` ítems candidatos más guardados"""
+    popularity = np.asarray(matrix.sum(axis=0)).ravel().astype(np.float64)
+    popularity[~candidates] = -np.inf
+    order = np.argsort(-popularity, kind='stable')[:n]
+    return order[np.isfinite(popularity[order])]
@@ -0,0 +1,62 @@
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from recomendaciones.entrenamiento import interaction_matrix, item_similarity, popular_items, top_n
+from recomendaciones.models import Recomendacion, RecomendacionUsuario
+from recomendaciones.recomendador import ModeloRecomendador, model_dir, prune_versions
+
+
+class Command(BaseCommand):
+    help = 'Entrena el recomendador ítem-ítem a partir de RecomendacionUsuario y lo guarda en disco'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=50, help='Recomendaciones guardadas por usuario')
+        parser.add_argument('--vecinos', type=int, default=100, help='Ítems similares conservados por ítem (0 = todos)')
+        parser.add_argument('--bloque', type=int, default=1024, help='Usuarios puntuados por bloque')
+        parser.add_argument('--conservar', type=int, default=3, help='Versiones del modelo que se mantienen en disco')
+
+    def handle(self, *args, **options):
+        top = options['top']
+        if top <= 0 or options['bloque'] <= 0 or options['vecinos'] < 0:
+            raise CommandError('--top y --bloque deben ser mayores que 0 y --vecinos no negativo')
+        started = time.perf_counter()
+
+        pairs = np.fromiter(
+            (value for pair in RecomendacionUsuario.objects.values_list('user_id', 'recomendacion_id').iterator()
+             for value in pair),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        items = Recomendacion.objects.order_by('recomendacion_id').values_list('recomendacion_id', 'is_active')
+        item_ids = np.fromiter((pk for pk, _ in items), dtype=np.int64)
+        candidates = np.fromiter((active for _, active in items), dtype=bool)
+        if not len(item_ids):
+            raise CommandError('No hay recomendaciones que entrenar')
+        user_ids = np.unique(pairs[:, 0])
+
+        matrix = interaction_matrix(pairs, user_ids, item_ids)
+        similarity = item_similarity(matrix, neighbors=options['vecinos'] or None)
+        columns, scores = top_n(matrix, similarity, top, candidates, chunk_size=options['bloque'])
+        recommended = np.where(columns >= 0, item_ids[np.maximum(columns, 0)], -1)
+        popular = item_ids[popular_items(matrix, candidates, top)]
+
+        now = timezone.now()
+        path = ModeloRecomendador.save(
+            model_dir(), now.strftime('%Y%m%dT%H%M%S%fZ'), user_ids, recommended, scores, popular,
+            meta={
+                'entrenado': now.isoformat(),
+                'metodo': 'item-item coseno',
+                'usuarios': int(len(user_ids)),
+                'items': int(len(item_ids)),
+                'interacciones': int(matrix.nnz),
+                'top': top,
+                'vecinos': options['vecinos'],
+            },
+        )
+        prune_versions(model_dir(), options['conservar'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Modelo {path.name}: {len(user_ids)} usuarios, {len(item_ids)} ítems, '
+            f'{matrix.nnz} interacciones en {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:52
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('Tablas', '0002_booking_category_chatmessage_destination_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Recomendacion',
+            fields=[
+                ('recomendacion_id', models.AutoField(primary_key=True, serialize=False)),
+                ('titulo', models.CharField(max_length=200)),
+                ('descripcion', models.TextField()),
+                ('tipo', models.CharField(choices=[('destino', 'Destino'), ('actividad', 'Actividad'), ('restaurante', 'Restaurante'), ('alojamiento', 'Alojamiento')], max_length=20)),
+                ('rating', models.FloatField(default=0.0, validators=[django.core.validators.MinValueValidator(0), django.core.validators.MaxValueValidator(5)])),
+                ('imagen_url', models.CharField(blank=True, max_length=500, null=True)),
+                ('ubicacion', models.CharField(max_length=200)),
+                ('precio_estimado', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+            options={
+                'verbose_name_plural': 'recomendaciones',
+                'db_table': 'recomendacion',
+            },
+        ),
+        migrations.CreateModel(
+            name='RecomendacionUsuario',
+            fields=[
+                ('recomendacion_usuario_id', models.AutoField(primary_key=True, serialize=False)),
+                ('fecha_guardada', models.DateTimeField(auto_now_add=True)),
+                ('nota_personal', models.TextField(blank=True, null=True)),
+                ('recomendacion_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='usuarios', to='recomendaciones.recomendacion')),
+                ('user_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recomendaciones_usuario', to='Tablas.user')),
+            ],
+            options={
+                'db_table': 'recomendacion_usuario',
+                'unique_together': {('user_id', 'recomendacion_id')},
+            },
+        ),
+    ]
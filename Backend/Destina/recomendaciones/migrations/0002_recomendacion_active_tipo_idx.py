@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-18 13:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recomendaciones', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recomendacion',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['tipo'], name='recomendacion_active_tipo_idx'),
+        ),
+    ]
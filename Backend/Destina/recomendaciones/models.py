@@ -27,6 +27,9 @@ class Recomendacion(models.Model):
     class Meta:
         db_table = 'recomendacion'
         verbose_name_plural = 'recomendaciones'
+        indexes = [
+            models.Index(fields=['tipo'], condition=models.Q(is_active=True), name='recomendacion_active_tipo_idx'),
+        ]
 
 
 # Recomendación de Usuario Model
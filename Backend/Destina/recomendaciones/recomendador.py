@@ -0,0 +1,102 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+# Modelo de recomendación entrenado fuera de línea (manage.py entrenar_recomendador).
+#
+# Cada entrenamiento escribe una versión en RECOMENDADOR_DIR/<versión>/ con
+# matrices .npy y el archivo RECOMENDADOR_DIR/ACTUAL apunta a la vigente. Los
+# procesos web cargan las matrices con memory-mapping (el sistema operativo
+# comparte las páginas entre workers) y responder a un usuario es una búsqueda
+# binaria sobre los ids más la lectura de una fila.
+
+CURRENT_FILE = 'ACTUAL'
+
+
+def model_dir():
+    return Path(getattr(settings, 'RECOMENDADOR_DIR', Path(settings.BASE_DIR) / 'modelos' / 'recomendador'))
+
+
+class ModeloRecomendador:
+    """
+    Recomendaciones precalculadas por usuario:
+      usuarios.npy  ids de usuario ordenados (int64)
+      items.npy     recomendacion_id por usuario y posición, -1 si no hay (int32)
+      scores.npy    puntuación de cada posición (float32)
+      populares.npy recomendaciones para usuarios sin historial (int32)
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.usuarios = np.load(self.path / 'usuarios.npy', mmap_mode='r')
+        self.items = np.load(self.path / 'items.npy', mmap_mode='r')
+        self.scores = np.load(self.path / 'scores.npy', mmap_mode='r')
+        self.populares = np.load(self.path / 'populares.npy', mmap_mode='r')
+        self.meta = json.loads((self.path / 'meta.json').read_text())
+
+    @property
+    def version(self):
+        return self.path.name
+
+    def recomendar(self, user_id, n):
+        """Lista de (recomendacion_id, score) para el usuario, de mayor a menor puntuación"""
+        row = int(np.searchsorted(self.usuarios, user_id))
+        if row < len(self.usuarios) and self.usuarios[row] == user_id:
+            items = self.items[row, :n]
+            scores = self.scores[row, :n]
+            valid = items >= 0
+            return list(zip(items[valid].tolist(), scores[valid].tolist()))
+        return [(item, 0.0) for item in self.populares[:n].tolist()]
+
+    @classmethod
+    def save(cls, directory, version, usuarios, items, scores, populares, meta):
+        """Escribe una versión completa y después la publica cambiando ACTUAL de forma atómica"""
+        directory = Path(directory)
+        path = directory / version
+        path.mkdir(parents=True, exist_ok=False)
+        np.save(path / 'usuarios.npy', np.ascontiguousarray(usuarios, dtype=np.int64))
+        np.save(path / 'items.npy', np.ascontiguousarray(items, dtype=np.int32))
+        np.save(path / 'scores.npy', np.ascontiguousarray(scores, dtype=np.float32))
+        np.save(path / 'populares.npy', np.ascontiguousarray(populares, dtype=np.int32))
+        (path / 'meta.json').write_text(json.dumps(meta, indent=2))
+
+        pending = directory / f'{CURRENT_FILE}.tmp'
+        pending.write_text(version)
+        os.replace(pending, directory / CURRENT_FILE)
+        return path
+
+
+def prune_versions(directory, keep):
+    """Borra las versiones antiguas salvo las `keep` más recientes y la vigente"""
+    directory = Path(directory)
+    current = (directory / CURRENT_FILE).read_text().strip()
+    versions = sorted(path for path in directory.iterdir() if path.is_dir())
+    for path in versions[:-keep] if keep > 0 else versions:
+        # Un worker que aún tenga mapeada la versión sigue leyéndola tras el borrado
+        if path.name != current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+_lock = threading.Lock()
+_loaded = {'stamp': None, 'modelo': None}
+
+
+def get_model():
+    """Modelo vigente (cargado una vez por proceso y recargado si cambia ACTUAL), o None"""
+    current = model_dir() / CURRENT_FILE
+    try:
+        stamp = current.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _loaded['stamp'] != stamp:
+        with _lock:
+            if _loaded['stamp'] != stamp:
+                version = current.read_text().strip()
+                _loaded['modelo'] = ModeloRecomendador(model_dir() / version)
+                _loaded['stamp'] = stamp
+    return _loaded['modelo']
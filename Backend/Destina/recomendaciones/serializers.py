@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Recomendacion, RecomendacionUsuario
 from Tablas.serializers import UserSerializer
+from Tablas.sparse_fields import SparseModelSerializer
 
 
-class RecomendacionSerializer(serializers.ModelSerializer):
+class RecomendacionSerializer(SparseModelSerializer):
     class Meta:
         model = Recomendacion
         fields = [
@@ -14,7 +15,14 @@ class RecomendacionSerializer(serializers.ModelSerializer):
         read_only_fields = ['recomendacion_id', 'created_at']
 
 
-class RecomendacionUsuarioSerializer(serializers.ModelSerializer):
+class RecomendacionPuntuadaSerializer(RecomendacionSerializer):
+    score = serializers.FloatField(read_only=True)
+    
+    class Meta(RecomendacionSerializer.Meta):
+        fields = RecomendacionSerializer.Meta.fields + ['score']
+
+
+class RecomendacionUsuarioSerializer(SparseModelSerializer):
     user_id = UserSerializer(read_only=True)
     recomendacion_id = RecomendacionSerializer(read_only=True)
     
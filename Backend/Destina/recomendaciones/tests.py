@@ -1,4 +1,138 @@
-from django.test import TestCase
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
 
-# Create your tests here.
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
+from Tablas.authentication import token_cache
+from Tablas.models import AuthToken, User
+from Tablas.tests import ConstantQueriesMixin, QueryPlanMixin
+
+from . import recomendador
+from .models import Recomendacion, RecomendacionUsuario
+
+
+class RecomendacionListQueryPlanTests(QueryPlanMixin, TestCase):
+    """Filtro por tipo de las recomendaciones sin recorridos completos"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Recomendacion.objects.bulk_create([
+            Recomendacion(
+                titulo=f'Recomendación {i}', descripcion='', tipo=('restaurante', 'actividad')[i % 2],
+                ubicacion='Madrid', is_active=i % 5 != 0,
+            )
+            for i in range(20)
+        ])
+
+    def test_recomendacion_list_by_tipo(self):
+        self.assertNoFullScan('/api/recomendaciones/?tipo=restaurante')
+        self.assertNoFullScan('/api/recomendaciones/?tipo=actividad&ubicacion=madrid')
+
+
+class RecomendacionListQueryCountTests(ConstantQueriesMixin, TestCase):
+    """El listado de recomendaciones hace las mismas consultas con una que con varias"""
+
+    @classmethod
+    def setUpTestData(cls):
+        Recomendacion.objects.create(titulo='Recomendación 0', descripcion='', tipo='restaurante', ubicacion='Madrid')
+
+    def add_recomendaciones(self):
+        Recomendacion.objects.bulk_create([
+            Recomendacion(titulo=f'Recomendación {i}', descripcion='', tipo='restaurante', ubicacion='Madrid')
+            for i in range(1, 6)
+        ])
+
+    def test_recomendacion_list(self):
+        self.assertConstantQueries('/api/recomendaciones/?tipo=restaurante', self.add_recomendaciones)
+
+
+class RecomendadorTests(TestCase):
+    """entrenar_recomendador publica versiones en RECOMENDADOR_DIR y ParaMiView las sirve"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.items = Recomendacion.objects.bulk_create([
+            Recomendacion(titulo=f'Recomendación {i}', descripcion='', tipo='restaurante', ubicacion='Madrid')
+            for i in range(4)
+        ])
+        cls.users = [
+            User.objects.create(email=f'viajero{i}@example.com', name=f'Viajero {i}', password_hash='x', role='guest')
+            for i in range(4)
+        ]
+        # Guardadas: 0 → r0 r1 r2, 1 → r0 r1, 2 → r0; el usuario 3 no tiene historial
+        RecomendacionUsuario.objects.bulk_create([
+            RecomendacionUsuario(user_id=cls.users[user], recomendacion_id=cls.items[item])
+            for user, item in [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (2, 0)]
+        ])
+        cls.tokens = [AuthToken.objects.create(user_id=user) for user in cls.users]
+
+    def setUp(self):
+        self.dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(override_settings(RECOMENDADOR_DIR=self.dir))
+        # El modelo cargado es global al proceso
+        self.addCleanup(recomendador._loaded.update, stamp=None, modelo=None)
+        token_cache.clear()
+
+    def train(self, *args):
+        call_command('entrenar_recomendador', *args, stdout=StringIO())
+
+    def para_mi(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens[user].key}')
+        response = client.get('/api/recomendaciones/para-mi/')
+        self.assertEqual(response.status_code, 200)
+        return [row['recomendacion_id'] for row in response.json()]
+
+    def ids(self, *indexes):
+        return [self.items[i].pk for i in indexes]
+
+    def test_train_writes_version(self):
+        self.train()
+        version = (self.dir / recomendador.CURRENT_FILE).read_text().strip()
+        path = self.dir / version
+        self.assertEqual(
+            sorted(p.name for p in path.iterdir()),
+            ['items.npy', 'meta.json', 'populares.npy', 'scores.npy', 'usuarios.npy'],
+        )
+        meta = json.loads((path / 'meta.json').read_text())
+        self.assertEqual((meta['usuarios'], meta['items'], meta['interacciones']), (3, 4, 6))
+
+        modelo = recomendador.get_model()
+        self.assertEqual(modelo.version, version)
+        self.assertEqual([pk for pk, _ in modelo.recomendar(self.users[2].pk, 2)], self.ids(1, 2))
+        # Sin historial: las más guardadas
+        self.assertEqual([pk for pk, _ in modelo.recomendar(self.users[3].pk, 3)], self.ids(0, 1, 2))
+
+    def test_retrain_swaps_current_and_prunes(self):
+        self.train()
+        first = recomendador.get_model()
+        versions = [first.version]
+        for _ in range(3):
+            self.train('--conservar', '2')
+            versions.append((self.dir / recomendador.CURRENT_FILE).read_text().strip())
+        self.assertEqual(len(set(versions)), 4)
+        self.assertEqual(sorted(p.name for p in self.dir.iterdir() if p.is_dir()), versions[-2:])
+        self.assertFalse((self.dir / f'{recomendador.CURRENT_FILE}.tmp').exists())
+        # Los workers recargan el modelo al cambiar ACTUAL
+        self.assertEqual(recomendador.get_model().version, versions[-1])
+
+    def test_para_mi_uses_model(self):
+        self.train()
+        self.assertEqual(self.para_mi(2), self.ids(1, 2, 3))
+
+    def test_para_mi_skips_saved_and_deactivated_after_training(self):
+        self.train()
+        RecomendacionUsuario.objects.create(user_id=self.users[2], recomendacion_id=self.items[1])
+        Recomendacion.objects.filter(pk=self.items[2].pk).update(is_active=False)
+        self.assertEqual(self.para_mi(2), self.ids(3))
+
+    def test_para_mi_without_model(self):
+        self.assertIsNone(recomendador.get_model())
+        self.assertEqual(self.para_mi(3), self.ids(0, 1, 2, 3))
+        # Excluye las guardadas por el usuario y las desactivadas
+        Recomendacion.objects.filter(pk=self.items[2].pk).update(is_active=False)
+        self.assertEqual(self.para_mi(1), self.ids(3))
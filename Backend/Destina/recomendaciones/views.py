@@ -1,12 +1,17 @@
+from django.db.models import Count
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from rest_framework.status import HTTP_200_OK, HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
 from .models import Recomendacion, RecomendacionUsuario
-from .serializers import RecomendacionSerializer, RecomendacionUsuarioSerializer
+from .serializers import RecomendacionSerializer, RecomendacionPuntuadaSerializer, RecomendacionUsuarioSerializer
+from .recomendador import get_model
+from Tablas.async_views import AsyncReadView
+from Tablas.db_router import ReplicaReadsMixin
+from Tablas.eager_loading import eager_load
 
 
-class RecomendacionListView(APIView):
+class RecomendacionListView(ReplicaReadsMixin, APIView):
     """Listar todas las recomendaciones"""
     permission_classes = [AllowAny]
     
@@ -20,7 +25,7 @@ class RecomendacionListView(APIView):
         if ubicacion:
             recomendaciones = recomendaciones.filter(ubicacion__icontains=ubicacion)
         
-        serializer = RecomendacionSerializer(recomendaciones, many=True)
+        serializer = RecomendacionSerializer(recomendaciones, many=True, context={'request': request})
         return Response(serializer.data)
     
     def post(self, request):
@@ -39,19 +44,37 @@ class RecomendacionListView(APIView):
                 imagen_url=request.data.get('imagen_url', ''),
                 precio_estimado=request.data.get('precio_estimado', None)
             )
-            return Response(RecomendacionSerializer(recomendacion).data, status=HTTP_201_CREATED)
+            return Response(RecomendacionSerializer(recomendacion, context={'request': request}).data, status=HTTP_201_CREATED)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
 
-class RecomendacionDetailView(APIView):
+class AsyncRecomendacionListView(AsyncReadView):
+    """GET async de RecomendacionListView"""
+    sync_view = RecomendacionListView
+    
+    async def read(self, request):
+        recomendaciones = Recomendacion.objects.filter(is_active=True)
+        tipo = request.query_params.get('tipo')
+        ubicacion = request.query_params.get('ubicacion')
+        
+        if tipo:
+            recomendaciones = recomendaciones.filter(tipo=tipo)
+        if ubicacion:
+            recomendaciones = recomendaciones.filter(ubicacion__icontains=ubicacion)
+        
+        recomendaciones = [recomendacion async for recomendacion in recomendaciones]
+        return RecomendacionSerializer(recomendaciones, many=True, context={'request': request}).data, HTTP_200_OK
+
+
+class RecomendacionDetailView(ReplicaReadsMixin, APIView):
     """Detalle de una recomendación"""
     permission_classes = [AllowAny]
     
     def get(self, request, recomendacion_id):
         try:
             recomendacion = Recomendacion.objects.get(recomendacion_id=recomendacion_id, is_active=True)
-            serializer = RecomendacionSerializer(recomendacion)
+            serializer = RecomendacionSerializer(recomendacion, context={'request': request})
             return Response(serializer.data)
         except Recomendacion.DoesNotExist:
             return Response({'error': 'Recomendación no encontrada'}, status=HTTP_404_NOT_FOUND)
@@ -74,7 +97,7 @@ class GuardarRecomendacionView(APIView):
                 recomendacion_usuario.nota_personal = request.data.get('nota_personal', recomendacion_usuario.nota_personal)
                 recomendacion_usuario.save()
             
-            return Response(RecomendacionUsuarioSerializer(recomendacion_usuario).data, status=HTTP_201_CREATED)
+            return Response(RecomendacionUsuarioSerializer(recomendacion_usuario, context={'request': request}).data, status=HTTP_201_CREATED)
         except Recomendacion.DoesNotExist:
             return Response({'error': 'Recomendación no encontrada'}, status=HTTP_404_NOT_FOUND)
 
@@ -84,7 +107,49 @@ class MisRecomendacionesView(APIView):
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
-        recomendaciones = RecomendacionUsuario.objects.filter(user_id=request.user)
-        serializer = RecomendacionUsuarioSerializer(recomendaciones, many=True)
+        recomendaciones = eager_load(RecomendacionUsuario.objects.filter(user_id=request.user), RecomendacionUsuarioSerializer, context={'request': request})
+        serializer = RecomendacionUsuarioSerializer(recomendaciones, many=True, context={'request': request})
         return Response(serializer.data)
 
+
+class ParaMiView(APIView):
+    """Recomendaciones personalizadas del modelo entrenado (entrenar_recomendador)"""
+    permission_classes = [IsAuthenticated]
+    default_n = 10
+    max_n = 50
+    
+    def get(self, request):
+        try:
+            n = min(int(request.query_params.get('n', self.default_n)), self.max_n)
+        except ValueError:
+            return Response({'error': 'Parámetro n inválido'}, status=HTTP_400_BAD_REQUEST)
+        if n <= 0:
+            return Response({'error': 'Parámetro n inválido'}, status=HTTP_400_BAD_REQUEST)
+        
+        modelo = get_model()
+        if modelo is not None:
+            # Se piden todas las posiciones guardadas: las que se desactivaron o
+            # el usuario guardó después del entrenamiento se descartan abajo
+            puntuadas = modelo.recomendar(request.user.pk, self.max_n)
+        else:
+            # Sin modelo entrenado: las más guardadas
+            populares = Recomendacion.objects.filter(is_active=True).annotate(
+                veces=Count('usuarios')
+            ).order_by('-veces', 'recomendacion_id').values_list('recomendacion_id', flat=True)
+            puntuadas = [(pk, 0.0) for pk in populares[:self.max_n]]
+        
+        por_id = Recomendacion.objects.filter(is_active=True).exclude(
+            usuarios__user_id=request.user
+        ).in_bulk([pk for pk, _ in puntuadas])
+        resultado = []
+        for pk, score in puntuadas:
+            recomendacion = por_id.get(pk)
+            if recomendacion is None:
+                continue
+            recomendacion.score = round(score, 6)
+            resultado.append(recomendacion)
+            if len(resultado) == n:
+                break
+        
+        serializer = RecomendacionPuntuadaSerializer(resultado, many=True, context={'request': request})
+        return Response(serializer.data)
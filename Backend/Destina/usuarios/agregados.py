@@ -0,0 +1,30 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from Tablas.ratings import recompute_ratings
+
+# Recalculo en bloque de los agregados de usuario que mantienen usuarios.signals.
+# Reciben las clases de modelo para poder usarse también desde migraciones.
+
+
+def recompute_reputation(User, ResenaUsuario):
+    return recompute_ratings(User.objects.all(), ResenaUsuario.objects.all(), 'usuario_resenado_id')
+
+
+def _count_subquery(SeguimientoUsuario, field):
+    rows = SeguimientoUsuario.objects.filter(**{field: OuterRef('pk')}).order_by().values(field)
+    return Coalesce(
+        Subquery(rows.annotate(n=Count('pk')).values('n')), 0, output_field=IntegerField()
+    )
+
+
+def recompute_follow_counts(User, SeguimientoUsuario):
+    """Corrige followers_count y following_count; devuelve cuántos usuarios estaban desajustados"""
+    followers = _count_subquery(SeguimientoUsuario, 'seguido_id')
+    following = _count_subquery(SeguimientoUsuario, 'seguidor_id')
+    drifted = User.objects.annotate(real_followers=followers, real_following=following).exclude(
+        followers_count=F('real_followers'), following_count=F('real_following')
+    ).values('pk')
+    return User.objects.filter(pk__in=Subquery(drifted)).update(
+        followers_count=followers, following_count=following,
+    )
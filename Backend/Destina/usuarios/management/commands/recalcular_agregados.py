@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from Tablas.models import User
+from usuarios.agregados import recompute_follow_counts, recompute_reputation
+from usuarios.models import ResenaUsuario, SeguimientoUsuario
+
+
+class Command(BaseCommand):
+    help = 'Recalcula en bloque los agregados desnormalizados de usuario (reputación y seguidores)'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            reputation = recompute_reputation(User, ResenaUsuario)
+            follows = recompute_follow_counts(User, SeguimientoUsuario)
+        self.stdout.write(self.style.SUCCESS(
+            f'{reputation} usuarios con reputación corregida, {follows} con contadores de seguidores corregidos'
+        ))
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.5 on 2026-10-18 12:52
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('Tablas', '0002_booking_category_chatmessage_destination_image_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerfilUsuario',
+            fields=[
+                ('perfil_id', models.AutoField(primary_key=True, serialize=False)),
+                ('telefono', models.CharField(blank=True, max_length=20, null=True, validators=[django.core.validators.RegexValidator(message='Formato de teléfono inválido', regex='^\\+?1?\\d{9,15}$')])),
+                ('fecha_nacimiento', models.DateField(blank=True, null=True)),
+                ('bio', models.TextField(blank=True, null=True)),
+                ('avatar_url', models.CharField(blank=True, max_length=500, null=True)),
+                ('pais', models.CharField(blank=True, max_length=100, null=True)),
+                ('ciudad', models.CharField(blank=True, max_length=100, null=True)),
+                ('preferencias_viaje', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user_id', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='perfil', to='Tablas.user')),
+            ],
+            options={
+                'db_table': 'perfil_usuario',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResenaUsuario',
+            fields=[
+                ('resena_id', models.AutoField(primary_key=True, serialize=False)),
+                ('rating', models.IntegerField(choices=[(1, 1), (2, 2), (3, 3), (4, 4), (5, 5)])),
+                ('comentario', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('usuario_resenado_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resenas_recibidas', to='Tablas.user')),
+                ('usuario_resenador_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resenas_hechas', to='Tablas.user')),
+            ],
+            options={
+                'db_table': 'resena_usuario',
+                'unique_together': {('usuario_resenado_id', 'usuario_resenador_id')},
+            },
+        ),
+        migrations.CreateModel(
+            name='SeguimientoUsuario',
+            fields=[
+                ('seguimiento_id', models.AutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('seguido_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='seguidores', to='Tablas.user')),
+                ('seguidor_id', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='siguiendo', to='Tablas.user')),
+            ],
+            options={
+                'db_table': 'seguimiento_usuario',
+                'unique_together': {('seguidor_id', 'seguido_id')},
+            },
+        ),
+    ]
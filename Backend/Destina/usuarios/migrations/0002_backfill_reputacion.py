@@ -0,0 +1,22 @@
+from django.db import migrations
+
+from Tablas.ratings import recompute_ratings
+
+
+def backfill_reputation(apps, schema_editor):
+    """Calcula la reputación inicial de los usuarios a partir de las reseñas existentes"""
+    User = apps.get_model('Tablas', 'User')
+    ResenaUsuario = apps.get_model('usuarios', 'ResenaUsuario')
+    recompute_ratings(User.objects.all(), ResenaUsuario.objects.all(), 'usuario_resenado_id')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0008_user_rating_aggregates'),
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_reputation, migrations.RunPython.noop),
+    ]
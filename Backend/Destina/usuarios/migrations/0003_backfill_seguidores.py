@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from usuarios.agregados import recompute_follow_counts
+
+
+def backfill_follow_counts(apps, schema_editor):
+    """Calcula los contadores iniciales a partir de los seguimientos existentes"""
+    recompute_follow_counts(apps.get_model('Tablas', 'User'), apps.get_model('usuarios', 'SeguimientoUsuario'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Tablas', '0009_user_follow_counters'),
+        ('usuarios', '0002_backfill_reputacion'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_follow_counts, migrations.RunPython.noop),
+    ]
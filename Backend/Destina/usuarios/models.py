@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.core.validators import RegexValidator
 
 # Perfil de Usuario Model
@@ -34,6 +34,15 @@ class SeguimientoUsuario(models.Model):
     def __str__(self):
         return f"{self.seguidor_id.name} sigue a {self.seguido_id.name}"
 
+    def save(self, *args, **kwargs):
+        # Los contadores de User (usuarios.signals) se actualizan en la misma transacción
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
     class Meta:
         db_table = 'seguimiento_usuario'
         unique_together = ['seguidor_id', 'seguido_id']
@@ -51,6 +60,15 @@ class ResenaUsuario(models.Model):
     def __str__(self):
         return f"Reseña de {self.usuario_resenador_id.name} para {self.usuario_resenado_id.name}"
 
+    def save(self, *args, **kwargs):
+        # La reputación del usuario (usuarios.signals) se actualiza en la misma transacción
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic(using=kwargs.get('using')):
+            return super().delete(*args, **kwargs)
+
     class Meta:
         db_table = 'resena_usuario'
         unique_together = ['usuario_resenado_id', 'usuario_resenador_id']
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import PerfilUsuario, SeguimientoUsuario, ResenaUsuario
 from Tablas.serializers import UserSerializer
+from Tablas.sparse_fields import SparseModelSerializer
 
 
-class PerfilUsuarioSerializer(serializers.ModelSerializer):
+class PerfilUsuarioSerializer(SparseModelSerializer):
     user_id = UserSerializer(read_only=True)
     
     class Meta:
@@ -16,7 +17,7 @@ class PerfilUsuarioSerializer(serializers.ModelSerializer):
         read_only_fields = ['perfil_id', 'created_at', 'updated_at']
 
 
-class SeguimientoUsuarioSerializer(serializers.ModelSerializer):
+class SeguimientoUsuarioSerializer(SparseModelSerializer):
     seguidor_id = UserSerializer(read_only=True)
     seguido_id = UserSerializer(read_only=True)
     
@@ -26,7 +27,7 @@ class SeguimientoUsuarioSerializer(serializers.ModelSerializer):
         read_only_fields = ['seguimiento_id', 'created_at']
 
 
-class ResenaUsuarioSerializer(serializers.ModelSerializer):
+class ResenaUsuarioSerializer(SparseModelSerializer):
     usuario_resenado_id = UserSerializer(read_only=True)
     usuario_resenador_id = UserSerializer(read_only=True)
     
@@ -0,0 +1,64 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from Tablas.authentication import token_cache
+from Tablas.models import User
+from Tablas.ratings import apply_rating_delta
+from .models import ResenaUsuario, SeguimientoUsuario
+
+# Reputación (User.rating_*) y contadores de seguidores (User.followers_count,
+# User.following_count) actualizados de forma incremental en la misma
+# transacción que cada alta, edición o baja de ResenaUsuario y
+# SeguimientoUsuario. Las escrituras masivas (bulk_create, update) no emiten
+# señales: tras ellas hay que ejecutar `manage.py recalcular_agregados`.
+
+
+def _apply(user_id, count_delta, sum_delta):
+    apply_rating_delta(User.objects.filter(pk=user_id), count_delta, sum_delta)
+    token_cache.invalidate_user(user_id)
+
+
+@receiver(pre_save, sender=ResenaUsuario)
+def remember_previous_rating(sender, instance, raw=False, **kwargs):
+    instance._previous_rating = None
+    if instance.pk is not None and not raw:
+        instance._previous_rating = sender.objects.filter(pk=instance.pk).values_list(
+            'usuario_resenado_id', 'rating'
+        ).first()
+
+
+@receiver(post_save, sender=ResenaUsuario)
+def add_rating(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is not None:
+        previous_user, previous_rating = previous
+        if previous == (instance.usuario_resenado_id_id, instance.rating):
+            return
+        _apply(previous_user, -1, -previous_rating)
+    _apply(instance.usuario_resenado_id_id, 1, instance.rating)
+
+
+@receiver(post_delete, sender=ResenaUsuario)
+def remove_rating(sender, instance, **kwargs):
+    _apply(instance.usuario_resenado_id_id, -1, -instance.rating)
+
+
+def _adjust_follow_counts(seguidor_id, seguido_id, delta):
+    User.objects.filter(pk=seguido_id).update(followers_count=F('followers_count') + delta)
+    User.objects.filter(pk=seguidor_id).update(following_count=F('following_count') + delta)
+    token_cache.invalidate_user(seguido_id)
+    token_cache.invalidate_user(seguidor_id)
+
+
+@receiver(post_save, sender=SeguimientoUsuario)
+def count_follow(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        _adjust_follow_counts(instance.seguidor_id_id, instance.seguido_id_id, 1)
+
+
+@receiver(post_delete, sender=SeguimientoUsuario)
+def count_unfollow(sender, instance, **kwargs):
+    _adjust_follow_counts(instance.seguidor_id_id, instance.seguido_id_id, -1)
@@ -1,4 +1,136 @@
+from django.db.models import F
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from Tablas.authentication import token_cache
+from Tablas.models import AuthToken, User
+from Tablas.ratings import apply_rating_delta
+from Tablas.tests import ConstantQueriesMixin
 
+from .models import ResenaUsuario, SeguimientoUsuario
+
+
+class ProfileRenameTests(TestCase):
+    """
+    Renombrar el perfil no pisa los agregados desnormalizados. request.user sale
+    de la caché de tokens: los cambios que hace otro worker (sin invalidar la
+    caché de este proceso) se simulan escribiendo sin pasar por usuarios.signals.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='anfitriona@example.com', name='Anfitriona', password_hash='x', role='host')
+        cls.other = User.objects.create(email='viajero@example.com', name='Viajero', password_hash='x', role='guest')
+        cls.token = AuthToken.objects.create(user_id=cls.user)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        # Deja request.user en la caché de tokens
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+
+    def rename(self):
+        response = self.client.put('/api/auth/profile/', {'name': 'Nuevo nombre'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.name, 'Nuevo nombre')
+
+    def test_rename_keeps_reputation(self):
+        ResenaUsuario.objects.bulk_create([
+            ResenaUsuario(usuario_resenado_id=self.user, usuario_resenador_id=self.other, rating=4, comentario='Bien')
+        ])
+        apply_rating_delta(User.objects.filter(pk=self.user.pk), 1, 4)
+
+        self.rename()
+        self.assertEqual((self.user.rating_count, self.user.rating_sum, self.user.rating_avg), (1, 4, 4.0))
+
+    def test_rename_keeps_follow_counts(self):
+        SeguimientoUsuario.objects.bulk_create([SeguimientoUsuario(seguidor_id=self.other, seguido_id=self.user)])
+        User.objects.filter(pk=self.user.pk).update(followers_count=F('followers_count') + 1)
+        User.objects.filter(pk=self.other.pk).update(following_count=F('following_count') + 1)
+
+        self.rename()
+        self.assertEqual(self.user.followers_count, 1)
+        grafo = self.client.get(f'/api/usuarios/{self.user.pk}/grafo/seguidores/').json()
+        self.assertEqual(grafo['count'], len(grafo['results']))
+
+
+class SeguidoresQueryCountTests(ConstantQueriesMixin, TestCase):
+    """Los listados de seguidores y seguidos hacen las mismas consultas con uno que con varios"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='anfitriona@example.com', name='Anfitriona', password_hash='x', role='host')
+        cls.follow(0)
+
+    @classmethod
+    def follow(cls, i):
+        other = User.objects.create(email=f'viajero{i}@example.com', name=f'Viajero {i}', password_hash='x', role='guest')
+        SeguimientoUsuario.objects.create(seguidor_id=other, seguido_id=cls.user)
+        SeguimientoUsuario.objects.create(seguidor_id=cls.user, seguido_id=other)
+
+    def add_follows(self):
+        for i in range(1, 6):
+            self.follow(i)
+
+    def test_seguidores(self):
+        self.assertConstantQueries(f'/api/usuarios/{self.user.pk}/seguidores/', self.add_follows)
+
+    def test_siguiendo(self):
+        self.assertConstantQueries(f'/api/usuarios/{self.user.pk}/siguiendo/', self.add_follows)
+
+
+class SeguirUsuarioTests(TestCase):
+    """Seguir y dejar de seguir mantiene los contadores; las listas conservan su forma"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='anfitriona@example.com', name='Anfitriona', password_hash='x', role='host')
+        cls.others = [
+            User.objects.create(email=f'viajero{i}@example.com', name=f'Viajero {i}', password_hash='x', role='guest')
+            for i in range(2)
+        ]
+        cls.token = AuthToken.objects.create(user_id=cls.user)
+
+    def setUp(self):
+        token_cache.clear()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def counts(self, user):
+        return tuple(User.objects.filter(pk=user.pk).values_list('followers_count', 'following_count').get())
+
+    def test_follow_and_unfollow(self):
+        for other in self.others:
+            self.assertEqual(self.client.post(f'/api/usuarios/{other.pk}/seguir/').status_code, 201)
+        # Repetido o a uno mismo: no cambia nada
+        self.assertEqual(self.client.post(f'/api/usuarios/{self.others[0].pk}/seguir/').status_code, 400)
+        self.assertEqual(self.client.post(f'/api/usuarios/{self.user.pk}/seguir/').status_code, 400)
+        self.assertEqual(self.counts(self.user), (0, 2))
+        self.assertEqual([self.counts(other) for other in self.others], [(1, 0), (1, 0)])
+        # request.user sale de la caché de tokens, que se invalida con cada seguimiento
+        self.assertEqual(self.client.get('/api/auth/profile/').json()['following_count'], 2)
+
+        self.assertEqual(self.client.delete(f'/api/usuarios/{self.others[0].pk}/seguir/').status_code, 200)
+        self.assertEqual(self.client.delete(f'/api/usuarios/{self.others[0].pk}/seguir/').status_code, 404)
+        self.assertEqual(self.counts(self.user), (0, 1))
+        self.assertEqual([self.counts(other) for other in self.others], [(0, 0), (1, 0)])
+        self.assertEqual(self.client.get('/api/auth/profile/').json()['following_count'], 1)
+
+    def test_list_shapes(self):
+        SeguimientoUsuario.objects.create(seguidor_id=self.user, seguido_id=self.others[0])
+        SeguimientoUsuario.objects.create(seguidor_id=self.others[1], seguido_id=self.user)
+
+        # Listas completas, como antes de añadir el grafo paginado
+        siguiendo = self.client.get(f'/api/usuarios/{self.user.pk}/siguiendo/').json()
+        self.assertIsInstance(siguiendo, list)
+        self.assertEqual([row['seguido_id']['user_id'] for row in siguiendo], [self.others[0].pk])
+        seguidores = self.client.get(f'/api/usuarios/{self.user.pk}/seguidores/').json()
+        self.assertEqual([row['seguidor_id']['user_id'] for row in seguidores], [self.others[1].pk])
+
+        grafo = self.client.get(f'/api/usuarios/{self.user.pk}/grafo/seguidores/').json()
+        self.assertEqual(set(grafo), {'count', 'next', 'results'})
+        self.assertEqual(grafo['count'], 1)
+        self.assertEqual(
+            [(row['user_id'], row['name']) for row in grafo['results']], [(self.others[1].pk, 'Viajero 1')],
+        )
@@ -4,6 +4,8 @@ from .views import (
     SeguirUsuarioView,
     SeguidoresView,
     SiguiendoView,
+    SeguidoresGrafoView,
+    SiguiendoGrafoView,
     ResenaUsuarioView
 )
 
@@ -13,6 +15,8 @@ urlpatterns = [
     path('<int:user_id>/seguir/', SeguirUsuarioView.as_view(), name='seguir-usuario'),
     path('<int:user_id>/seguidores/', SeguidoresView.as_view(), name='seguidores'),
     path('<int:user_id>/siguiendo/', SiguiendoView.as_view(), name='siguiendo'),
+    path('<int:user_id>/grafo/seguidores/', SeguidoresGrafoView.as_view(), name='grafo-seguidores'),
+    path('<int:user_id>/grafo/siguiendo/', SiguiendoGrafoView.as_view(), name='grafo-siguiendo'),
     path('<int:user_id>/resenas/', ResenaUsuarioView.as_view(), name='resenas-usuario'),
 ]
 
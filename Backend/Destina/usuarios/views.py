@@ -2,9 +2,12 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework.status import HTTP_201_CREATED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND
+from django.db.models import F
 from .models import PerfilUsuario, SeguimientoUsuario, ResenaUsuario
 from .serializers import PerfilUsuarioSerializer, SeguimientoUsuarioSerializer, ResenaUsuarioSerializer
 from Tablas.models import User
+from Tablas.eager_loading import eager_load
+from Tablas.pagination import KeysetPagination
 
 
 class PerfilUsuarioView(APIView):
@@ -18,7 +21,7 @@ class PerfilUsuarioView(APIView):
         try:
             target_user = User.objects.get(user_id=target_user_id)
             perfil, created = PerfilUsuario.objects.get_or_create(user_id=target_user)
-            serializer = PerfilUsuarioSerializer(perfil)
+            serializer = PerfilUsuarioSerializer(perfil, context={'request': request})
             return Response(serializer.data)
         except User.DoesNotExist:
             return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)
@@ -36,7 +39,7 @@ class PerfilUsuarioView(APIView):
             perfil.preferencias_viaje = request.data.get('preferencias_viaje', perfil.preferencias_viaje)
             perfil.save()
             
-            return Response(PerfilUsuarioSerializer(perfil).data)
+            return Response(PerfilUsuarioSerializer(perfil, context={'request': request}).data)
         except Exception as e:
             return Response({'error': str(e)}, status=HTTP_400_BAD_REQUEST)
 
@@ -60,7 +63,7 @@ class SeguirUsuarioView(APIView):
             if not created:
                 return Response({'message': 'Ya sigues a este usuario'}, status=HTTP_400_BAD_REQUEST)
             
-            return Response(SeguimientoUsuarioSerializer(seguimiento).data, status=HTTP_201_CREATED)
+            return Response(SeguimientoUsuarioSerializer(seguimiento, context={'request': request}).data, status=HTTP_201_CREATED)
         except User.DoesNotExist:
             return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)
     
@@ -81,33 +84,77 @@ class SeguirUsuarioView(APIView):
 
 
 class SeguidoresView(APIView):
-    """Obtener seguidores de un usuario"""
+    """Obtener seguidores de un usuario (lista completa; paginada en SeguidoresGrafoView)"""
     permission_classes = [AllowAny]
     
     def get(self, request, user_id):
         try:
             usuario = User.objects.get(user_id=user_id)
-            seguidores = SeguimientoUsuario.objects.filter(seguido_id=usuario)
-            serializer = SeguimientoUsuarioSerializer(seguidores, many=True)
+            seguidores = eager_load(SeguimientoUsuario.objects.filter(seguido_id=usuario), SeguimientoUsuarioSerializer, context={'request': request})
+            serializer = SeguimientoUsuarioSerializer(seguidores, many=True, context={'request': request})
             return Response(serializer.data)
         except User.DoesNotExist:
             return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)
 
 
 class SiguiendoView(APIView):
-    """Obtener usuarios que sigue un usuario"""
+    """Obtener usuarios que sigue un usuario (lista completa; paginada en SiguiendoGrafoView)"""
     permission_classes = [AllowAny]
     
     def get(self, request, user_id):
         try:
             usuario = User.objects.get(user_id=user_id)
-            siguiendo = SeguimientoUsuario.objects.filter(seguidor_id=usuario)
-            serializer = SeguimientoUsuarioSerializer(siguiendo, many=True)
+            siguiendo = eager_load(SeguimientoUsuario.objects.filter(seguidor_id=usuario), SeguimientoUsuarioSerializer, context={'request': request})
+            serializer = SeguimientoUsuarioSerializer(siguiendo, many=True, context={'request': request})
             return Response(serializer.data)
         except User.DoesNotExist:
             return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)
 
 
+class GrafoSocialView(APIView):
+    """
+    Grafo social paginado por cursor: ids y nombres en una sola consulta con
+    JOIN, sin serializar los dos usuarios de cada seguimiento
+    """
+    permission_classes = [AllowAny]
+    lookup_field = None
+    other_field = None
+    count_field = None
+
+    def get(self, request, user_id):
+        usuario = User.objects.filter(user_id=user_id).values(self.count_field).first()
+        if usuario is None:
+            return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)
+
+        rows = SeguimientoUsuario.objects.filter(**{self.lookup_field: user_id}).values(
+            'seguimiento_id',
+            user_id=F(self.other_field),
+            name=F(f'{self.other_field}__name'),
+            since=F('created_at'),
+        )
+        paginator = KeysetPagination(ordering=('-seguimiento_id',))
+        page = paginator.paginate_queryset(rows, request, view=self)
+        response = paginator.get_paginated_response(
+            [{'user_id': row['user_id'], 'name': row['name'], 'since': row['since']} for row in page]
+        )
+        response.data['count'] = usuario[self.count_field]
+        return response
+
+
+class SeguidoresGrafoView(GrafoSocialView):
+    """Seguidores de un usuario (ids y nombres)"""
+    lookup_field = 'seguido_id'
+    other_field = 'seguidor_id'
+    count_field = 'followers_count'
+
+
+class SiguiendoGrafoView(GrafoSocialView):
+    """Usuarios que sigue un usuario (ids y nombres)"""
+    lookup_field = 'seguidor_id'
+    other_field = 'seguido_id'
+    count_field = 'following_count'
+
+
 class ResenaUsuarioView(APIView):
     """Crear reseña de usuario"""
     permission_classes = [IsAuthenticated]
@@ -131,7 +178,9 @@ class ResenaUsuarioView(APIView):
             if not created:
                 return Response({'error': 'Ya has reseñado a este usuario'}, status=HTTP_400_BAD_REQUEST)
             
-            return Response(ResenaUsuarioSerializer(resena).data, status=HTTP_201_CREATED)
+            # La reputación se actualizó en la base de datos con un UPDATE incremental
+            usuario_resenado.refresh_from_db(fields=['rating_count', 'rating_sum', 'rating_avg'])
+            return Response(ResenaUsuarioSerializer(resena, context={'request': request}).data, status=HTTP_201_CREATED)
         except User.DoesNotExist:
             return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)
         except Exception as e:
@@ -141,8 +190,8 @@ class ResenaUsuarioView(APIView):
         """Obtener reseñas de un usuario"""
         try:
             usuario = User.objects.get(user_id=user_id)
-            resenas = ResenaUsuario.objects.filter(usuario_resenado_id=usuario)
-            serializer = ResenaUsuarioSerializer(resenas, many=True)
+            resenas = eager_load(ResenaUsuario.objects.filter(usuario_resenado_id=usuario), ResenaUsuarioSerializer, context={'request': request})
+            serializer = ResenaUsuarioSerializer(resenas, many=True, context={'request': request})
             return Response(serializer.data)
         except User.DoesNotExist:
             return Response({'error': 'Usuario no encontrado'}, status=HTTP_404_NOT_FOUND)